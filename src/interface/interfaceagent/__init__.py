@@ -1 +1,18 @@
-from .interface import *
+from typing import TYPE_CHECKING
+
+from . import interface
+
+__all__ = interface.__all__
+
+if TYPE_CHECKING:
+    from .interface import *
+
+
+def __getattr__(name: str):
+    if name in interface.__all__:
+        return getattr(interface, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,145 @@
+"""
+Measure memory per game of the full Game shape against compact GameRecords.
+
+Games are played between agents that pick random moves but carry prompts
+and responses of the size an LLM agent produces, so the turns look like
+those of a real evaluation. Each game is then held in memory three ways,
+loaded from JSON the way a checkpoint or saved tournament is read back:
+as a Game with both states of every turn, as a GameRecord, and as a
+GameRecord without prompts and responses. Memory is what tracemalloc
+sees allocated per game. Exporting a record back to a Game replays it
+through the engine, and the time that takes is reported too.
+
+Run with: python -m interfaceagent.benchmarks.gamerecord
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from interfaceagent.eval.games.agents.base import AIAgent
+from interfaceagent.eval.games.datamodel import AIMove, Game, GameRecord, GameState, GameType, Player
+from interfaceagent.eval.games.games.engines import ChessGameEngine, TicTacToeEngine
+from interfaceagent.eval.games.games.match.chess import ChessMatch
+from interfaceagent.eval.games.games.match.tictactoe import TicTacToeMatch
+from interfaceagent.eval.games.games.records import to_game, to_record
+
+SYSTEM_PROMPT = ("You are a game engine. Analyze the current position, consider the possible moves and "
+                 "their consequences, select the best move and explain your reasoning. ") * 4
+
+
+class VerboseRandomAgent(AIAgent):
+    """Plays random moves with prompts and responses shaped like an LLM agent's"""
+
+    def __init__(self, name: str, rng: random.Random):
+        super().__init__(name)
+        self.rng = rng
+
+    def _create_prompt(self, game_state: GameState) -> str:
+        return (f"{SYSTEM_PROMPT}\nCurrent position: {game_state.state_repr}\n"
+                f"Playing as: {game_state.current_player.value}\n"
+                f"Valid moves: {', '.join(game_state.valid_moves)}\n"
+                "Format your response as:\nMOVE: <move>\nREASONING: <your_explanation>")
+
+    async def _generate_move(self, game_state: GameState, attempt: int, rng=None) -> AIMove:
+        rng = rng or self.rng
+        move = rng.choice(game_state.valid_moves)
+        reasoning = f"Playing {move} keeps the position flexible and improves piece activity. " * 3
+        return AIMove(
+            player=Player.WHITE if game_state.current_player.value == "player_one" else Player.BLACK,
+            move_notation=move,
+            model_name=self.name,
+            reasoning=reasoning,
+            tokens_used=rng.randint(300, 900),
+            retry_count=attempt,
+            raw_response=f"MOVE: {move}\nREASONING: {reasoning}",
+            prompt_used=self._create_prompt(game_state),
+            is_valid=True
+        )
+
+
+async def play_games(game_type: GameType, count: int, max_moves: int, seed: int) -> List[Game]:
+    rng = random.Random(seed)
+    games = []
+    for i in range(count):
+        white, black = VerboseRandomAgent("white", rng), VerboseRandomAgent("black", rng)
+        if game_type == GameType.CHESS:
+            match = ChessMatch(white, black, ChessGameEngine(), max_moves=max_moves)
+        else:
+            match = TicTacToeMatch(white, black, TicTacToeEngine(), max_moves=max_moves)
+        games.append(await match.play())
+    return games
+
+
+def loaded_bytes(model: Any, payloads: List[str]) -> float:
+    """Bytes allocated per object when loading the payloads as model instances"""
+    gc.collect()
+    tracemalloc.start()
+    loaded = [model.model_validate_json(payload) for payload in payloads]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+    return current / len(payloads)
+
+
+def measure(games: List[Game]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    records = [to_record(game) for game in games]
+    record_seconds = time.perf_counter() - start
+    bare = [to_record(game, keep_prompts=False, keep_responses=False) for game in games]
+
+    start = time.perf_counter()
+    exported = [to_game(record) for record in records]
+    export_seconds = time.perf_counter() - start
+    if any(game.model_dump() != game_export.model_dump() for game, game_export in zip(games, exported)):
+        raise RuntimeError("Exported games differ from the originals")
+
+    variants = {"game": (Game, games), "record": (GameRecord, records), "record_bare": (GameRecord, bare)}
+    result: Dict[str, Any] = {
+        "games": len(games),
+        "turns_per_game": round(sum(len(game.turns) for game in games) / len(games), 1),
+        "to_record_ms_per_game": round(record_seconds / len(games) * 1000, 2),
+        "to_game_ms_per_game": round(export_seconds / len(games) * 1000, 2),
+    }
+    for name, (model, items) in variants.items():
+        payloads = [item.model_dump_json() for item in items]
+        result[name] = {
+            "memory_kb_per_game": round(loaded_bytes(model, payloads) / 1024, 1),
+            "json_kb_per_game": round(sum(map(len, payloads)) / len(payloads) / 1024, 1),
+        }
+    return result
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for game_type, count in ((GameType.CHESS, args.chess_games), (GameType.TIC_TAC_TOE, args.tictactoe_games)):
+        games = await play_games(game_type, count, args.max_moves, args.seed)
+        results[game_type.value] = measure(games)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chess-games", type=int, default=20)
+    parser.add_argument("--tictactoe-games", type=int, default=200)
+    parser.add_argument("--max-moves", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'game':<13}{'turns':>7}{'Game KB':>10}{'record KB':>11}{'bare KB':>9}"
+              f"{'Game JSON':>11}{'record JSON':>13}{'export ms':>11}")
+        for name, result in results.items():
+            print(f"{name:<13}{result['turns_per_game']:>7}{result['game']['memory_kb_per_game']:>10}"
+                  f"{result['record']['memory_kb_per_game']:>11}{result['record_bare']['memory_kb_per_game']:>9}"
+                  f"{result['game']['json_kb_per_game']:>11}{result['record']['json_kb_per_game']:>13}"
+                  f"{result['to_game_ms_per_game']:>11}")
@@ -0,0 +1,128 @@
+"""
+Measure per-turn game engine overhead with and without cached, lazily
+computed GameStates.
+
+Random games are recorded first and then replayed the way
+BaseGameMatch.play drives an engine: check is_game_over, get the state,
+make the move and get the state again. With cache_states off every
+get_state builds a full GameState. With it on the state after a move is
+served again before the next one, and the metadata, which for chess
+includes draw-claim detection, is only computed when read. The dump
+column is the cost of serializing every state a game produced, which is
+where deferred metadata gets computed, and the total column adds it to
+the play time, as when a tournament checkpoints or writes out its games.
+
+Run with: python -m interfaceagent.benchmarks.gamestate
+"""
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from interfaceagent.eval.games.datamodel import Move, Player
+from interfaceagent.eval.games.games.engines import (
+    BitboardTicTacToeEngine,
+    ChessGameEngine,
+    TicTacToeEngine
+)
+
+
+def chess_games(count: int, plies: int, seed: int) -> List[List[str]]:
+    import chess
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        board = chess.Board()
+        moves = []
+        while not board.is_game_over() and len(moves) < plies:
+            move = rng.choice(list(board.legal_moves))
+            board.push(move)
+            moves.append(move.uci())
+        games.append(moves)
+    return games
+
+
+def tictactoe_games(count: int, seed: int) -> List[List[str]]:
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        engine = BitboardTicTacToeEngine()
+        while not engine.is_game_over():
+            engine.play(rng.choice(engine.legal_moves()))
+        games.append([str(position) for position in engine.move_history])
+    return games
+
+
+def replay(engine_factory: Callable[[], Any], games: List[List[Move]], dump: bool) -> Dict[str, Any]:
+    turns = 0
+    turn_seconds = dump_seconds = 0.0
+    for moves in games:
+        engine = engine_factory()
+        engine.create_game("white", "black")
+        states = []
+        start = time.perf_counter()
+        for move in moves:
+            if engine.is_game_over():
+                break
+            states.append(engine.get_state())
+            engine.make_move(move)
+            states.append(engine.get_state())
+            turns += 1
+        turn_seconds += time.perf_counter() - start
+        if dump:
+            start = time.perf_counter()
+            for state in states:
+                state.model_dump()
+            dump_seconds += time.perf_counter() - start
+    return {
+        "turns": turns,
+        "us_per_turn": round(turn_seconds / turns * 1e6, 1),
+        "dump_ms_per_game": round(dump_seconds / len(games) * 1000, 2),
+        "total_ms_per_game": round((turn_seconds + dump_seconds) / len(games) * 1000, 2),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    def as_moves(games: List[List[str]]) -> List[List[Move]]:
+        return [[Move(player=Player.WHITE if i % 2 == 0 else Player.BLACK, move_notation=notation, is_valid=True)
+                 for i, notation in enumerate(game)] for game in games]
+
+    workloads = {
+        "chess": (ChessGameEngine, as_moves(chess_games(args.chess_games, args.plies, args.seed))),
+        "tictactoe": (TicTacToeEngine, as_moves(tictactoe_games(args.tictactoe_games, args.seed))),
+        "tictactoe-bitboard": (BitboardTicTacToeEngine, as_moves(tictactoe_games(args.tictactoe_games, args.seed))),
+    }
+    results = {}
+    for name, (engine_class, games) in workloads.items():
+        results[name] = {
+            "uncached": replay(lambda: engine_class(cache_states=False), games, args.dump),
+            "cached": replay(lambda: engine_class(cache_states=True), games, args.dump),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chess-games", type=int, default=50)
+    parser.add_argument("--plies", type=int, default=100, help="Maximum half-moves per chess game")
+    parser.add_argument("--tictactoe-games", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-dump", dest="dump", action="store_false",
+                        help="Skip timing serialization of the states")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'engine':<20}{'turns':>8}{'us/turn':>10}{'cached':>10}{'speedup':>9}"
+              f"{'dump ms':>10}{'cached':>10}{'total ms':>10}{'cached':>10}")
+        for name, result in results.items():
+            old, new = result["uncached"], result["cached"]
+            print(f"{name:<20}{old['turns']:>8}{old['us_per_turn']:>10}{new['us_per_turn']:>10}"
+                  f"{old['us_per_turn'] / new['us_per_turn']:>8.1f}x"
+                  f"{old['dump_ms_per_game']:>10}{new['dump_ms_per_game']:>10}"
+                  f"{old['total_ms_per_game']:>10}{new['total_ms_per_game']:>10}")
@@ -0,0 +1,241 @@
+"""
+Drive a create/action/state/close mix against the web API at a target request rate.
+
+By default the app runs in-process with the stub browser backend, so the test
+needs no Chromium and no network. Pass --url to target a running server instead.
+
+Run with: python -m interfaceagent.benchmarks.loadtest --rate 50 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:  # httpx is only needed to run the load test
+    httpx = None
+
+
+DEFAULT_MIX = "create:1,action:5,batch:1,state:3,close:1"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(len(ordered), max(1, rank)) - 1]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        name, weight = item.split(":")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+class LoadGenerator:
+    """Open-loop load generator: requests are issued on schedule regardless of completions."""
+
+    def __init__(self, client, rate: float, duration: float, mix: Dict[str, float],
+                 max_sessions: int = 20, initial_sessions: int = 5, seed: Optional[int] = None):
+        self.client = client
+        self.rate = rate
+        self.duration = duration
+        self.mix = mix
+        self.max_sessions = max_sessions
+        self.initial_sessions = initial_sessions
+        self.pending_creates = 0
+        self.random = random.Random(seed)
+        self.sessions: List[str] = []
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.client_errors: Dict[str, int] = defaultdict(int)
+        self.status_codes: Dict[int, int] = defaultdict(int)
+
+    def pick_operation(self) -> Tuple[str, Optional[str]]:
+        """Pick the next operation and the session it targets, None for creates.
+
+        The session is picked when the request is scheduled, so an operation
+        never targets a session that does not exist yet. Without open
+        sessions every operation becomes a create.
+        """
+        operation = self.random.choices(
+            list(self.mix), weights=list(self.mix.values()))[0]
+        open_sessions = len(self.sessions) + self.pending_creates
+        if operation == "create" and open_sessions >= self.max_sessions:
+            operation = "close"
+        if operation == "create" or not self.sessions:
+            return "create", None
+        session_id = self.random.choice(self.sessions)
+        if operation == "close":
+            # Later picks must not target a session that is being closed
+            self.sessions.remove(session_id)
+        return operation, session_id
+
+    async def request(self, operation: str, session_id: Optional[str] = None) -> None:
+        if operation == "create":
+            self.pending_creates += 1
+            call = self.client.post("/browser/session/create",
+                                    params={"start_url": "http://example.com/"})
+        elif operation == "action":
+            call = self.client.post(f"/browser/session/{session_id}/action",
+                                    json={"action": "click", "selector": "a.link"})
+        elif operation == "batch":
+            call = self.client.post(f"/browser/session/{session_id}/actions", json={
+                "actions": [
+                    {"action": "type", "selector": "#q", "value": "query"},
+                    {"action": "type", "selector": "#r", "value": "more"},
+                    {"action": "press", "selector": "#q", "value": "Enter"},
+                ],
+                "state_type": "text",
+            })
+        elif operation == "state":
+            call = self.client.get(f"/browser/session/{session_id}/state",
+                                   params={"state_type": self.random.choice(["text", "interactive"])})
+        elif operation == "close":
+            call = self.client.post(f"/browser/session/{session_id}/close")
+        else:
+            raise ValueError(f"Unsupported operation: {operation}")
+
+        start = time.perf_counter()
+        try:
+            response = await call
+        except Exception as e:
+            self.errors[f"{operation}:{type(e).__name__}"] += 1
+            return
+        finally:
+            if operation == "create":
+                self.pending_creates -= 1
+        self.latencies[operation].append(time.perf_counter() - start)
+        self.status_codes[response.status_code] += 1
+
+        body = response.json() if response.status_code == 200 else {}
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            # Requests the server rejected, such as unknown sessions, are not server failures
+            self.client_errors[f"{operation}:{response.status_code}"] += 1
+        elif response.status_code != 200 or not body.get("status"):
+            self.errors[f"{operation}:{response.status_code}"] += 1
+        elif operation == "create":
+            self.sessions.append(str(body["data"]["session_id"]))
+
+    async def warm_up(self) -> None:
+        """Open the initial sessions before measuring so the mix is not all creates."""
+        await asyncio.gather(*[self.request("create") for _ in range(self.initial_sessions)])
+        self.latencies.clear()
+        self.errors.clear()
+        self.client_errors.clear()
+        self.status_codes.clear()
+
+    async def run(self) -> Dict:
+        await self.warm_up()
+        tasks = []
+        interval = 1.0 / self.rate
+        start = time.perf_counter()
+        next_at = start
+        while next_at - start < self.duration:
+            tasks.append(asyncio.create_task(
+                self.request(*self.pick_operation())))
+            next_at += self.random.expovariate(1.0 / interval)
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+        # Close what is left so the run does not leak browser sessions
+        await asyncio.gather(*[self.client.post(f"/browser/session/{session_id}/close")
+                               for session_id in self.sessions])
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> Dict:
+        completed = sum(len(values) for values in self.latencies.values())
+        errors = sum(self.errors.values())
+        client_errors = sum(self.client_errors.values())
+        return {
+            "target_rate": self.rate,
+            "elapsed_s": round(elapsed, 2),
+            "requests": completed,
+            "throughput_rps": round(completed / elapsed, 2),
+            "error_rate": round(errors / max(1, completed), 4),
+            "status_codes": dict(self.status_codes),
+            "errors": dict(self.errors),
+            "client_error_rate": round(client_errors / max(1, completed), 4),
+            "client_errors": dict(self.client_errors),
+            "latency_ms": {
+                operation: {
+                    "count": len(values),
+                    "p50": round(percentile(values, 50) * 1000, 2),
+                    "p90": round(percentile(values, 90) * 1000, 2),
+                    "p99": round(percentile(values, 99) * 1000, 2),
+                    "max": round(max(values) * 1000, 2),
+                }
+                for operation, values in self.latencies.items()
+            },
+        }
+
+
+async def run_in_process(args) -> Dict:
+    os.environ["interfaceagent_BROWSER_BACKEND"] = "stub"
+    if args.stub_config:
+        os.environ["interfaceagent_STUB_CONFIG"] = args.stub_config
+    from interfaceagent.web.app import app, lifespan
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+            return await LoadGenerator(client, args.rate, args.duration, parse_mix(args.mix),
+                                       max_sessions=args.max_sessions, initial_sessions=args.initial_sessions,
+                                       seed=args.seed).run()
+
+
+async def run_against_url(args) -> Dict:
+    async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+        return await LoadGenerator(client, args.rate, args.duration, parse_mix(args.mix),
+                                   max_sessions=args.max_sessions, initial_sessions=args.initial_sessions,
+                                   seed=args.seed).run()
+
+
+def print_report(report: Dict) -> None:
+    print(f"requests {report['requests']} in {report['elapsed_s']}s "
+          f"({report['throughput_rps']} req/s, target {report['target_rate']})")
+    print(f"error rate {report['error_rate']:.2%}  client error rate {report['client_error_rate']:.2%}  "
+          f"status codes {report['status_codes']}")
+    print(f"{'operation':<10}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms)")
+    for operation, stats in report["latency_ms"].items():
+        print(f"{operation:<10}{stats['count']:>8}{stats['p50']:>10}{stats['p90']:>10}"
+              f"{stats['p99']:>10}{stats['max']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=20,
+                        help="Target requests per second")
+    parser.add_argument("--duration", type=float,
+                        default=10, help="Seconds to generate load")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help="Operation weights, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--max-sessions", type=int, default=20)
+    parser.add_argument("--initial-sessions", type=int, default=5,
+                        help="Sessions opened before measuring")
+    parser.add_argument("--stub-config", default=None,
+                        help="JSON file with StubBrowserConfig fields")
+    parser.add_argument("--url", default=None,
+                        help="Target a running server instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true",
+                        help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if httpx is None:
+        raise SystemExit("The load test requires httpx: pip install httpx")
+
+    report = asyncio.run(run_against_url(args) if args.url else run_in_process(args))
+    print(json.dumps(report, indent=2)) if args.json else print_report(report)
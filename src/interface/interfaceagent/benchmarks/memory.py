@@ -0,0 +1,275 @@
+"""
+Benchmark agent memory backends: ingest throughput, query latency at several
+k, transform end-to-end cost, clear time and peak RSS, at several corpus sizes.
+
+Every backend and size runs in its own interpreter so RSS numbers are not
+mixed. The corpus is synthetic and embeddings come from a deterministic
+hashed bag of words, so the run needs no network or model download and
+measures the stores rather than the embedder.
+
+Backends are factories taking (dim, k, path) and returning an
+autogen_agentchat Memory. Besides the built-in names, any factory can be
+given as module:function, for example --backends mypackage.memories:build.
+The memory's config.k is changed between k values, and add_many is used
+for ingestion when the backend has it.
+
+Run with: python -m interfaceagent.benchmarks.memory
+"""
+import argparse
+import asyncio
+import hashlib
+import importlib
+import json
+import math
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+SUBJECTS = ["the user", "the team", "the customer", "the agent", "the reviewer", "the planner"]
+VERBS = ["prefers", "asked about", "rejected", "booked", "reported a problem with", "wants to compare"]
+OBJECTS = ["window seats", "morning flights", "vegetarian meals", "the quarterly report", "dark mode",
+           "the Berlin office", "hotel upgrades", "weekly summaries", "the staging server",
+           "invoice 4471", "the onboarding checklist", "rail passes", "the chess engine", "budget hotels"]
+DETAILS = ["last week", "for the Paris trip", "after the outage", "during onboarding", "on every booking",
+           "when travelling with family", "for the March release", "since the price change"]
+
+
+class BagOfWordsEmbedding:
+    """Deterministic embeddings: the normalized sum of hash-seeded random vectors of each word."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self._words: Dict[str, np.ndarray] = {}
+
+    def _word(self, word: str) -> np.ndarray:
+        vector = self._words.get(word)
+        if vector is None:
+            seed = int.from_bytes(hashlib.sha256(word.encode()).digest()[:8], "little")
+            vector = self._words[word] = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return vector
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        embeddings = []
+        for text in input:
+            vector = np.zeros(self.dim, dtype=np.float32)
+            for word in re.findall(r"\w+", text.lower()):
+                vector += self._word(word)
+            embeddings.append(vector / max(float(np.linalg.norm(vector)), 1e-12))
+        return embeddings
+
+
+def chroma_embedding(embedding: Callable[[List[str]], List[np.ndarray]]):
+    """Wrap an embedding callable as a ChromaDB embedding function."""
+    from chromadb.api.types import EmbeddingFunction
+
+    class ChromaBenchmarkEmbedding(EmbeddingFunction):
+        def __init__(self) -> None:
+            pass
+
+        def __call__(self, input):
+            return embedding(input)
+
+        @staticmethod
+        def name() -> str:
+            return "benchmark-hash"
+
+        def get_config(self) -> Dict[str, Any]:
+            return {}
+
+        @staticmethod
+        def build_from_config(config: Dict[str, Any]) -> "ChromaBenchmarkEmbedding":
+            return ChromaBenchmarkEmbedding()
+
+    return ChromaBenchmarkEmbedding()
+
+
+def synthetic_corpus(entries: int, seed: int = 0) -> List[str]:
+    """Deterministic memory-like sentences, each made unique by a numbered note."""
+    rng = random.Random(seed)
+    return [f"{rng.choice(SUBJECTS).capitalize()} {rng.choice(VERBS)} {rng.choice(OBJECTS)} "
+            f"{rng.choice(DETAILS)} (note {i})"
+            for i in range(entries)]
+
+
+def synthetic_queries(count: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [f"What does {rng.choice(SUBJECTS)} think about {rng.choice(OBJECTS)}?" for _ in range(count)]
+
+
+def rss_bytes() -> int:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        with open(f"/proc/{os.getpid()}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def peak_rss_bytes() -> int:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    return {f"p{p}_ms": round(percentile(samples, p), 3) for p in (50, 95, 99)}
+
+
+def numpy_backend(dim: int, k: int, path: str | None, dtype: str = "float32"):
+    from interfaceagent.components.memory.numpymemory import NumpyMemory, NumpyMemoryConfig
+    return NumpyMemory(
+        config=NumpyMemoryConfig(k=k, persistence_path=path, dtype=dtype),
+        embedding_function=BagOfWordsEmbedding(dim))
+
+
+def chroma_backend(dim: int, k: int, path: str | None):
+    from interfaceagent.components.memory.chromadb import ChromaMemory, ChromaMemoryConfig
+    return ChromaMemory(
+        config=ChromaMemoryConfig(
+            k=k, collection_name="memory_benchmark", persistence_path=path,
+            embedding_cache_size=0),
+        embedding_function=chroma_embedding(BagOfWordsEmbedding(dim)))
+
+
+BACKENDS: Dict[str, Callable[..., Any]] = {
+    "numpy": numpy_backend,
+    "numpy-float16": lambda dim, k, path: numpy_backend(dim, k, path, dtype="float16"),
+    "chroma": chroma_backend,
+}
+
+
+def load_backend(name: str) -> Callable[..., Any]:
+    """Resolve a built-in backend name or a module:function factory path."""
+    if name in BACKENDS:
+        return BACKENDS[name]
+    module, _, function = name.partition(":")
+    if not function:
+        raise ValueError(f"Unknown backend {name}, expected one of {list(BACKENDS)} or module:function")
+    return getattr(importlib.import_module(module), function)
+
+
+async def run_backend(backend: str, entries: int, args: argparse.Namespace) -> Dict[str, Any]:
+    from autogen_agentchat.memory import MemoryContent
+    from autogen_agentchat.memory._base_memory import MemoryMimeType
+    from autogen_core.model_context import UnboundedChatCompletionContext
+    from autogen_core.models import UserMessage
+
+    def content(text: str) -> MemoryContent:
+        return MemoryContent(content=text, mime_type=MemoryMimeType.TEXT)
+
+    factory = load_backend(backend)
+    queries = synthetic_queries(args.queries)
+    result: Dict[str, Any] = {"backend": backend, "entries": entries}
+    rss_start = rss_bytes()
+
+    with tempfile.TemporaryDirectory() as directory:
+        memory = factory(args.dim, max(args.ks), directory if args.persist else None)
+
+        start = time.perf_counter()
+        corpus = (content(text) for text in synthetic_corpus(entries))
+        if hasattr(memory, "add_many"):
+            await memory.add_many(corpus)
+        else:
+            for item in corpus:
+                await memory.add(item)
+        ingest = time.perf_counter() - start
+        result["ingest_s"] = round(ingest, 3)
+        result["ingest_per_s"] = round(entries / ingest, 1)
+        result["rss_added_mb"] = round((rss_bytes() - rss_start) / 2**20, 1)
+
+        result["query"] = {}
+        for k in args.ks:
+            memory.config.k = k
+            # Warm up lazy initialization outside the timed loop
+            await memory.query(content(queries[0]))
+            latencies = []
+            for query in queries:
+                start = time.perf_counter()
+                await memory.query(content(query))
+                latencies.append((time.perf_counter() - start) * 1000)
+            result["query"][f"k={k}"] = latency_stats(latencies)
+
+        memory.config.k = args.transform_k
+        latencies = []
+        for query in queries[:args.transforms]:
+            model_context = UnboundedChatCompletionContext()
+            await model_context.add_message(UserMessage(content=query, source="user"))
+            start = time.perf_counter()
+            await memory.transform(model_context)
+            latencies.append((time.perf_counter() - start) * 1000)
+        result["transform"] = latency_stats(latencies)
+
+        start = time.perf_counter()
+        await memory.clear()
+        result["clear_s"] = round(time.perf_counter() - start, 3)
+        await memory.cleanup()
+
+    result["peak_rss_mb"] = round(peak_rss_bytes() / 2**20, 1)
+    return result
+
+
+def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    for backend in args.backends:
+        for entries in args.sizes:
+            command = [sys.executable, "-m", "interfaceagent.benchmarks.memory", "--child", backend,
+                       "--sizes", str(entries), "--queries", str(args.queries),
+                       "--ks", *map(str, args.ks), "--transform-k", str(args.transform_k),
+                       "--transforms", str(args.transforms), "--dim", str(args.dim)]
+            if args.persist:
+                command.append("--persist")
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+            print(f"{backend} at {entries} entries done", file=sys.stderr)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS),
+                        help=f"Built-in backends {list(BACKENDS)} or module:function factories")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--ks", nargs="+", type=int, default=[1, 5, 20])
+    parser.add_argument("--transform-k", type=int, default=5)
+    parser.add_argument("--transforms", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--persist", action="store_true",
+                        help="Store on disk instead of in memory")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_backend(args.child, args.sizes[0], args))))
+        sys.exit(0)
+
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        header = "".join(f"{'p50 k=' + str(k):>11}" for k in args.ks)
+        print(f"{'backend':<15}{'entries':>9}{'ingest/s':>11}{header}{'transform':>11}"
+              f"{'clear s':>9}{'peak MB':>9}")
+        for result in results:
+            latencies = "".join(f"{result['query'][f'k={k}']['p50_ms']:>11}" for k in args.ks)
+            print(f"{result['backend']:<15}{result['entries']:>9}{result['ingest_per_s']:>11}{latencies}"
+                  f"{result['transform']['p50_ms']:>11}{result['clear_s']:>9}{result['peak_rss_mb']:>9}")
@@ -0,0 +1,70 @@
+"""
+Measure the cost of the web API instrumentation.
+
+Run with: python -m interfaceagent.benchmarks.metrics
+"""
+import argparse
+import asyncio
+import time
+
+from interfaceagent.web import metrics
+
+
+def time_per_call(fn, iterations: int) -> float:
+    """Return the mean time per call in nanoseconds."""
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def time_per_request(app, iterations: int) -> float:
+    """Drive an ASGI app in-process and return the mean time per request in nanoseconds."""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        scope = {"type": "http", "method": "GET",
+                 "path": "/browser/sessions", "headers": []}
+        await app(scope, receive, send)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def run(iterations: int) -> None:
+    histogram = metrics.Histogram("bench_latency_seconds", "bench", ["route"])
+    counter = metrics.Counter("bench_total", "bench", ["type"])
+    state = [{"tag": "a", "text": "link text " * 5, "css_selector": "a.nav:nth-of-type(3)"}] * 200
+
+    print(f"counter.inc            {time_per_call(lambda: counter.inc('ValueError'), iterations):8.0f} ns")
+    print(f"histogram.observe      {time_per_call(lambda: histogram.observe(0.042, '/state'), iterations):8.0f} ns")
+    print(f"state_size (200 elems) {time_per_call(lambda: metrics.state_size(state), iterations // 100):8.0f} ns")
+
+    bare = asyncio.run(time_per_request(bare_app, iterations))
+    wrapped = asyncio.run(time_per_request(
+        metrics.MetricsMiddleware(bare_app), iterations))
+    print(f"request (bare)         {bare:8.0f} ns")
+    print(f"request (middleware)   {wrapped:8.0f} ns")
+    print(f"middleware overhead    {wrapped - bare:8.0f} ns per request")
+
+    for i in range(50):
+        histogram.observe(0.042, f"/route/{i}")
+    start = time.perf_counter()
+    metrics.registry.render()
+    histogram.render()
+    print(f"render (50 series)     {(time.perf_counter() - start) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.iterations)
@@ -0,0 +1,131 @@
+"""
+Measure recall and query latency of vector-only and hybrid (vector + BM25)
+ChromaMemory retrieval on a small labelled set.
+
+The corpus is synthetic support notes carrying order numbers, SKUs and error
+codes. Identifier queries name one of those codes; descriptive queries
+paraphrase a note without it. A query counts as recalled when a note labelled
+relevant is among the top k results. Embeddings are a hashed bag of words,
+so the run needs no model download.
+
+Run with: python -m interfaceagent.benchmarks.retrieval
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from interfaceagent.benchmarks.memory import BagOfWordsEmbedding, chroma_embedding, percentile
+
+PRODUCTS = ["blender", "kettle", "toaster", "air fryer", "coffee grinder", "rice cooker", "stand mixer",
+            "juicer", "microwave", "dishwasher", "vacuum", "air purifier", "heater", "desk lamp",
+            "smart plug", "router", "webcam", "headset", "keyboard", "monitor"]
+CITIES = ["Denver", "Austin", "Boston", "Seattle", "Chicago", "Atlanta", "Portland", "Phoenix",
+          "Dallas", "Miami", "Detroit", "Oakland", "Tampa", "Omaha", "Reno"]
+TEMPLATES = {
+    "order": ("Order {code} for a {product} was delayed at the {city} warehouse.",
+              "What happened with order {code}?",
+              "{product} shipment delayed at the {city} warehouse"),
+    "error": ("Customer in {city} reported error {code} when pairing their {product} with the app.",
+              "How do I fix error {code}?",
+              "{product} fails to pair with the app for a customer in {city}"),
+    "sku": ("SKU {code} ({product}) is back in stock at the {city} store.",
+            "Is {code} available?",
+            "{product} restocked at the {city} store"),
+}
+
+
+def code(kind: str, rng: random.Random) -> str:
+    if kind == "order":
+        return f"ORD-{rng.randrange(10**5, 10**6)}"
+    if kind == "error":
+        return f"E-{rng.randrange(1000, 10000)}"
+    return f"SKU-{rng.randrange(10**6, 10**7)}"
+
+
+def labelled_set(entries: int, queries: int, seed: int = 7) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Build notes and queries, each query labelled with the IDs of its relevant notes."""
+    rng = random.Random(seed)
+    notes = []
+    for i in range(entries):
+        kind = rng.choice(list(TEMPLATES))
+        notes.append({"id": i, "kind": kind, "code": code(kind, rng),
+                      "product": rng.choice(PRODUCTS), "city": rng.choice(CITIES)})
+    for note in notes:
+        note["text"] = TEMPLATES[note["kind"]][0].format(**note)
+
+    labelled = []
+    for note in rng.sample(notes, min(queries, len(notes))):
+        _, identifier_query, descriptive_query = TEMPLATES[note["kind"]]
+        labelled.append({"type": "identifier", "text": identifier_query.format(**note),
+                         "relevant": {other["id"] for other in notes if other["code"] == note["code"]}})
+        labelled.append({"type": "descriptive", "text": descriptive_query.format(**note),
+                         "relevant": {other["id"] for other in notes
+                                      if (other["kind"], other["product"], other["city"])
+                                      == (note["kind"], note["product"], note["city"])}})
+    return notes, labelled
+
+
+async def run_mode(hybrid: bool, notes: List[Dict[str, Any]], labelled: List[Dict[str, Any]],
+                   args: argparse.Namespace) -> Dict[str, Any]:
+    from autogen_agentchat.memory import MemoryContent
+    from autogen_agentchat.memory._base_memory import MemoryMimeType
+    from interfaceagent.components.memory.chromadb import ChromaMemory, ChromaMemoryConfig
+
+    memory = ChromaMemory(
+        config=ChromaMemoryConfig(
+            k=args.k, collection_name=f"retrieval_{'hybrid' if hybrid else 'vector'}",
+            embedding_cache_size=0, hybrid=hybrid,
+            vector_weight=args.vector_weight, lexical_weight=args.lexical_weight),
+        embedding_function=chroma_embedding(BagOfWordsEmbedding(args.dim)))
+    await memory.add_many(MemoryContent(content=note["text"], mime_type=MemoryMimeType.TEXT,
+                                        metadata={"note": note["id"]}) for note in notes)
+
+    recalled: Dict[str, List[bool]] = {"identifier": [], "descriptive": []}
+    latencies = []
+    for query in labelled:
+        start = time.perf_counter()
+        results = await memory.query(MemoryContent(content=query["text"], mime_type=MemoryMimeType.TEXT))
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalled[query["type"]].append(
+            any(result.metadata["note"] in query["relevant"] for result in results))
+    await memory.cleanup()
+
+    return {
+        "mode": "hybrid" if hybrid else "vector",
+        "k": args.k,
+        "recall_identifier": round(sum(recalled["identifier"]) / len(recalled["identifier"]), 3),
+        "recall_descriptive": round(sum(recalled["descriptive"]) / len(recalled["descriptive"]), 3),
+        "query_p50_ms": round(percentile(latencies, 50), 3),
+        "query_p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    notes, labelled = labelled_set(args.entries, args.queries)
+    return [await run_mode(hybrid, notes, labelled, args) for hybrid in (False, True)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200,
+                        help="Notes to query, once by identifier and once by description")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--vector-weight", type=float, default=1.0)
+    parser.add_argument("--lexical-weight", type=float, default=1.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':<10}{'recall id':>12}{'recall desc':>14}{'p50 ms':>10}{'p99 ms':>10}")
+        for result in results:
+            print(f"{result['mode']:<10}{result['recall_identifier']:>12}{result['recall_descriptive']:>14}"
+                  f"{result['query_p50_ms']:>10}{result['query_p99_ms']:>10}")
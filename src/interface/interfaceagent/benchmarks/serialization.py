@@ -0,0 +1,100 @@
+"""
+Compare serializing large state payloads through the pydantic WebResponse
+path (response_model validation plus the default JSON encoder) with the
+web_response path used by the state endpoints.
+
+Payloads come from the stub browser, sized like real text, html and
+interactive states. Each route is driven in-process through the ASGI app.
+
+Run with: python -m interfaceagent.benchmarks.serialization
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict
+
+import httpx
+from fastapi import FastAPI
+
+from interfaceagent.datamodel import WebResponse
+from interfaceagent.interface import StubBrowserConfig, StubWebBrowser
+from interfaceagent.web import metrics, serialization
+
+
+async def build_payloads(scale: int) -> Dict[str, Dict[str, Any]]:
+    config = StubBrowserConfig(startup_latency_ms=0, close_latency_ms=0, settle_latency_ms=0,
+                               action_latency_ms={}, state_latency_ms={}, jitter=0,
+                               num_elements=1000 * scale, text_size=200_000 * scale)
+    browser = StubWebBrowser("https://example.com/", config=config)
+    await browser.initialize()
+    payloads = {state_type: await browser.get_state(state_type)
+                for state_type in ("text", "html", "interactive")}
+    await browser.close()
+    return payloads
+
+
+def build_app(state: Dict[str, Any]) -> FastAPI:
+    app = FastAPI()
+    size = metrics.state_size(state["content"])
+
+    @app.get("/before", response_model=WebResponse)
+    async def before():
+        return WebResponse(status=True, data={"state": state})
+
+    @app.get("/after")
+    async def after():
+        return serialization.web_response(True, {"state": state}, size=size)
+
+    return app
+
+
+async def time_route(app: FastAPI, path: str, iterations: int) -> float:
+    """Return the mean time per request in milliseconds, including reading the body."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        body = (await client.get(path)).content
+        json.loads(body)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await client.get(path)
+        return (time.perf_counter() - start) * 1000 / iterations
+
+
+def time_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Return the mean time per call in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+async def run(scale: int, iterations: int) -> Dict[str, Any]:
+    results = {"encoder": "orjson" if serialization.orjson else "json", "payloads": {}}
+    for state_type, state in (await build_payloads(scale)).items():
+        content = {"status": True, "data": {"state": state}}
+        # Both routes must produce the same document
+        assert json.loads(serialization.dumps(content)) == json.loads(
+            b"".join(serialization.iter_json(content)))
+        app = build_app(state)
+        before = await time_route(app, "/before", iterations)
+        after = await time_route(app, "/after", iterations)
+        results["payloads"][state_type] = {
+            "bytes": len(serialization.dumps(content)),
+            "streamed": metrics.state_size(state["content"]) > serialization.STREAM_THRESHOLD,
+            "stdlib_json_ms": round(time_call(lambda: json.dumps(content).encode(), iterations), 3),
+            "dumps_ms": round(time_call(lambda: serialization.dumps(content), iterations), 3),
+            "route_before_ms": round(before, 3),
+            "route_after_ms": round(after, 3),
+            "speedup": round(before / after, 2),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=5,
+                        help="Payload size multiplier, 1 is ~200KB of text and 1000 elements")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.scale, args.iterations)), indent=2))
@@ -0,0 +1,95 @@
+"""
+Measure import and CLI startup time and check them against a regression budget.
+
+Each command runs in a fresh interpreter; the interpreter's own startup
+(python -c pass) is subtracted. Exits non-zero when a budget is exceeded or a
+heavy dependency is imported eagerly.
+
+Run with: python -m interfaceagent.benchmarks.startup
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+# Modules that must not be loaded by `import interfaceagent` or `interfaceagent --help`
+HEAVY_MODULES = ["playwright", "openai", "loguru", "uvicorn", "fastapi"]
+
+# Default budgets in milliseconds above bare interpreter startup
+DEFAULT_BUDGETS = {
+    "import interfaceagent": 50,
+    "interfaceagent --help": 300,
+}
+
+COMMANDS = {
+    "bare interpreter": ["-c", "pass"],
+    "import interfaceagent": ["-c", "import interfaceagent"],
+    "interfaceagent --help": ["-m", "interfaceagent.cli", "--help"],
+}
+
+
+def time_command(args: List[str], repeat: int) -> float:
+    """Return the median wall time in milliseconds of running the interpreter with args."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def loaded_heavy_modules(code: str) -> List[str]:
+    """Return the heavy modules present in sys.modules after running code."""
+    probe = f"{code}\nimport sys, json\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    output = subprocess.run([sys.executable, "-c", probe], check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(repeat: int, budgets: Dict[str, float]) -> Dict:
+    timings = {name: time_command(args, repeat)
+               for name, args in COMMANDS.items()}
+    bare = timings.pop("bare interpreter")
+    results = {
+        "bare_interpreter_ms": round(bare, 1),
+        "commands": {},
+        "eager_heavy_modules": {
+            "import interfaceagent": loaded_heavy_modules("import interfaceagent"),
+            "interfaceagent --help": loaded_heavy_modules(
+                "import sys; sys.argv = ['interfaceagent', '--help']\n"
+                "from interfaceagent.cli import run\n"
+                "try:\n    run()\nexcept SystemExit:\n    pass"),
+        },
+    }
+    for name, total in timings.items():
+        results["commands"][name] = {
+            "total_ms": round(total, 1),
+            "above_bare_ms": round(total - bare, 1),
+            "budget_ms": budgets[name],
+            "within_budget": total - bare <= budgets[name],
+        }
+    results["passed"] = all(command["within_budget"] for command in results["commands"].values()) and \
+        not any(results["eager_heavy_modules"].values())
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--import-budget", type=float,
+                        default=DEFAULT_BUDGETS["import interfaceagent"])
+    parser.add_argument("--help-budget", type=float,
+                        default=DEFAULT_BUDGETS["interfaceagent --help"])
+    args = parser.parse_args()
+
+    results = run(args.repeat, {
+        "import interfaceagent": args.import_budget,
+        "interfaceagent --help": args.help_budget,
+    })
+    print(json.dumps(results, indent=2))
+    sys.exit(0 if results["passed"] else 1)
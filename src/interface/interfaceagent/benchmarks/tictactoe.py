@@ -0,0 +1,111 @@
+"""
+Measure moves per second of the list-based TicTacToeEngine against
+BitboardTicTacToeEngine.
+
+Three workloads are timed for each engine:
+  playout  random games through the GameEngine interface: is_game_over,
+           get_valid_moves, make_move
+  state    the same games building a GameState before and after each move,
+           as BaseGameMatch.play does
+  perft    walking the whole game tree from the empty board with make and
+           undo, as a minimax search would
+
+Both engines see the same random move choices, and the perft node counts
+are checked to match.
+
+Run with: python -m interfaceagent.benchmarks.tictactoe
+"""
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict
+
+from interfaceagent.eval.games.games.engines import BitboardTicTacToeEngine, TicTacToeEngine
+
+ENGINES = {"list": TicTacToeEngine, "bitboard": BitboardTicTacToeEngine}
+
+
+def playout(engine, games: int, seed: int, with_state: bool) -> int:
+    rng = random.Random(seed)
+    moves = 0
+    for _ in range(games):
+        engine.reset()
+        while not engine.is_game_over():
+            if with_state:
+                engine.get_state()
+            engine.make_move(rng.choice(engine.get_valid_moves()))
+            if with_state:
+                engine.get_state()
+            moves += 1
+    return moves
+
+
+def list_perft(engine: TicTacToeEngine) -> int:
+    # TicTacToeEngine has no undo, so take moves back through its fields
+    if engine.is_game_over():
+        return 1
+    nodes = 1
+    player = engine.current_player
+    for move in engine.get_valid_moves():
+        engine.make_move(move)
+        nodes += list_perft(engine)
+        engine.board[int(move)] = None
+        engine.move_history.pop()
+        engine.current_player = player
+    return nodes
+
+
+def bitboard_perft(engine: BitboardTicTacToeEngine) -> int:
+    if engine.is_game_over():
+        return 1
+    nodes = 1
+    for position in engine.legal_moves():
+        engine.play(position)
+        nodes += bitboard_perft(engine)
+        engine.undo()
+    return nodes
+
+
+def timed(function: Callable[[], int]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    moves = function()
+    seconds = time.perf_counter() - start
+    return {"moves": moves, "seconds": round(seconds, 3), "moves_per_s": round(moves / seconds)}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, engine_class in ENGINES.items():
+        engine = engine_class()
+        perft = list_perft if name == "list" else bitboard_perft
+        results[name] = {
+            "playout": timed(lambda: playout(engine, args.games, args.seed, with_state=False)),
+            "state": timed(lambda: playout(engine, args.state_games, args.seed, with_state=True)),
+            "perft": timed(lambda: (engine.reset(), perft(engine))[1]),
+        }
+    for workload in ("playout", "state", "perft"):
+        counts = {name: result[workload]["moves"] for name, result in results.items()}
+        if len(set(counts.values())) != 1:
+            raise RuntimeError(f"Engines disagree on {workload}: {counts}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=20000, help="Random games for the playout workload")
+    parser.add_argument("--state-games", type=int, default=2000, help="Random games for the state workload")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'workload':<10}{'moves':>9}{'list/s':>12}{'bitboard/s':>12}{'speedup':>9}")
+        for workload in ("playout", "state", "perft"):
+            old, new = results["list"][workload], results["bitboard"][workload]
+            print(f"{workload:<10}{old['moves']:>9}{old['moves_per_s']:>12}{new['moves_per_s']:>12}"
+                  f"{new['moves_per_s'] / old['moves_per_s']:>8.1f}x")
@@ -1,6 +1,7 @@
 import typer
-import uvicorn
 import os
+import tempfile
+from typing import Optional
 from typing_extensions import Annotated
 # from llmx import providers
 
@@ -14,19 +15,46 @@ def start(host: str = "127.0.0.1",
           port: int = 8082,
           workers: int = 1,
           reload: Annotated[bool, typer.Option("--reload")] = True,
-          docs: bool = False):
+          docs: bool = False,
+          max_queue_depth: int = 8,
+          max_concurrent_operations: Optional[int] = None,
+          browser_backend: str = "playwright",
+          stub_config: Optional[str] = None,
+          session_registry: Optional[str] = None,
+          task_workers: int = 2,
+          task_store: Optional[str] = None):
     """
     Launch the interfaceagent .Pass in parameters host, port, workers, and reload to override the default values.
     """
+    # Imported here so other commands and --help stay fast
+    import uvicorn
 
     os.environ["interfaceagent_API_DOCS"] = str(docs)
+    os.environ["interfaceagent_MAX_QUEUE_DEPTH"] = str(max_queue_depth)
+    if max_concurrent_operations:
+        os.environ["interfaceagent_MAX_CONCURRENT_OPERATIONS"] = str(
+            max_concurrent_operations)
+    os.environ["interfaceagent_BROWSER_BACKEND"] = browser_backend
+    if stub_config:
+        os.environ["interfaceagent_STUB_CONFIG"] = stub_config
+    if workers > 1 and not session_registry:
+        # Workers only share sessions through a registry outside the process
+        session_registry = os.path.join(
+            tempfile.gettempdir(), f"interfaceagent-sessions-{port}.db")
+    if session_registry:
+        os.environ["interfaceagent_SESSION_REGISTRY"] = session_registry
+    os.environ["interfaceagent_TASK_WORKERS"] = str(task_workers)
+    if task_store:
+        # Queued tasks only resume at startup with an explicit store
+        os.environ["interfaceagent_TASK_STORE"] = task_store
 
     uvicorn.run(
         "interfaceagent.web.app:app",
         host=host,
         port=port,
         workers=workers,
-        reload=reload,
+        # uvicorn ignores workers when reloading
+        reload=reload and workers == 1,
     )
 
 
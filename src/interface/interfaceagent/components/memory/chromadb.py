@@ -1,18 +1,41 @@
-from typing import Any, List, Dict
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, List, Dict, Tuple
 from datetime import datetime
+import asyncio
+import functools
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from chromadb import Client, PersistentClient
 from chromadb.api import ClientAPI
 from chromadb.api.models.Collection import Collection
+from chromadb.api.types import EmbeddingFunction
 # from chromadb.types import Collection
 import uuid
 import logging
 from autogen_core import CancellationToken, Image
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 from autogen_agentchat.memory import Memory, MemoryContent
+from autogen_agentchat.memory._base_memory import BaseMemoryConfig, MemoryMimeType
 from autogen_core.model_context import ChatCompletionContext
 from autogen_core.models import SystemMessage
 
+from interfaceagent.components.memory.chunking import Chunk, TextChunker
+from interfaceagent.components.memory.embeddingcache import CachedEmbeddingFunction, EmbeddingCache
+from interfaceagent.components.memory.filters import CREATED_AT_KEY, MemoryFilter, merge_where
+from interfaceagent.components.memory.lexical import BM25Index, fuse_rankings
+from interfaceagent.components.memory.retention import (
+    EVICTION_POLICIES,
+    CompactionStats,
+    RetentionEntry,
+    recency_weighted,
+    select_evictions,
+    timestamp_seconds,
+)
+from interfaceagent.components.memory.selection import InjectionStats, TokenCounter, select_memories
+
 logger = logging.getLogger(__name__)
 
 # Type vars for ChromaDB results
@@ -20,6 +43,122 @@ ChromaMetadata = Dict[str, Any]
 ChromaDistance = float | List[float]
 
 
+class ChromaClientRegistry:
+    """Process-wide ChromaDB clients, one per persistence path.
+
+    Memories on the same path share one client, and with it ChromaDB's
+    caches, instead of each opening their own. They also share the BM25
+    index of each collection, so entries one memory adds are found by the
+    hybrid queries of the others.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str | None, ClientAPI] = {}
+        self._references: Dict[str | None, int] = {}
+        # Bumped whenever a memory drops or swaps a collection, by path and collection name
+        self._generations: Dict[Tuple[str | None, str], int] = {}
+        # BM25 indexes by path and collection, built on first hybrid use
+        self._lexical_indexes: Dict[Tuple[str | None, str], BM25Index] = {}
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: str | None) -> str | None:
+        return os.path.realpath(path) if path else None
+
+    def acquire(self, path: str | None) -> ClientAPI:
+        """Get the client for a path, creating it on first use.
+
+        Args:
+            path: Persistence path, None for the in-memory client
+
+        Returns:
+            The shared client
+        """
+        key = self._key(path)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = PersistentClient(path=path) if path else Client()
+                self._clients[key] = client
+            self._references[key] = self._references.get(key, 0) + 1
+            return client
+
+    def release(self, path: str | None) -> bool:
+        """Drop one reference to a path's client.
+
+        Returns:
+            True if that was the last reference and the client was removed
+        """
+        key = self._key(path)
+        with self._lock:
+            if key not in self._references:
+                return False
+            self._references[key] -= 1
+            if self._references[key] > 0:
+                return False
+            del self._references[key]
+            del self._clients[key]
+            for generation_key in [k for k in self._generations if k[0] == key]:
+                del self._generations[generation_key]
+            with self._index_lock:
+                for index_key in [k for k in self._lexical_indexes if k[0] == key]:
+                    del self._lexical_indexes[index_key]
+            return True
+
+    def generation(self, path: str | None, name: str) -> int:
+        """How often the named collection on a path's client was dropped or swapped."""
+        with self._lock:
+            return self._generations.get((self._key(path), name), 0)
+
+    def invalidate(self, path: str | None, name: str) -> int:
+        """Mark the collection handles other memories hold for a collection as stale.
+
+        Args:
+            path: Persistence path of the shared client
+            name: Collection name the memories were configured with
+
+        Returns:
+            The new generation, which the caller's own handle is current for
+        """
+        key = (self._key(path), name)
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            return self._generations[key]
+
+    def lexical_index(
+        self,
+        path: str | None,
+        name: str,
+        build: Callable[[], BM25Index] | None = None
+    ) -> BM25Index | None:
+        """Get the BM25 index memories on a path share for a collection.
+
+        Waits for a build another memory has in progress.
+
+        Args:
+            path: Persistence path of the shared client
+            name: Name of the ChromaDB collection the index covers
+            build: Builds the index if there is none yet
+
+        Returns:
+            The index, None if there is none and no build was given
+        """
+        key = (self._key(path), name)
+        with self._index_lock:
+            index = self._lexical_indexes.get(key)
+            if index is None and build is not None:
+                index = self._lexical_indexes[key] = build()
+            return index
+
+    def drop_lexical_index(self, path: str | None, name: str) -> None:
+        with self._index_lock:
+            self._lexical_indexes.pop((self._key(path), name), None)
+
+
+client_registry = ChromaClientRegistry()
+
+
 class ChromaMemoryConfig(BaseMemoryConfig):
     """Configuration for ChromaDB-based memory implementation."""
 
@@ -35,6 +174,137 @@ class ChromaMemoryConfig(BaseMemoryConfig):
         default="cosine",
         description="Distance metric for similarity search"
     )
+    batch_size: int = Field(
+        default=256,
+        description="Number of entries embedded and inserted per call in add_many"
+    )
+    dedupe: bool = Field(
+        default=False,
+        description="Identify entries by content hash and skip ones already stored"
+    )
+    max_workers: int = Field(
+        default=4,
+        description="Threads running blocking ChromaDB calls off the event loop"
+    )
+    versioned: bool = Field(
+        default=False,
+        description="Store entries in numbered collection versions behind an alias, so rebuilds swap atomically"
+    )
+    clear_page_size: int = Field(
+        default=5000,
+        description="IDs read or deleted per call when paging through a collection"
+    )
+    embedding_cache_size: int = Field(
+        default=10000,
+        description="Embeddings kept in the in-memory LRU cache. 0 disables the cache"
+    )
+    embedding_cache_path: str | None = Field(
+        default=None,
+        description="SQLite file to persist cached embeddings to. None keeps them in memory only"
+    )
+    query_batch_window_ms: float = Field(
+        default=0,
+        description="Collect concurrent queries for this long and run them as one search. 0 disables batching"
+    )
+    max_query_batch_size: int = Field(
+        default=64,
+        description="Run a batched search as soon as this many queries are waiting"
+    )
+    token_budget: int | None = Field(
+        default=1024,
+        description="Maximum tokens transform adds to the model context. None for no limit"
+    )
+    max_tokens_per_memory: int | None = Field(
+        default=256,
+        description="Longer memories are truncated to this many tokens in transform"
+    )
+    mmr_lambda: float = Field(
+        default=0.7,
+        description="Relevance vs diversity trade-off for transform, 1.0 ranks by relevance only"
+    )
+    mmr_fetch_k: int | None = Field(
+        default=None,
+        description="Candidates fetched for max-marginal-relevance selection, 4 * k if None"
+    )
+    duplicate_threshold: float = Field(
+        default=0.95,
+        description="Cosine similarity above which transform drops a memory as a near-duplicate"
+    )
+    hybrid: bool = Field(
+        default=False,
+        description="Fuse vector search with a BM25 keyword index, so exact identifiers such as order numbers are found"
+    )
+    vector_weight: float = Field(
+        default=1.0,
+        description="Weight of the vector ranking when hybrid"
+    )
+    lexical_weight: float = Field(
+        default=1.0,
+        description="Weight of the BM25 ranking when hybrid"
+    )
+    hybrid_fetch_k: int | None = Field(
+        default=None,
+        description="Candidates taken from each ranking before fusion, 4 * k if None"
+    )
+    rrf_k: int = Field(
+        default=60,
+        description="Reciprocal rank fusion constant, larger values weigh lower ranks more evenly"
+    )
+    chunk_tokens: int = Field(
+        default=256,
+        description="Maximum tokens per chunk stored by add_document"
+    )
+    chunk_overlap_tokens: int = Field(
+        default=32,
+        description="Tokens each add_document chunk repeats from the end of the previous one"
+    )
+    neighbor_chunks: int = Field(
+        default=0,
+        description="Chunks on each side stitched onto a chunk hit in query results. 0 returns the chunk alone; "
+                    "raise max_tokens_per_memory to match"
+    )
+    max_entries: int | None = Field(
+        default=None,
+        description="Entries kept by compaction. None for no limit"
+    )
+    ttl_seconds: float | None = Field(
+        default=None,
+        description="Compaction deletes entries whose stored timestamp is older than this. None keeps them forever"
+    )
+    eviction_policy: str = Field(
+        default="oldest",
+        description="Entries evicted first when over max_entries: oldest, least_recently_retrieved, "
+                    "or lowest_score (the best score an entry reached in a query)"
+    )
+    compaction_interval_seconds: float | None = Field(
+        default=None,
+        description="Run compact in the background this often. None compacts only when compact is called"
+    )
+    compaction_batch_size: int = Field(
+        default=1000,
+        description="Entries deleted per call during compaction"
+    )
+    recency_weight: float = Field(
+        default=0.0,
+        description="Share of query scores given to how recently an entry was stored. 0 ranks by relevance only"
+    )
+    recency_half_life_seconds: float = Field(
+        default=7 * 24 * 3600,
+        description="Age in seconds at which an entry's recency bonus halves"
+    )
+
+
+class IngestionStats(BaseModel):
+    """Summary of a bulk ingestion run."""
+
+    added: int = 0
+    skipped: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return (self.added + self.skipped) / self.seconds if self.seconds else 0.0
 
 
 class ChromaMemory(Memory):
@@ -44,17 +314,57 @@ class ChromaMemory(Memory):
     its built-in embedding and similarity search capabilities.
     """
 
-    def __init__(self, name: str | None = None, config: ChromaMemoryConfig | None = None) -> None:
+    def __init__(
+        self,
+        name: str | None = None,
+        config: ChromaMemoryConfig | None = None,
+        embedding_function: EmbeddingFunction | None = None,
+        embedding_cache: EmbeddingCache | None = None,
+    ) -> None:
         """Initialize ChromaMemory.
 
         Args:
             name: Optional identifier for this memory instance
             config: Optional configuration for memory behavior
+            embedding_function: Optional embedding function, ChromaDB's default if None
+            embedding_cache: Optional cache to share between memories, built from config if None
         """
         self._name = name or "default_chroma_memory"
         self._config = config or ChromaMemoryConfig()
+        if self._config.eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unsupported eviction policy: {self._config.eviction_policy}")
+        if embedding_function is None:
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+            embedding_function = DefaultEmbeddingFunction()
+        self._owns_cache = embedding_cache is None and self._config.embedding_cache_size > 0
+        if self._owns_cache:
+            embedding_cache = EmbeddingCache(
+                max_size=self._config.embedding_cache_size,
+                path=self._config.embedding_cache_path
+            )
+        self._embedding_cache = embedding_cache
+        # Both add and query embed through the cache, so repeated texts are embedded once
+        self._embedding_function = (
+            CachedEmbeddingFunction(embedding_function, embedding_cache)
+            if embedding_cache is not None else embedding_function
+        )
         self._client: ClientAPI | None = None
         self._collection: Collection | None = None
+        # Registry generation the collection handle was resolved at
+        self._generation = 0
+        self._init_lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending_queries: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._query_batches: set[asyncio.Task] = set()
+        self._token_counter = TokenCounter()
+        # Last retrieval time and best score by entry ID, written to metadata on compaction
+        self._retrievals: Dict[str, Tuple[float, float]] = {}
+        self._retrieval_lock = threading.Lock()
+        self._tracks_retrievals = self._config.max_entries is not None and \
+            self._config.eviction_policy != "oldest"
+        self._compaction_task: asyncio.Task | None = None
+        self.last_injection: InjectionStats | None = None
 
     @property
     def name(self) -> str:
@@ -64,30 +374,145 @@ class ChromaMemory(Memory):
     def config(self) -> ChromaMemoryConfig:
         return self._config
 
+    @property
+    def embedding_cache(self) -> EmbeddingCache | None:
+        return self._embedding_cache
+
+    async def _run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        cancellation_token: CancellationToken | None = None,
+        **kwargs: Any
+    ) -> Any:
+        """Run a blocking ChromaDB call on the memory's thread pool.
+
+        Embedding inside ChromaDB can take hundreds of milliseconds, so calls
+        run off the event loop. A cancelled token stops calls that have not
+        started yet and stops waiting for ones that have.
+
+        Args:
+            fn: The blocking callable
+            cancellation_token: Optional token to cancel the call
+
+        Returns:
+            The return value of fn
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._config.max_workers,
+                thread_name_prefix=f"chroma-{self._name}"
+            )
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs))
+        if cancellation_token is not None:
+            cancellation_token.link_future(future)
+        return await future
+
+    async def _initialize(self, cancellation_token: CancellationToken | None = None) -> Collection:
+        """Initialize ChromaDB off the event loop and return the collection."""
+        await self._run(self._ensure_initialized, cancellation_token=cancellation_token)
+        if self._collection is None:
+            raise RuntimeError("Failed to initialize ChromaDB")
+        self._start_compaction()
+        return self._collection
+
     def _ensure_initialized(self) -> None:
         """Ensure ChromaDB client and collection are initialized."""
+        with self._init_lock:
+            self._ensure_initialized_locked()
+
+    def _ensure_initialized_locked(self) -> None:
         if self._client is None:
             try:
-                self._client = (
-                    PersistentClient(
-                        path=self._config.persistence_path)
-                    if self._config.persistence_path
-                    else Client()
-                )
+                self._client = client_registry.acquire(self._config.persistence_path)
             except Exception as e:
                 logger.error(f"Failed to initialize ChromaDB client: {e}")
                 raise
 
+        generation = client_registry.generation(self._config.persistence_path, self._config.collection_name)
+        if self._collection is not None and generation != self._generation:
+            # Another memory on the shared client dropped or swapped the collection
+            self._collection = None
+
         if self._collection is None and self._client is not None:
+            self._generation = generation
             try:
-                self._collection = self._client.get_or_create_collection(
-                    name=self._config.collection_name,
-                    metadata={"distance_metric": self._config.distance_metric}
-                )
+                if self._config.versioned:
+                    alias = self._alias_collection()
+                    active = alias.metadata.get("active")
+                    if active is None:
+                        active = self._create_version()
+                        self._set_active_version(active)
+                    self._collection = self._get_or_create_collection(
+                        self._version_name(active))
+                else:
+                    self._collection = self._get_or_create_collection(
+                        self._config.collection_name)
             except Exception as e:
                 logger.error(f"Failed to get/create collection: {e}")
                 raise
 
+    def _get_or_create_collection(self, name: str) -> Collection:
+        return self._client.get_or_create_collection(
+            name=name,
+            metadata={"distance_metric": self._config.distance_metric},
+            embedding_function=self._embedding_function
+        )
+
+    def _alias_collection(self) -> Collection:
+        """Get the empty collection whose metadata points at the active version."""
+        return self._client.get_or_create_collection(
+            name=f"{self._config.collection_name}__alias",
+            metadata={"latest": 0}
+        )
+
+    def _version_name(self, version: int) -> str:
+        return f"{self._config.collection_name}__v{version}"
+
+    def _create_version(self) -> int:
+        """Create the next, empty collection version without activating it."""
+        alias = self._alias_collection()
+        metadata = dict(alias.metadata or {})
+        version = int(metadata.get("latest", 0)) + 1
+        metadata["latest"] = version
+        alias.modify(metadata=metadata)
+        self._get_or_create_collection(self._version_name(version))
+        return version
+
+    def _set_active_version(self, version: int) -> None:
+        alias = self._alias_collection()
+        alias.modify(metadata={**(alias.metadata or {}), "active": version})
+
+    def _get_lexical_index(self, collection: Collection, load: bool = True) -> BM25Index | None:
+        """Get the shared BM25 index of a collection.
+
+        Args:
+            collection: The collection the index covers
+            load: Build the index from the stored documents if no memory has yet
+
+        Returns:
+            The index, None if it was not built yet and load is off
+        """
+        def build() -> BM25Index:
+            index = BM25Index()
+            offset = 0
+            while True:
+                page = collection.get(
+                    limit=self._config.clear_page_size, offset=offset, include=["documents", "metadatas"])
+                if not page["ids"]:
+                    break
+                index.add_many(zip(page["ids"], page["documents"]), page["metadatas"])
+                offset += len(page["ids"])
+            logger.info(f"Loaded BM25 index for {collection.name} with {len(index)} entries")
+            return index
+
+        return client_registry.lexical_index(
+            self._config.persistence_path, collection.name, build if load else None)
+
+    def _drop_lexical_index(self, name: str) -> None:
+        client_registry.drop_lexical_index(self._config.persistence_path, name)
+
     def _extract_text(self, content_item: MemoryContent) -> str:
         """Extract searchable text from MemoryContent.
 
@@ -114,17 +539,41 @@ class ChromaMemory(Memory):
             raise ValueError(
                 f"Unsupported content type: {content_item.mime_type}")
 
+    def _content_id(self, text: str, metadata: ChromaMetadata) -> str:
+        """Build the ID for an entry, derived from its content when dedupe is on."""
+        if not self._config.dedupe:
+            return str(uuid.uuid4())
+        return hashlib.sha256(f"{metadata['mime_type']}\0{text}".encode()).hexdigest()
+
+    def _prepare_entry(self, content: MemoryContent) -> Tuple[str, str, ChromaMetadata]:
+        """Extract the ID, document and metadata to store for a MemoryContent."""
+        text = self._extract_text(content)
+        metadata: ChromaMetadata = {
+            "timestamp": content.timestamp.isoformat() if content.timestamp else datetime.now().isoformat(),
+            "source": content.source or "",
+            "mime_type": content.mime_type.value,
+            **(content.metadata or {})
+        }
+        metadata[CREATED_AT_KEY] = timestamp_seconds(metadata["timestamp"])
+        return self._content_id(text, metadata), text, metadata
+
     async def transform(
         self,
         model_context: ChatCompletionContext,
+        token_budget: int | None = None,
     ) -> List[MemoryContent]:
         """Transform the model context using relevant memory content.
 
+        Fetches extra candidates, orders them by max-marginal relevance so
+        near-duplicates are dropped, and adds as many as fit the token budget.
+        The tokens added are reported in last_injection.
+
         Args:
             model_context: The context to transform
+            token_budget: Maximum tokens to add, defaults to config.token_budget
 
         Returns:
-            List of memory entries with relevance scores
+            List of memory entries added to the context, with relevance scores
         """
         messages = await model_context.get_messages()
         if not messages:
@@ -134,29 +583,74 @@ class ChromaMemory(Memory):
         last_message = messages[-1]
         query_text = last_message.content if isinstance(
             last_message.content, str) else str(last_message)
-        query = MemoryContent(content=query_text,
-                              mime_type=MemoryMimeType.TEXT)
-
-        # Query memory and format results
-        results = []
-        query_results = await self.query(query)
-        for i, result in enumerate(query_results, 1):
-            if isinstance(result.content, str):
-                results.append(f"{i}. {result.content}")
-                logger.debug(
-                    f"Retrieved memory {i}. {result.content}, score: {result.score}"
-                )
+
+        fetch_k = self._config.mmr_fetch_k or 4 * self._config.k
+        query_embedding, hits = await self._query_candidates(query_text, fetch_k)
+        if self._config.neighbor_chunks > 0 and hits:
+            expanded = await self._run(
+                self._with_neighbors, await self._initialize(), [[content for _, content, _ in hits]])
+            hits = [(entry_id, content, embedding) for content, (entry_id, _, embedding) in zip(expanded[0], hits)
+                    if content is not None]
+        candidates = [(content, embedding) for _, content, embedding in hits]
+        memory_context, query_results, self.last_injection = select_memories(
+            query_embedding,
+            candidates,
+            self._token_counter,
+            k=self._config.k,
+            lambda_mult=self._config.mmr_lambda,
+            duplicate_threshold=self._config.duplicate_threshold,
+            # Fused or recency-weighted scores, which embedding similarity alone would undo
+            relevance=[content.score for content, _ in candidates]
+            if self._config.hybrid or self._config.recency_weight else None,
+            token_budget=token_budget if token_budget is not None else self._config.token_budget,
+            max_tokens_per_memory=self._config.max_tokens_per_memory
+        )
+        # Only memories that made it into the context count as retrieved
+        entry_ids = {id(content): entry_id for entry_id, content, _ in hits}
+        self._record_retrievals([entry_ids[id(content)] for content in query_results],
+                                [content.score for content in query_results])
 
         # Add memory results to context
-        if results:
-            memory_context = (
-                "Results from memory query to consider include:\n" +
-                "\n".join(results)
-            )
+        if memory_context:
             await model_context.add_message(SystemMessage(content=memory_context))
 
         return query_results
 
+    async def _query_candidates(self, query_text: str, n_results: int) -> Tuple[Any, List[Tuple[str, MemoryContent, Any]]]:
+        """Query memory and return the query embedding and each hit with its entry ID and embedding."""
+        collection = await self._initialize()
+
+        def _query() -> Tuple[Any, Dict[str, Any]]:
+            query_embedding = self._embedding_function.embed_query([query_text])[0]
+            if self._config.hybrid:
+                return query_embedding, self._hybrid_query(
+                    collection, [query_text], n_results,
+                    query_embeddings=[query_embedding], include_embeddings=True)[0]
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                include=["documents", "metadatas", "distances", "embeddings"]
+            )
+            return query_embedding, results
+
+        try:
+            query_embedding, results = await self._run(_query)
+        except Exception as e:
+            logger.error(f"Failed to query ChromaDB: {e}")
+            raise
+        if self._config.hybrid:
+            return query_embedding, results
+
+        candidates: List[Tuple[str, MemoryContent, Any]] = []
+        if results and results.get("documents"):
+            for entry_id, doc, metadata, distance, embedding in zip(
+                    results["ids"][0], results["documents"][0], results["metadatas"][0],
+                    results["distances"][0], results["embeddings"][0]):
+                content = self._to_memory_content(doc, metadata, distance)
+                if content is not None:
+                    candidates.append((entry_id, content, embedding))
+        return query_embedding, candidates
+
     async def add(
         self,
         content: MemoryContent,
@@ -171,203 +665,896 @@ class ChromaMemory(Memory):
         Raises:
             RuntimeError: If ChromaDB initialization fails
         """
-        self._ensure_initialized()
-        if self._collection is None:
-            raise RuntimeError("Failed to initialize ChromaDB")
+        collection = await self._initialize(cancellation_token)
 
         try:
-            # Extract text from MemoryContent
-            text = self._extract_text(content)
-
-            # Prepare metadata
-            metadata: ChromaMetadata = {
-                "timestamp": content.timestamp.isoformat() if content.timestamp else datetime.now().isoformat(),
-                "source": content.source or "",
-                "mime_type": content.mime_type.value,
-                **(content.metadata or {})
-            }
-
-            # Add to ChromaDB
-            self._collection.add(
-                documents=[text],
-                metadatas=[metadata],
-                ids=[str(uuid.uuid4())]
+            entry_id, text, metadata = self._prepare_entry(content)
+            await self._run(self._add_entry, collection, entry_id, text, metadata,
+                            cancellation_token=cancellation_token)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to add content to ChromaDB: {e}")
+            raise
+
+    def _add_entry(self, collection: Collection, entry_id: str, text: str, metadata: ChromaMetadata) -> None:
+        if self._config.dedupe and collection.get(ids=[entry_id], include=[])["ids"]:
+            return
+
+        # Add to ChromaDB
+        collection.add(
+            documents=[text],
+            metadatas=[metadata],
+            ids=[entry_id]
+        )
+        # Memories sharing the collection may query the index even if this one is not hybrid
+        index = self._get_lexical_index(collection, load=self._config.hybrid)
+        if index is not None:
+            index.add(entry_id, text, metadata)
+
+    async def add_many(
+        self,
+        contents: Iterable[MemoryContent] | AsyncIterable[MemoryContent],
+        cancellation_token: CancellationToken | None = None,
+        batch_size: int | None = None,
+    ) -> IngestionStats:
+        """Add many memory contents to ChromaDB in batches.
+
+        Each batch is embedded and inserted with a single collection call.
+        With dedupe enabled, entries whose content is already stored (or
+        repeated earlier in the input) are skipped before embedding.
+
+        Args:
+            contents: Iterable or async iterable of memory contents to add
+            cancellation_token: Optional token to cancel the ingestion
+            batch_size: Entries per batch, defaults to the configured batch_size
+
+        Returns:
+            Counts of added and skipped entries and the ingestion time
+
+        Raises:
+            RuntimeError: If ChromaDB initialization fails
+        """
+        collection = await self._initialize(cancellation_token)
+        return await self._ingest(collection, contents, cancellation_token, batch_size)
+
+    async def add_document(
+        self,
+        source: Iterable[str] | AsyncIterable[str],
+        document_id: str | None = None,
+        mime_type: MemoryMimeType = MemoryMimeType.TEXT,
+        metadata: Dict[str, Any] | None = None,
+        source_name: str | None = None,
+        cancellation_token: CancellationToken | None = None,
+        batch_size: int | None = None,
+    ) -> IngestionStats:
+        """Add a large text or markdown document as overlapping chunks.
+
+        The source is read piece by piece, for example from an open file, and
+        chunks are stored in batches as they are produced, so the whole
+        document is never held in memory. Each chunk records its document in
+        the parent_id metadata and its position in chunk_index.
+
+        Args:
+            source: Iterable or async iterable of text, such as a file object
+            document_id: ID stored as parent_id on every chunk, generated if None
+            mime_type: TEXT or MARKDOWN
+            metadata: Metadata stored on every chunk
+            source_name: Source stored on every chunk
+            cancellation_token: Optional token to cancel the ingestion
+            batch_size: Chunks per batch, defaults to the configured batch_size
+
+        Returns:
+            Counts of added and skipped chunks and the ingestion time
+
+        Raises:
+            ValueError: If mime_type is not TEXT or MARKDOWN
+        """
+        if mime_type not in [MemoryMimeType.TEXT, MemoryMimeType.MARKDOWN]:
+            raise ValueError(f"Cannot chunk content of type {mime_type}")
+        document_id = document_id or str(uuid.uuid4())
+        chunker = TextChunker(
+            chunk_tokens=self._config.chunk_tokens,
+            overlap_tokens=self._config.chunk_overlap_tokens,
+            counter=self._token_counter
+        )
+
+        def to_content(chunk: Chunk) -> MemoryContent:
+            return MemoryContent(
+                content=chunk.text,
+                mime_type=mime_type,
+                metadata={
+                    **(metadata or {}),
+                    "parent_id": document_id,
+                    "chunk_index": chunk.index,
+                    "chunk_overlap": chunk.overlap
+                },
+                source=source_name
             )
 
+        if isinstance(source, AsyncIterable):
+            async def contents() -> AsyncIterator[MemoryContent]:
+                async for chunk in chunker.asplit(source):
+                    yield to_content(chunk)
+            stats = await self.add_many(contents(), cancellation_token, batch_size)
+        else:
+            stats = await self.add_many(
+                (to_content(chunk) for chunk in chunker.split(source)), cancellation_token, batch_size)
+        logger.info(f"Stored document {document_id} as {stats.added} chunks")
+        return stats
+
+    async def _ingest(
+        self,
+        collection: Collection,
+        contents: Iterable[MemoryContent] | AsyncIterable[MemoryContent],
+        cancellation_token: CancellationToken | None = None,
+        batch_size: int | None = None,
+    ) -> IngestionStats:
+        batch_size = batch_size or self._config.batch_size
+        stats = IngestionStats()
+        start = time.perf_counter()
+        batch: List[MemoryContent] = []
+
+        if isinstance(contents, AsyncIterable):
+            async for content in contents:
+                batch.append(content)
+                if len(batch) >= batch_size:
+                    await self._run(self._add_batch, collection, batch, stats,
+                                    cancellation_token=cancellation_token)
+                    batch = []
+        else:
+            for content in contents:
+                batch.append(content)
+                if len(batch) >= batch_size:
+                    await self._run(self._add_batch, collection, batch, stats,
+                                    cancellation_token=cancellation_token)
+                    batch = []
+        if batch:
+            await self._run(self._add_batch, collection, batch, stats,
+                            cancellation_token=cancellation_token)
+
+        stats.seconds = time.perf_counter() - start
+        logger.info(
+            f"Ingested {stats.added} entries ({stats.skipped} skipped) in {stats.batches} batches, "
+            f"{stats.items_per_second:.1f} entries/s")
+        return stats
+
+    def _add_batch(self, collection: Collection, batch: List[MemoryContent], stats: IngestionStats) -> None:
+        """Insert one batch of contents into the collection."""
+        entries: Dict[str, Tuple[str, ChromaMetadata]] = {}
+        for content in batch:
+            entry_id, text, metadata = self._prepare_entry(content)
+            entries.setdefault(entry_id, (text, metadata))
+        skipped = len(batch) - len(entries)
+
+        if self._config.dedupe:
+            existing = collection.get(ids=list(entries), include=[])["ids"]
+            for entry_id in existing:
+                del entries[entry_id]
+            skipped += len(existing)
+
+        try:
+            if entries:
+                collection.add(
+                    ids=list(entries),
+                    documents=[text for text, _ in entries.values()],
+                    metadatas=[metadata for _, metadata in entries.values()]
+                )
         except Exception as e:
-            logger.error(f"Failed to add content to ChromaDB: {e}")
+            logger.error(f"Failed to add batch to ChromaDB: {e}")
             raise
+        index = self._get_lexical_index(collection, load=self._config.hybrid) if entries else None
+        if index is not None:
+            index.add_many(
+                ((entry_id, text) for entry_id, (text, _) in entries.items()),
+                [metadata for _, metadata in entries.values()])
+
+        stats.added += len(entries)
+        stats.skipped += skipped
+        stats.batches += 1
 
     async def query(
         self,
         query: MemoryContent,
         cancellation_token: CancellationToken | None = None,
+        filters: MemoryFilter | None = None,
         **kwargs: Any,
     ) -> List[MemoryContent]:
         """Query memory content based on vector similarity.
 
+        With config.query_batch_window_ms set, concurrent calls without
+        filters or extra ChromaDB parameters are collected for that long and
+        answered by one batched search.
+
         Args:
             query: Query content to match against memory
             cancellation_token: Optional token to cancel operation
+            filters: Conditions on source, MIME type, timestamp and metadata, applied by ChromaDB
             **kwargs: Additional parameters passed to ChromaDB query
 
         Returns:
-            List of memory results with similarity scores
+            List of memory results with similarity scores, or fused rank
+            scores (1.0 for the top hit of both rankings) when hybrid
 
         Raises:
             RuntimeError: If ChromaDB initialization fails
         """
-        self._ensure_initialized()
-        if self._collection is None:
-            raise RuntimeError("Failed to initialize ChromaDB")
+        if self._config.query_batch_window_ms > 0 and filters is None and not kwargs:
+            return await self._batched_query(self._extract_text(query), cancellation_token)
+        return (await self.query_many([query], cancellation_token, filters, **kwargs))[0]
 
-        try:
-            # Extract text for query
-            query_text = self._extract_text(query)
-
-            # Query ChromaDB
-            results = self._collection.query(
-                query_texts=[query_text],
-                n_results=self._config.k,
-                **kwargs
-            )
+    async def query_many(
+        self,
+        queries: List[MemoryContent],
+        cancellation_token: CancellationToken | None = None,
+        filters: MemoryFilter | None = None,
+        **kwargs: Any,
+    ) -> List[List[MemoryContent]]:
+        """Query memory for several contents with a single vector search.
 
-            # Convert results to MemoryQueryResults
-            memory_results: List[MemoryContent] = []
+        Args:
+            queries: Query contents to match against memory
+            cancellation_token: Optional token to cancel operation
+            filters: Conditions on source, MIME type, timestamp and metadata, applied by ChromaDB
+            **kwargs: Additional parameters passed to ChromaDB query
 
-            if not results or not results.get("documents") or not results.get("metadatas") or not results.get("distances"):
-                return memory_results
+        Returns:
+            One list of memory results per query, in the same order
 
-            documents = results["documents"][0] if results["documents"] else []
-            metadatas = results["metadatas"][0] if results["metadatas"] else []
-            distances = results["distances"][0] if results["distances"] else []
+        Raises:
+            RuntimeError: If ChromaDB initialization fails
+        """
+        if filters is not None:
+            # Pushed into the store query instead of filtering fetched results
+            where = merge_where(filters.to_chroma_where(), kwargs.pop("where", None))
+            if where is not None:
+                kwargs["where"] = where
+        return await self._query_texts([self._extract_text(query) for query in queries],
+                                       cancellation_token, filters=filters, **kwargs)
+
+    async def _query_texts(
+        self,
+        query_texts: List[str],
+        cancellation_token: CancellationToken | None = None,
+        filters: MemoryFilter | None = None,
+        **kwargs: Any,
+    ) -> List[List[MemoryContent]]:
+        if not query_texts:
+            return []
+        collection = await self._initialize(cancellation_token)
 
-            for doc, metadata, distance in zip(documents, metadatas, distances):
-                # Extract stored metadata
-                entry_metadata = dict(metadata)
-                timestamp_str = str(entry_metadata.pop("timestamp"))
-                timestamp = datetime.fromisoformat(timestamp_str)
-                source = str(entry_metadata.pop("source"))
-                mime_type = MemoryMimeType(entry_metadata.pop("mime_type"))
+        try:
+            if self._config.hybrid:
+                hits = await self._run(
+                    self._hybrid_query,
+                    collection,
+                    query_texts,
+                    self._config.k,
+                    filters=filters,
+                    cancellation_token=cancellation_token,
+                    **kwargs
+                )
+                results_with_ids = [[(entry_id, content) for entry_id, content, _ in query_hits]
+                                    for query_hits in hits]
+            else:
+                # Query ChromaDB
+                results = await self._run(
+                    collection.query,
+                    query_texts=query_texts,
+                    # Extra candidates for recency weighting to reorder
+                    n_results=self._config.k * (4 if self._config.recency_weight else 1),
+                    cancellation_token=cancellation_token,
+                    **kwargs
+                )
 
-                # Convert distance to similarity score
-                score = 1.0 - (float(distance) / 2.0) if self._config.distance_metric == "cosine" \
-                    else 1.0 / (1.0 + float(distance))
+                if not results or not results.get("documents") or not results.get("metadatas") or not results.get("distances"):
+                    return [[] for _ in query_texts]
+
+                results_with_ids = [
+                    self._to_memory_results(ids, documents, metadatas, distances)[:self._config.k]
+                    for ids, documents, metadatas, distances
+                    in zip(results["ids"], results["documents"], results["metadatas"], results["distances"])
+                ]
+
+            if self._config.neighbor_chunks > 0:
+                expanded = await self._run(self._with_neighbors, collection,
+                                           [[content for _, content in query_results]
+                                            for query_results in results_with_ids],
+                                           cancellation_token=cancellation_token)
+                results_with_ids = [
+                    [(entry_id, content) for (entry_id, _), content in zip(query_results, query_expanded)
+                     if content is not None]
+                    for query_results, query_expanded in zip(results_with_ids, expanded)
+                ]
+            for query_results in results_with_ids:
+                self._record_retrievals([entry_id for entry_id, _ in query_results],
+                                        [content.score for _, content in query_results])
+            return [[content for _, content in query_results] for query_results in results_with_ids]
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to query ChromaDB: {e}")
+            raise
+
+    def _to_memory_results(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[ChromaMetadata],
+        distances: List[float]
+    ) -> List[Tuple[str, MemoryContent]]:
+        """Convert the results of one ChromaDB query to MemoryContent, each with its entry ID."""
+        memory_results: List[Tuple[str, MemoryContent]] = []
+        for entry_id, doc, metadata, distance in zip(ids, documents, metadatas, distances):
+            content = self._to_memory_content(doc, metadata, distance)
+            if content is not None:
+                memory_results.append((entry_id, content))
+        if self._config.recency_weight:
+            memory_results.sort(key=lambda result: result[1].score, reverse=True)
+        return memory_results
+
+    def _hybrid_query(
+        self,
+        collection: Collection,
+        query_texts: List[str],
+        n_results: int,
+        query_embeddings: List[Any] | None = None,
+        include_embeddings: bool = False,
+        filters: MemoryFilter | None = None,
+        **kwargs: Any,
+    ) -> List[List[Tuple[str, MemoryContent, Any]]]:
+        """Search the collection and its BM25 index and fuse the two rankings.
+
+        The score threshold only filters the vector ranking, so an exact
+        keyword match is kept even when its embedding is far from the query.
 
-                # Apply score threshold if configured
+        Args:
+            collection: The collection to search
+            query_texts: The queries
+            n_results: Maximum hits per query
+            query_embeddings: Precomputed query embeddings, embedded from query_texts if None
+            include_embeddings: Return each hit's embedding, otherwise None
+            filters: Typed conditions, checked while scanning the BM25 index so they
+                do not cut its top fetch_k hits; the where clause is built by the caller
+            **kwargs: Additional parameters passed to ChromaDB query
+
+        Returns:
+            Per query, up to n_results hits with fused scores, each with its entry ID and embedding
+        """
+        fetch_k = self._config.hybrid_fetch_k or 4 * n_results
+        include = ["documents", "metadatas"] + (["embeddings"] if include_embeddings else [])
+        if query_embeddings is not None:
+            results = collection.query(query_embeddings=query_embeddings, n_results=fetch_k,
+                                       include=include + ["distances"], **kwargs)
+        else:
+            results = collection.query(query_texts=query_texts, n_results=fetch_k,
+                                       include=include + ["distances"], **kwargs)
+        index = self._get_lexical_index(collection)
+        accept = filters.matches if filters is not None else None
+        lexical_rankings = [[entry_id for entry_id, _ in index.search(text, fetch_k, accept=accept)]
+                            for text in query_texts]
+
+        # Every stored document either search returned, by ID
+        hits: Dict[str, Tuple[str, ChromaMetadata, Any]] = {}
+        vector_rankings: List[List[str]] = []
+        for i in range(len(query_texts)):
+            ranking = []
+            for j, entry_id in enumerate(results["ids"][i]):
+                hits[entry_id] = (
+                    results["documents"][i][j],
+                    results["metadatas"][i][j],
+                    results["embeddings"][i][j] if include_embeddings else None
+                )
+                score = self._similarity(results["distances"][i][j])
                 if self._config.score_threshold is None or score >= self._config.score_threshold:
-                    # Create MemoryContent
-                    content = MemoryContent(
-                        content=doc,
-                        mime_type=mime_type,
-                        metadata=entry_metadata,
-                        timestamp=timestamp,
-                        source=source or None,
-                        score=score
-                    )
-                    memory_results.append(content)
-
-            return memory_results
+                    ranking.append(entry_id)
+            vector_rankings.append(ranking)
+
+        missing = list({entry_id for ranking in lexical_rankings for entry_id in ranking} - hits.keys())
+        if missing:
+            # Filters apply to keyword hits too; ones they exclude are not returned
+            fetched = collection.get(ids=missing, include=include, where=kwargs.get("where"),
+                                     where_document=kwargs.get("where_document"))
+            for j, entry_id in enumerate(fetched["ids"]):
+                hits[entry_id] = (
+                    fetched["documents"][j],
+                    fetched["metadatas"][j],
+                    fetched["embeddings"][j] if include_embeddings else None
+                )
+
+        fused_results: List[List[Tuple[str, MemoryContent, Any]]] = []
+        for vector_ranking, lexical_ranking in zip(vector_rankings, lexical_rankings):
+            fused = fuse_rankings(
+                [vector_ranking, [entry_id for entry_id in lexical_ranking if entry_id in hits]],
+                [self._config.vector_weight, self._config.lexical_weight],
+                rrf_k=self._config.rrf_k
+            )
+            if not self._config.recency_weight:
+                fused = fused[:n_results]
+            query_hits = []
+            for entry_id, score in fused:
+                doc, metadata, embedding = hits[entry_id]
+                query_hits.append((entry_id, self._build_content(doc, metadata, score), embedding))
+            if self._config.recency_weight:
+                query_hits.sort(key=lambda hit: hit[1].score, reverse=True)
+                del query_hits[n_results:]
+            fused_results.append(query_hits)
+        return fused_results
+
+    def _with_neighbors(
+        self,
+        collection: Collection,
+        results: List[List[MemoryContent]]
+    ) -> List[List[MemoryContent | None]]:
+        """Replace chunk hits with their chunk stitched to its neighbors.
 
+        Fetches the neighbors of every hit in one call. Hits from add_document
+        are widened by config.neighbor_chunks chunks on each side, with the
+        overlap between chunks removed; other hits are returned unchanged.
+
+        Args:
+            collection: The collection the hits came from
+            results: Hits per query, best first
+
+        Returns:
+            Hits per query in the same positions, None for a hit already
+            covered by a better hit's neighborhood
+        """
+        window = self._config.neighbor_chunks
+        conditions = []
+        for query_results in results:
+            for content in query_results:
+                if content.metadata and "parent_id" in content.metadata:
+                    index = int(content.metadata["chunk_index"])
+                    conditions.append({"$and": [
+                        {"parent_id": content.metadata["parent_id"]},
+                        {"chunk_index": {"$gte": index - window}},
+                        {"chunk_index": {"$lte": index + window}}
+                    ]})
+        if not conditions:
+            return results
+
+        fetched = collection.get(
+            where=conditions[0] if len(conditions) == 1 else {"$or": conditions},
+            include=["documents", "metadatas"]
+        )
+        chunks: Dict[Tuple[str, int], Tuple[str, int]] = {
+            (metadata["parent_id"], int(metadata["chunk_index"])): (doc, int(metadata.get("chunk_overlap", 0)))
+            for doc, metadata in zip(fetched["documents"], fetched["metadatas"])
+        }
+
+        expanded: List[List[MemoryContent | None]] = []
+        for query_results in results:
+            covered: set[Tuple[str, int]] = set()
+            query_expanded: List[MemoryContent | None] = []
+            for content in query_results:
+                if not content.metadata or "parent_id" not in content.metadata:
+                    query_expanded.append(content)
+                    continue
+                parent = content.metadata["parent_id"]
+                index = int(content.metadata["chunk_index"])
+                if (parent, index) in covered:
+                    query_expanded.append(None)
+                    continue
+                # Only stitch contiguous chunks, dedupe may have skipped some
+                start = end = index
+                while start > index - window and (parent, start - 1) in chunks:
+                    start -= 1
+                while end < index + window and (parent, end + 1) in chunks:
+                    end += 1
+                if (parent, index) not in chunks:
+                    start = end = index
+                covered.update((parent, i) for i in range(start, end + 1))
+                if start == end:
+                    query_expanded.append(content)
+                    continue
+                text = chunks[(parent, start)][0] + "".join(
+                    chunks[(parent, i)][0][chunks[(parent, i)][1]:] for i in range(start + 1, end + 1))
+                query_expanded.append(content.model_copy(update={
+                    "content": text,
+                    "metadata": {**content.metadata, "chunk_start": start, "chunk_end": end}
+                }))
+            expanded.append(query_expanded)
+        return expanded
+
+    def _record_retrievals(self, ids: Iterable[str], scores: Iterable[float]) -> None:
+        """Note when entries were returned and their best score, for the eviction policy."""
+        if not self._tracks_retrievals:
+            return
+        now = time.time()
+        with self._retrieval_lock:
+            for entry_id, score in zip(ids, scores):
+                _, best_score = self._retrievals.get(entry_id, (now, 0.0))
+                self._retrievals[entry_id] = (now, max(best_score, score))
+
+    def _similarity(self, distance: float) -> float:
+        """Convert a ChromaDB distance to a similarity score."""
+        return 1.0 - (float(distance) / 2.0) if self._config.distance_metric == "cosine" \
+            else 1.0 / (1.0 + float(distance))
+
+    def _to_memory_content(self, doc: str, metadata: ChromaMetadata, distance: float) -> MemoryContent | None:
+        """Convert one ChromaDB hit to MemoryContent, None if below the score threshold."""
+        score = self._similarity(distance)
+
+        # Apply score threshold if configured
+        if self._config.score_threshold is not None and score < self._config.score_threshold:
+            return None
+        return self._build_content(doc, metadata, score)
+
+    def _build_content(self, doc: str, metadata: ChromaMetadata, score: float) -> MemoryContent:
+        # Extract stored metadata
+        entry_metadata = dict(metadata)
+        timestamp_str = str(entry_metadata.pop("timestamp"))
+        timestamp = datetime.fromisoformat(timestamp_str)
+        source = str(entry_metadata.pop("source"))
+        mime_type = MemoryMimeType(entry_metadata.pop("mime_type"))
+        entry_metadata.pop(CREATED_AT_KEY, None)
+        entry_metadata.pop("last_retrieved", None)
+        entry_metadata.pop("best_score", None)
+        score = recency_weighted(
+            score, timestamp_seconds(timestamp), time.time(),
+            self._config.recency_weight, self._config.recency_half_life_seconds)
+
+        # Create MemoryContent
+        return MemoryContent(
+            content=doc,
+            mime_type=mime_type,
+            metadata=entry_metadata,
+            timestamp=timestamp,
+            source=source or None,
+            score=score
+        )
+
+    async def _batched_query(
+        self,
+        query_text: str,
+        cancellation_token: CancellationToken | None = None
+    ) -> List[MemoryContent]:
+        """Queue a query for the next batched search and wait for its results."""
+        future: asyncio.Future[List[MemoryContent]] = asyncio.get_running_loop().create_future()
+        self._pending_queries.append((query_text, future))
+        if len(self._pending_queries) >= self._config.max_query_batch_size:
+            self._flush_queries()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._config.query_batch_window_ms / 1000, self._flush_queries)
+        if cancellation_token is not None:
+            # Only this caller stops waiting, the batch still runs for the others
+            cancellation_token.link_future(future)
+        return await future
+
+    def _flush_queries(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending_queries = self._pending_queries, []
+        if pending:
+            task = asyncio.ensure_future(self._run_query_batch(pending))
+            self._query_batches.add(task)
+            task.add_done_callback(self._query_batches.discard)
+
+    async def _run_query_batch(self, pending: List[Tuple[str, asyncio.Future]]) -> None:
+        # Identical texts in one window share a single search
+        texts = list(dict.fromkeys(text for text, _ in pending))
+        try:
+            results = dict(zip(texts, await self._query_texts(texts)))
         except Exception as e:
-            logger.error(f"Failed to query ChromaDB: {e}")
-            raise
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for text, future in pending:
+            if not future.done():
+                # Callers get their own list, as with unbatched queries
+                future.set_result(list(results[text]))
 
     async def clear(self) -> None:
         """Clear all entries from memory.
 
+        Drops and recreates the collection (or, when versioned, swaps to a new
+        empty version) instead of loading every entry. Falls back to deleting
+        IDs page by page if the collection cannot be dropped.
+
         Raises:
             RuntimeError: If ChromaDB initialization fails
         """
-        self._ensure_initialized()
-        if self._collection is None:
-            raise RuntimeError("Failed to initialize ChromaDB")
+        collection = await self._initialize()
 
         try:
-            # Get all document IDs from the collection
-            results = self._collection.get()
-            if results and results['ids']:
-                # Delete all documents by their IDs
-                self._collection.delete(ids=results['ids'])
+            if self._config.versioned:
+                version = await self._run(self._create_version)
+                await self.activate_version(version)
+                return
+            try:
+                await self._run(self._recreate_collection, collection.name)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to drop ChromaDB collection, deleting entries in pages: {e}")
+                await self._run(self._delete_in_pages, collection)
         except Exception as e:
             logger.error(f"Failed to clear ChromaDB collection: {e}")
             raise
 
+    def _recreate_collection(self, name: str) -> None:
+        self._client.delete_collection(name)
+        self._drop_lexical_index(name)
+        self._collection = self._get_or_create_collection(name)
+        self._generation = client_registry.invalidate(self._config.persistence_path, self._config.collection_name)
+
+    def _delete_in_pages(self, collection: Collection) -> None:
+        while True:
+            ids = collection.get(
+                limit=self._config.clear_page_size, include=[])["ids"]
+            if not ids:
+                self._drop_lexical_index(collection.name)
+                return
+            collection.delete(ids=ids)
+
+    async def rebuild(
+        self,
+        contents: Iterable[MemoryContent] | AsyncIterable[MemoryContent],
+        cancellation_token: CancellationToken | None = None,
+        keep_previous: bool = False,
+    ) -> IngestionStats:
+        """Build a fresh collection version from contents and swap to it.
+
+        Queries keep hitting the current version until the new one is fully
+        ingested, then all traffic moves to it at once.
+
+        Args:
+            contents: Iterable or async iterable of memory contents for the new version
+            cancellation_token: Optional token to cancel the rebuild
+            keep_previous: Keep the previous version for activate_version rollbacks
+
+        Returns:
+            Ingestion stats for the new version
+
+        Raises:
+            ValueError: If the memory is not versioned
+        """
+        if not self._config.versioned:
+            raise ValueError("rebuild requires ChromaMemoryConfig(versioned=True)")
+        await self._initialize(cancellation_token)
+
+        version = await self._run(self._create_version)
+        collection = await self._run(self._get_or_create_collection, self._version_name(version))
+        try:
+            stats = await self._ingest(collection, contents, cancellation_token)
+        except BaseException:
+            # Leave the active version untouched and drop the partial build
+            await self._run(self._client.delete_collection, collection.name)
+            self._drop_lexical_index(collection.name)
+            raise
+        await self.activate_version(version, keep_previous=keep_previous)
+        return stats
+
+    async def list_versions(self) -> Dict[str, Any]:
+        """List the stored collection versions and the active one."""
+        if not self._config.versioned:
+            raise ValueError("list_versions requires ChromaMemoryConfig(versioned=True)")
+        await self._initialize()
+
+        def _list() -> Dict[str, Any]:
+            prefix = f"{self._config.collection_name}__v"
+            # Older clients list names, newer ones list Collection objects
+            names = [c if isinstance(c, str) else c.name for c in self._client.list_collections()]
+            versions = sorted(int(name[len(prefix):]) for name in names
+                              if name.startswith(prefix) and name[len(prefix):].isdigit())
+            return {"active": self._alias_collection().metadata.get("active"), "versions": versions}
+        return await self._run(_list)
+
+    async def activate_version(self, version: int, keep_previous: bool = False) -> None:
+        """Point the memory at an existing collection version.
+
+        Args:
+            version: The version to activate
+            keep_previous: Keep the previously active version instead of deleting it
+        """
+        if not self._config.versioned:
+            raise ValueError("activate_version requires ChromaMemoryConfig(versioned=True)")
+        await self._initialize()
+
+        def _activate() -> None:
+            # Fails for versions that do not exist instead of creating them
+            self._client.get_collection(self._version_name(version))
+            collection = self._get_or_create_collection(
+                self._version_name(version))
+            previous = self._alias_collection().metadata.get("active")
+            self._set_active_version(version)
+            self._collection = collection
+            self._generation = client_registry.invalidate(
+                self._config.persistence_path, self._config.collection_name)
+            if previous is not None and previous != version and not keep_previous:
+                self._client.delete_collection(self._version_name(previous))
+                self._drop_lexical_index(self._version_name(previous))
+        await self._run(_activate)
+        logger.info(f"Activated version {version} of {self._config.collection_name}")
+
+    async def compact(self, cancellation_token: CancellationToken | None = None) -> CompactionStats:
+        """Delete expired entries and evict entries over the size limit.
+
+        Reads only IDs and metadata, and deletes in batches of
+        config.compaction_batch_size so queries keep running in between.
+        Runs in the background when config.compaction_interval_seconds is set.
+
+        Args:
+            cancellation_token: Optional token to cancel the compaction
+
+        Returns:
+            Counts of scanned, expired and evicted entries and the time taken
+        """
+        collection = await self._initialize(cancellation_token)
+        start = time.perf_counter()
+        entries = await self._run(self._scan_retention, collection, cancellation_token=cancellation_token)
+        expired, evicted = select_evictions(
+            entries,
+            time.time(),
+            ttl_seconds=self._config.ttl_seconds,
+            max_entries=self._config.max_entries,
+            policy=self._config.eviction_policy
+        )
+        stats = CompactionStats(scanned=len(entries), expired=len(expired), evicted=len(evicted))
+
+        ids = expired + evicted
+        batch_size = self._config.compaction_batch_size
+        for i in range(0, len(ids), batch_size):
+            await self._run(self._delete_entries, collection, ids[i:i + batch_size],
+                            cancellation_token=cancellation_token)
+            stats.batches += 1
+
+        stats.seconds = time.perf_counter() - start
+        if ids:
+            logger.info(
+                f"Compacted {collection.name}: {stats.expired} expired and {stats.evicted} evicted "
+                f"of {stats.scanned} entries in {stats.seconds:.2f}s")
+        return stats
+
+    def _scan_retention(self, collection: Collection) -> List[RetentionEntry]:
+        """Read the age and retrieval history of every entry, saving new retrievals to metadata."""
+        with self._retrieval_lock:
+            retrievals, self._retrievals = self._retrievals, {}
+        now = time.time()
+        entries: List[RetentionEntry] = []
+        updated_ids: List[str] = []
+        updated_metadatas: List[ChromaMetadata] = []
+        offset = 0
+        while True:
+            page = collection.get(limit=self._config.clear_page_size, offset=offset, include=["metadatas"])
+            if not page["ids"]:
+                break
+            for entry_id, metadata in zip(page["ids"], page["metadatas"]):
+                last_retrieved = metadata.get("last_retrieved")
+                best_score = metadata.get("best_score")
+                if entry_id in retrievals:
+                    last_retrieved, score = retrievals[entry_id]
+                    best_score = max(best_score or 0.0, score)
+                    updated_ids.append(entry_id)
+                    updated_metadatas.append(
+                        {**metadata, "last_retrieved": last_retrieved, "best_score": best_score})
+                entries.append(RetentionEntry(
+                    id=entry_id,
+                    created=metadata.get(CREATED_AT_KEY) or (
+                        timestamp_seconds(metadata["timestamp"]) if "timestamp" in metadata else now),
+                    last_retrieved=last_retrieved,
+                    best_score=best_score
+                ))
+            offset += len(page["ids"])
+
+        # Persisted so the eviction policy survives restarts
+        batch_size = self._config.compaction_batch_size
+        for i in range(0, len(updated_ids), batch_size):
+            collection.update(ids=updated_ids[i:i + batch_size],
+                              metadatas=updated_metadatas[i:i + batch_size])
+        return entries
+
+    def _delete_entries(self, collection: Collection, ids: List[str]) -> None:
+        collection.delete(ids=ids)
+        index = self._get_lexical_index(collection, load=False)
+        if index is not None:
+            for entry_id in ids:
+                index.remove(entry_id)
+
+    def _start_compaction(self) -> None:
+        """Start the background compaction task if configured and not running."""
+        if self._config.compaction_interval_seconds is None:
+            return
+        if self._compaction_task is None or self._compaction_task.done():
+            self._compaction_task = asyncio.ensure_future(self._compaction_loop())
+
+    async def _compaction_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._config.compaction_interval_seconds)
+            try:
+                await self.compact()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background compaction of ChromaDB failed: {e}")
+
     async def cleanup(self) -> None:
-        """Clean up ChromaDB client and resources."""
+        """Release the ChromaDB client and clean up resources.
+
+        The client is shared with other memories on the same path and only
+        reset once the last of them is cleaned up.
+        """
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            self._compaction_task = None
         if self._client is not None:
             try:
-                if hasattr(self._client, "reset"):
-                    self._client.reset()
+                if client_registry.release(self._config.persistence_path) and hasattr(self._client, "reset"):
+                    await self._run(self._client.reset)
             except Exception as e:
                 logger.error(f"Error during ChromaDB cleanup: {e}")
             finally:
                 self._client = None
                 self._collection = None
-                
-                
-                
-                
-                
-
-
-from autogen_core import CancellationToken
-from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.memory._base_memory import MemoryContent, MemoryMimeType
-from autogen_agentchat.memory._chroma_memory import ChromaMemory, ChromaMemoryConfig
-
-
-# Initialize memory
-chroma_memory = ChromaMemory(
-    name="travel_memory",
-    config=ChromaMemoryConfig(
-        collection_name="travel_facts",
-        k=1,
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._owns_cache and self._embedding_cache is not None:
+            self._embedding_cache.close()
+
+
+async def main() -> None:
+    from autogen_agentchat.agents import AssistantAgent
+    from autogen_agentchat.conditions import MaxMessageTermination
+    from autogen_agentchat.teams import RoundRobinGroupChat
+    from autogen_agentchat.ui import Console
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+    # Initialize memory
+    chroma_memory = ChromaMemory(
+        name="travel_memory",
+        config=ChromaMemoryConfig(
+            collection_name="travel_facts",
+            k=1,
+        )
     )
-)
-
-await chroma_memory.clear()
-
-# Add travel-related memories
-await chroma_memory.add(MemoryContent(
-
-    content="Paris is known for the Eiffel Tower and amazing cuisine.",
-    mime_type=MemoryMimeType.TEXT
 
-))
+    await chroma_memory.clear()
 
-await chroma_memory.add(MemoryContent( 
-    content="When asked about tokyo, you must respond with 'The most important thing about tokyo is that it has the world's busiest railway station - Shinjuku Station.'",
-    mime_type=MemoryMimeType.TEXT
-
-))
- 
+    # Add travel-related memories
+    await chroma_memory.add(MemoryContent(
+        content="Paris is known for the Eiffel Tower and amazing cuisine.",
+        mime_type=MemoryMimeType.TEXT
+    ))
 
-# Query needs ContentItem too
-results = await chroma_memory.query(
-    MemoryContent(
-        content="Tell me about Tokyo.",
+    await chroma_memory.add(MemoryContent(
+        content="When asked about tokyo, you must respond with 'The most important thing about tokyo is that it has the world's busiest railway station - Shinjuku Station.'",
         mime_type=MemoryMimeType.TEXT
+    ))
+
+    # Query needs ContentItem too
+    results = await chroma_memory.query(
+        MemoryContent(
+            content="Tell me about Tokyo.",
+            mime_type=MemoryMimeType.TEXT
+        )
     )
-)
 
-print(len(results), results)
-
-# Create agent with memory
-agent = AssistantAgent(
-    name="travel_agent",
-    model_client=OpenAIChatCompletionClient(
-        model="gpt-4o",
-        # api_key="your_api_key"
-    ),
-    memory=chroma_memory,
-    system_message="You are a travel expert"
-)
+    print(len(results), results)
+
+    # Create agent with memory
+    agent = AssistantAgent(
+        name="travel_agent",
+        model_client=OpenAIChatCompletionClient(
+            model="gpt-4o",
+            # api_key="your_api_key"
+        ),
+        memory=chroma_memory,
+        system_message="You are a travel expert"
+    )
+
+    agent_team = RoundRobinGroupChat(
+        [agent], termination_condition=MaxMessageTermination(max_messages=2))
+    stream = agent_team.run_stream(
+        task="Tell me the most important thing about Tokyo.")
+    await Console(stream)
+
+    # Output: The most important thing about tokyo is that it has the world's busiest railway station - Shinjuku Station.
 
-agent_team = RoundRobinGroupChat([agent], termination_condition = MaxMessageTermination(max_messages=2))
-stream = agent_team.run_stream(task="Tell me the most important thing about Tokyo.")
-await Console(stream);
 
-# Output: The most important thing about tokyo is that it has the world's busiest railway station - Shinjuku Station.                
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(main())
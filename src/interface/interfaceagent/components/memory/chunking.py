@@ -0,0 +1,164 @@
+from typing import AsyncIterable, AsyncIterator, Deque, Iterable, Iterator, List, Tuple
+from collections import deque
+import re
+
+from pydantic import BaseModel
+
+from interfaceagent.components.memory.selection import TokenCounter
+
+
+class Chunk(BaseModel):
+    """One piece of a chunked document."""
+
+    index: int
+    text: str
+    tokens: int
+    # Characters at the start of text repeated from the previous chunk
+    overlap: int = 0
+
+
+class TextChunker:
+    """Splits streamed text into token-bounded, overlapping chunks.
+
+    Text is consumed piece by piece, for example line by line from an open
+    file, and only the chunk being built is held in memory. Chunks end on
+    line boundaries where possible, and on word boundaries for lines longer
+    than a chunk.
+    """
+
+    def __init__(self, chunk_tokens: int = 256, overlap_tokens: int = 32,
+                 counter: TokenCounter | None = None) -> None:
+        """Initialize TextChunker.
+
+        Args:
+            chunk_tokens: Maximum tokens per chunk
+            overlap_tokens: Maximum tokens a chunk repeats from the end of the previous one
+            counter: Token counter for the embedding model
+        """
+        if overlap_tokens >= chunk_tokens:
+            raise ValueError("overlap_tokens must be smaller than chunk_tokens")
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.counter = counter or TokenCounter()
+
+    def split(self, source: Iterable[str]) -> Iterator[Chunk]:
+        """Chunk text from an iterable of strings such as a file object."""
+        builder = _ChunkBuilder(self)
+        for text in source:
+            yield from builder.feed(text)
+        yield from builder.finish()
+
+    async def asplit(self, source: AsyncIterable[str]) -> AsyncIterator[Chunk]:
+        """Chunk text from an async iterable of strings."""
+        builder = _ChunkBuilder(self)
+        async for text in source:
+            for chunk in builder.feed(text):
+                yield chunk
+        for chunk in builder.finish():
+            yield chunk
+
+
+class _ChunkBuilder:
+    """State of one TextChunker.split run."""
+
+    def __init__(self, chunker: TextChunker) -> None:
+        self.chunker = chunker
+        # Longest run of text without a newline buffered before splitting it at a space
+        self.max_pending = chunker.chunk_tokens * 16
+        self.pending = ""
+        self.segments: Deque[Tuple[str, int]] = deque()
+        self.tokens = 0
+        # Leading segments carried over from the previous chunk
+        self.carried = 0
+        self.index = 0
+
+    def feed(self, text: str) -> List[Chunk]:
+        self.pending += text
+        lines = self.pending.splitlines(keepends=True)
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            self.pending = lines.pop()
+        else:
+            self.pending = ""
+        if len(self.pending) > self.max_pending:
+            # Bound memory for input without newlines
+            cut = self.pending.rfind(" ", 0, self.max_pending) + 1 or self.max_pending
+            lines.append(self.pending[:cut])
+            self.pending = self.pending[cut:]
+
+        chunks: List[Chunk] = []
+        for line in lines:
+            for segment, tokens in self._segments(line):
+                chunks.extend(self._add(segment, tokens))
+        return chunks
+
+    def finish(self) -> List[Chunk]:
+        chunks: List[Chunk] = []
+        for segment, tokens in self._segments(self.pending):
+            chunks.extend(self._add(segment, tokens))
+        self.pending = ""
+        if len(self.segments) > self.carried:
+            chunks.append(self._emit())
+        return chunks
+
+    def _segments(self, line: str) -> Iterator[Tuple[str, int]]:
+        """Yield the line as pieces of at most chunk_tokens tokens each."""
+        if not line:
+            return
+        limit = self.chunker.chunk_tokens
+        tokens = self.chunker.counter.count(line)
+        if tokens <= limit:
+            yield line, tokens
+            return
+        for word in re.findall(r"\S*\s*", line):
+            if not word:
+                continue
+            word_tokens = self.chunker.counter.count(word)
+            if word_tokens <= limit:
+                yield word, word_tokens
+                continue
+            # A token spans at least one character
+            for start in range(0, len(word), limit):
+                piece = word[start:start + limit]
+                yield piece, self.chunker.counter.count(piece)
+
+    def _add(self, segment: str, tokens: int) -> List[Chunk]:
+        chunks: List[Chunk] = []
+        while self.segments and self.tokens + tokens > self.chunker.chunk_tokens:
+            if len(self.segments) > self.carried:
+                chunks.append(self._emit())
+            else:
+                # Carried overlap alone leaves no room, drop it from the front
+                _, dropped = self.segments.popleft()
+                self.tokens -= dropped
+                self.carried -= 1
+        self.segments.append((segment, tokens))
+        self.tokens += tokens
+        return chunks
+
+    def _emit(self) -> Chunk:
+        segments = list(self.segments)
+        chunk = Chunk(
+            index=self.index,
+            text="".join(segment for segment, _ in segments),
+            tokens=self.tokens,
+            overlap=sum(len(segment) for segment, _ in segments[:self.carried])
+        )
+        self.index += 1
+
+        # Carry the tail of this chunk into the next one
+        self.segments = deque()
+        self.tokens = 0
+        for segment, tokens in reversed(segments):
+            if self.tokens + tokens > self.chunker.overlap_tokens:
+                # Take the end of a segment that does not fit whole, word by word
+                for word in reversed(re.findall(r"\S*\s*", segment)):
+                    word_tokens = self.chunker.counter.count(word)
+                    if self.tokens + word_tokens > self.chunker.overlap_tokens:
+                        break
+                    self.segments.appendleft((word, word_tokens))
+                    self.tokens += word_tokens
+                break
+            self.segments.appendleft((segment, tokens))
+            self.tokens += tokens
+        self.carried = len(self.segments)
+        return chunk
@@ -0,0 +1,173 @@
+from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict
+import hashlib
+import logging
+import sqlite3
+import threading
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """LRU cache of embeddings keyed by text hash and embedding model.
+
+    Entries are kept in memory up to max_size. With a path, every computed
+    embedding is also written to a SQLite file, so the cache survives
+    restarts and can be shared by several memories.
+    """
+
+    def __init__(self, max_size: int = 10000, path: str | None = None) -> None:
+        """Initialize EmbeddingCache.
+
+        Args:
+            max_size: Maximum number of embeddings held in memory
+            path: Optional SQLite file to persist embeddings to
+        """
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if path:
+            self._conn = sqlite3.connect(
+                path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look up embeddings, first in memory and then on disk.
+
+        Args:
+            keys: Cache keys built with EmbeddingCache.key
+
+        Returns:
+            The cached embeddings by key; missing keys are left out
+        """
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+            missing = [key for key in keys if key not in found]
+            if missing and self._conn is not None:
+                placeholders = ",".join("?" * len(missing))
+                for key, blob in self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", missing):
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                    self._store(key, found[key])
+            self.hits += len(found)
+            self.misses += len(set(keys) - found.keys())
+        return found
+
+    def put_many(self, entries: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for key, vector in entries.items():
+                self._store(key, vector)
+            if self._conn is not None and entries:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                    [(key, np.asarray(vector, dtype=np.float32).tobytes())
+                     for key, vector in entries.items()])
+
+    def _store(self, key: str, vector: np.ndarray) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Embedding function that only embeds texts missing from an EmbeddingCache.
+
+    Wraps another ChromaDB embedding function and reports its name and
+    config, so collections created with either are interchangeable.
+    """
+
+    def __init__(self, embedding_function: EmbeddingFunction[Documents], cache: EmbeddingCache,
+                 model: str | None = None) -> None:
+        """Initialize CachedEmbeddingFunction.
+
+        Args:
+            embedding_function: The embedding function to cache
+            cache: Where embeddings are cached
+            model: Cache namespace, defaults to the embedding function's name
+        """
+        self.embedding_function = embedding_function
+        self.cache = cache
+        self.model = model or self._model_name(embedding_function)
+
+    @staticmethod
+    def _model_name(embedding_function: EmbeddingFunction[Documents]) -> str:
+        try:
+            name = embedding_function.name()
+        except Exception:
+            name = NotImplemented
+        if name is NotImplemented or not name:
+            name = type(embedding_function).__name__
+        return str(name)
+
+    def _embed(self, input: Documents, kind: str,
+               embed: Callable[[Documents], Embeddings]) -> Embeddings:
+        keys = [self.cache.key(f"{self.model}:{kind}", text) for text in input]
+        found = self.cache.get_many(keys)
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, input):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            # One call for all misses keeps the embedding model batched
+            vectors = embed(list(missing.values()))
+            computed = {key: np.asarray(vector, dtype=np.float32)
+                        for key, vector in zip(missing, vectors)}
+            self.cache.put_many(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return self._embed(input, "document", self.embedding_function)
+
+    def embed_query(self, input: Documents) -> Embeddings:
+        return self._embed(input, "query", self.embedding_function.embed_query)
+
+    def name(self) -> str:  # type: ignore[override]
+        return self._model_name(self.embedding_function)
+
+    def get_config(self) -> Dict[str, Any]:
+        return self.embedding_function.get_config()
+
+    def default_space(self) -> Any:
+        return self.embedding_function.default_space()
+
+    def supported_spaces(self) -> Any:
+        return self.embedding_function.supported_spaces()
+
+    def is_legacy(self) -> bool:
+        return bool(getattr(self.embedding_function, "is_legacy", lambda: False)())
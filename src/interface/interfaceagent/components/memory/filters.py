@@ -0,0 +1,89 @@
+from typing import Any, Dict, List
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from autogen_agentchat.memory._base_memory import MemoryMimeType
+
+from interfaceagent.components.memory.retention import timestamp_seconds
+
+# Metadata key holding the entry timestamp as seconds since the epoch, for range filters
+CREATED_AT_KEY = "created_at"
+
+
+class MemoryFilter(BaseModel):
+    """Typed conditions a memory query pushes down to the store.
+
+    Conditions are combined with AND; list values match any of their items.
+    """
+
+    source: str | List[str] | None = Field(
+        default=None,
+        description="Source the entry was added with"
+    )
+    mime_type: MemoryMimeType | List[MemoryMimeType] | None = Field(
+        default=None,
+        description="MIME type of the entry"
+    )
+    since: datetime | None = Field(
+        default=None,
+        description="Only entries timestamped at or after this time"
+    )
+    until: datetime | None = Field(
+        default=None,
+        description="Only entries timestamped before this time"
+    )
+    metadata: Dict[str, str | int | float | bool] | None = Field(
+        default=None,
+        description="Metadata keys the entry must have with exactly these values"
+    )
+
+    def to_chroma_where(self) -> Dict[str, Any] | None:
+        """Build the ChromaDB where clause for these conditions, None if there are none."""
+        conditions: List[Dict[str, Any]] = []
+        if self.source is not None:
+            conditions.append(_match("source", self.source))
+        if self.mime_type is not None:
+            mime_types = self.mime_type if isinstance(self.mime_type, list) else [self.mime_type]
+            conditions.append(_match("mime_type", [mime_type.value for mime_type in mime_types]))
+        if self.since is not None:
+            conditions.append({CREATED_AT_KEY: {"$gte": timestamp_seconds(self.since)}})
+        if self.until is not None:
+            conditions.append({CREATED_AT_KEY: {"$lt": timestamp_seconds(self.until)}})
+        for key, value in (self.metadata or {}).items():
+            conditions.append({key: value})
+        return merge_where(*conditions)
+
+    def matches(self, metadata: Dict[str, Any]) -> bool:
+        """Check an entry's stored metadata against these conditions, as the where clause would."""
+        if self.source is not None and metadata.get("source") not in _as_list(self.source):
+            return False
+        if self.mime_type is not None and \
+                metadata.get("mime_type") not in [mime_type.value for mime_type in _as_list(self.mime_type)]:
+            return False
+        created_at = metadata.get(CREATED_AT_KEY)
+        if self.since is not None and (created_at is None or created_at < timestamp_seconds(self.since)):
+            return False
+        if self.until is not None and (created_at is None or created_at >= timestamp_seconds(self.until)):
+            return False
+        return all(key in metadata and metadata[key] == value for key, value in (self.metadata or {}).items())
+
+
+def _as_list(value: Any | List[Any]) -> List[Any]:
+    return value if isinstance(value, list) else [value]
+
+
+def _match(key: str, value: Any | List[Any]) -> Dict[str, Any]:
+    if isinstance(value, list):
+        return {key: {"$in": value}} if len(value) != 1 else {key: value[0]}
+    return {key: value}
+
+
+def merge_where(*clauses: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    """Combine ChromaDB where clauses with AND, skipping empty ones."""
+    clauses = tuple(clause for clause in clauses if clause)
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": list(clauses)}
@@ -0,0 +1,162 @@
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+from collections import Counter, defaultdict
+import heapq
+import math
+import re
+import threading
+
+# Keeps identifiers such as ORD-1234, sku_99-b or v1.2.3 together as one token
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_./:#][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into word and identifier tokens.
+
+    Compound identifiers are indexed both whole and by their parts, so
+    "ORD-1234" matches a query for "ord-1234" as well as one for "1234".
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        parts = re.split(r"[-_./:#]", token)
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+
+class BM25Index:
+    """Incremental in-process BM25 index.
+
+    Documents can be added and removed one at a time; no step rebuilds the
+    whole index. Each document can carry metadata that searches filter on.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._metadatas: Dict[str, Dict[str, Any]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc_id: str, text: str, metadata: Dict[str, Any] | None = None) -> None:
+        self.add_many([(doc_id, text)], None if metadata is None else [metadata])
+
+    def add_many(
+        self,
+        documents: Iterable[Tuple[str, str]],
+        metadatas: Iterable[Dict[str, Any]] | None = None
+    ) -> None:
+        """Index (doc_id, text) pairs, replacing documents already indexed under the same ID.
+
+        Args:
+            documents: The documents to index
+            metadatas: Optional metadata per document, in the same order, for search filters
+        """
+        tokenized = [(doc_id, Counter(tokenize(text))) for doc_id, text in documents]
+        metadatas = list(metadatas) if metadatas is not None else [None] * len(tokenized)
+        with self._lock:
+            for (doc_id, terms), metadata in zip(tokenized, metadatas):
+                if doc_id in self._doc_terms:
+                    self._remove(doc_id)
+                if metadata is not None:
+                    self._metadatas[doc_id] = metadata
+                self._doc_terms[doc_id] = terms
+                self._doc_lengths[doc_id] = sum(terms.values())
+                self._total_length += self._doc_lengths[doc_id]
+                for term, count in terms.items():
+                    self._postings[term][doc_id] = count
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._metadatas.pop(doc_id, None)
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._doc_terms = {}
+            self._doc_lengths = {}
+            self._metadatas = {}
+            self._total_length = 0
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        accept: Callable[[Dict[str, Any]], bool] | None = None
+    ) -> List[Tuple[str, float]]:
+        """Return up to k (doc_id, BM25 score) pairs, best first.
+
+        Args:
+            query: The query text
+            k: Maximum number of documents to return
+            accept: Optional check of a document's metadata, empty if it has none.
+                Documents it rejects are skipped before the top k are taken.
+
+        Returns:
+            Matching documents with positive scores
+        """
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = defaultdict(float)
+        with self._lock:
+            count = len(self._doc_terms)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = 1 - self.b + self.b * self._doc_lengths[doc_id] / average_length
+                    scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+            if accept is not None:
+                metadatas = {doc_id: self._metadatas.get(doc_id, {}) for doc_id in scores}
+        candidates = scores.items() if accept is None else \
+            ((doc_id, score) for doc_id, score in scores.items() if accept(metadatas[doc_id]))
+        return heapq.nlargest(k, candidates, key=lambda item: item[1])
+
+
+def fuse_rankings(
+    rankings: Sequence[Sequence[str]],
+    weights: Sequence[float],
+    rrf_k: int = 60,
+) -> List[Tuple[str, float]]:
+    """Combine ranked ID lists with weighted reciprocal rank fusion.
+
+    Scores are scaled so an ID ranked first in every list scores 1.0.
+
+    Args:
+        rankings: Ranked lists of IDs, best first
+        weights: One weight per ranking
+        rrf_k: Damping constant; larger values flatten the rank differences
+
+    Returns:
+        (id, fused score) pairs, best first
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    normalizer = sum(weights) / (rrf_k + 1) or 1.0
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] += weight / (rrf_k + rank + 1)
+    return sorted(((doc_id, score / normalizer) for doc_id, score in scores.items()),
+                  key=lambda item: item[1], reverse=True)
@@ -0,0 +1,483 @@
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Sequence, Tuple
+from datetime import datetime
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from autogen_core import CancellationToken, Image
+from pydantic import Field
+
+from autogen_agentchat.memory import Memory, MemoryContent
+from autogen_agentchat.memory._base_memory import BaseMemoryConfig, MemoryMimeType
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import SystemMessage
+
+from interfaceagent.components.memory.selection import InjectionStats, TokenCounter, select_memories
+
+logger = logging.getLogger(__name__)
+
+EmbeddingFunction = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+class NumpyMemoryConfig(BaseMemoryConfig):
+    """Configuration for the in-process NumPy memory implementation."""
+
+    persistence_path: str | None = Field(
+        default=None,
+        description="Directory for the memory-mapped vectors and entries. None for in-memory."
+    )
+    dtype: str = Field(
+        default="float32",
+        description="Storage type of the embedding matrix. float16 halves its size, but queries are slower"
+    )
+    initial_capacity: int = Field(
+        default=1024,
+        description="Rows allocated up front; the matrix doubles when full"
+    )
+    batch_size: int = Field(
+        default=256,
+        description="Number of entries embedded per call in add_many"
+    )
+    token_budget: int | None = Field(
+        default=1024,
+        description="Maximum tokens transform adds to the model context. None for no limit"
+    )
+    max_tokens_per_memory: int | None = Field(
+        default=256,
+        description="Longer memories are truncated to this many tokens in transform"
+    )
+    mmr_lambda: float = Field(
+        default=0.7,
+        description="Relevance vs diversity trade-off for transform, 1.0 ranks by relevance only"
+    )
+    mmr_fetch_k: int | None = Field(
+        default=None,
+        description="Candidates fetched for max-marginal-relevance selection, 4 * k if None"
+    )
+    duplicate_threshold: float = Field(
+        default=0.95,
+        description="Cosine similarity above which transform drops a memory as a near-duplicate"
+    )
+
+
+class NumpyMemory(Memory):
+    """In-process vector memory backed by a single NumPy matrix.
+
+    Embeddings are normalized and stored in one contiguous float32 or
+    float16 matrix, so a top-k query is one matrix-vector product and an
+    argpartition. When persisted, the matrix is a memory-mapped .npy file
+    and entries are appended to a JSON lines file next to it.
+
+    Suited to a few thousand to a few hundred thousand memories, where a
+    full vector database costs more in startup time and RAM than it saves.
+    """
+
+    def __init__(
+        self,
+        name: str | None = None,
+        config: NumpyMemoryConfig | None = None,
+        embedding_function: EmbeddingFunction | None = None,
+    ) -> None:
+        """Initialize NumpyMemory.
+
+        Args:
+            name: Optional identifier for this memory instance
+            config: Optional configuration for memory behavior
+            embedding_function: Embeds a list of texts, ChromaDB's default if None
+        """
+        self._name = name or "default_numpy_memory"
+        self._config = config or NumpyMemoryConfig()
+        if self._config.dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported dtype: {self._config.dtype}")
+        self._embedding_function = embedding_function
+        self._lock = threading.Lock()
+        self._vectors: np.ndarray | None = None
+        self._entries: List[Dict[str, Any]] = []
+        # Whether the persisted files are open, cleanup releases them until the next use
+        self._loaded = False
+        self._token_counter = TokenCounter()
+        self.last_injection: InjectionStats | None = None
+        if self._config.persistence_path:
+            self._load()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def config(self) -> NumpyMemoryConfig:
+        return self._config
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self._config.persistence_path, "vectors.npy")
+
+    @property
+    def _entries_path(self) -> str:
+        return os.path.join(self._config.persistence_path, "entries.jsonl")
+
+    def _load(self) -> None:
+        """Open the persisted matrix and entries, if any.
+
+        Raises:
+            ValueError: If the entries cannot be read or outnumber the rows of the matrix
+        """
+        os.makedirs(self._config.persistence_path, exist_ok=True)
+        if not os.path.exists(self._vectors_path):
+            self._loaded = True
+            return
+        vectors = open_memmap(self._vectors_path, mode="r+")
+        entries = self._read_entries()
+        # Rows past the last entry are spare capacity, or vectors of an add interrupted
+        # before its entries were written, and are overwritten by the next add
+        if vectors.ndim != 2 or len(entries) > len(vectors):
+            raise ValueError(
+                f"{self._entries_path} has {len(entries)} entries but {self._vectors_path} "
+                f"has shape {vectors.shape}")
+        self._vectors, self._entries = vectors, entries
+        self._loaded = True
+        logger.info(
+            f"Loaded {len(self._entries)} memories from {self._config.persistence_path}")
+
+    def _read_entries(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self._entries_path):
+            return []
+        with open(self._entries_path, "rb") as f:
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            # An add interrupted mid-write leaves a partial last line. Its vector row is
+            # spare capacity once the line is gone, so cut it and let appends start clean
+            logger.warning(f"Dropping partial last entry of {self._entries_path}")
+            with open(self._entries_path, "r+b") as f:
+                f.truncate(complete)
+        entries = []
+        # Entries match matrix rows by position, so a bad line elsewhere cannot be skipped
+        for number, line in enumerate(data[:complete].decode().splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"{self._entries_path} line {number} is not a valid entry: {e}") from e
+        return entries
+
+    def _ensure_loaded(self) -> None:
+        """Reopen the persisted files after cleanup released them, with the lock held."""
+        if self._config.persistence_path and not self._loaded:
+            self._load()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        if self._embedding_function is None:
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+            self._embedding_function = DefaultEmbeddingFunction()
+        vectors = np.asarray(self._embedding_function(texts), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+    def _allocate(self, capacity: int, dim: int) -> np.ndarray:
+        if not self._config.persistence_path:
+            return np.zeros((capacity, dim), dtype=self._config.dtype)
+        # Build the larger file next to the old one and swap it in
+        path = self._vectors_path + ".tmp"
+        vectors = open_memmap(path, mode="w+", dtype=self._config.dtype, shape=(capacity, dim))
+        if self._vectors is not None:
+            vectors[:len(self._entries)] = self._vectors[:len(self._entries)]
+            vectors.flush()
+        os.replace(path, self._vectors_path)
+        return vectors
+
+    def _append(self, vectors: np.ndarray, entries: List[Dict[str, Any]]) -> None:
+        """Store embedded entries, growing the matrix when it is full."""
+        with self._lock:
+            self._ensure_loaded()
+            count = len(self._entries)
+            needed = count + len(entries)
+            if self._vectors is not None and count and self._vectors.shape[1] != vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match stored {self._vectors.shape[1]}")
+            if self._vectors is None or count == 0 and self._vectors.shape[1] != vectors.shape[1]:
+                self._vectors = self._allocate(
+                    max(self._config.initial_capacity, needed), vectors.shape[1])
+            elif needed > len(self._vectors):
+                capacity = len(self._vectors)
+                while capacity < needed:
+                    capacity *= 2
+                self._vectors = self._allocate(capacity, vectors.shape[1])
+            self._vectors[count:needed] = vectors
+            if self._config.persistence_path:
+                self._vectors.flush()
+                with open(self._entries_path, "a") as f:
+                    f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            self._entries.extend(entries)
+
+    def _extract_text(self, content_item: MemoryContent) -> str:
+        content = content_item.content
+
+        if content_item.mime_type in [MemoryMimeType.TEXT, MemoryMimeType.MARKDOWN]:
+            return str(content)
+        elif content_item.mime_type == MemoryMimeType.JSON:
+            if isinstance(content, dict):
+                return str(content)
+            raise ValueError("JSON content must be a dict")
+        elif isinstance(content, Image):
+            raise ValueError("Image content cannot be converted to text")
+        else:
+            raise ValueError(
+                f"Unsupported content type: {content_item.mime_type}")
+
+    def _prepare_entry(self, content: MemoryContent) -> Tuple[str, Dict[str, Any]]:
+        text = self._extract_text(content)
+        return text, {
+            "id": str(uuid.uuid4()),
+            "content": text,
+            "timestamp": content.timestamp.isoformat() if content.timestamp else datetime.now().isoformat(),
+            "source": content.source or "",
+            "mime_type": content.mime_type.value,
+            "metadata": content.metadata or {},
+        }
+
+    def _add_batch(self, batch: List[MemoryContent]) -> None:
+        texts, entries = zip(*(self._prepare_entry(content) for content in batch))
+        self._append(self._embed(list(texts)), list(entries))
+
+    async def add(
+        self,
+        content: MemoryContent,
+        cancellation_token: CancellationToken | None = None
+    ) -> None:
+        """Add a memory content.
+
+        Args:
+            content: The memory content to add
+            cancellation_token: Optional token to cancel operation
+        """
+        await self._run(self._add_batch, [content], cancellation_token=cancellation_token)
+
+    async def add_many(
+        self,
+        contents: Iterable[MemoryContent] | AsyncIterable[MemoryContent],
+        cancellation_token: CancellationToken | None = None,
+        batch_size: int | None = None,
+    ) -> int:
+        """Add many memory contents, embedding them in batches.
+
+        Args:
+            contents: Iterable or async iterable of memory contents to add
+            cancellation_token: Optional token to cancel the ingestion
+            batch_size: Entries per batch, defaults to the configured batch_size
+
+        Returns:
+            The number of entries added
+        """
+        batch_size = batch_size or self._config.batch_size
+        added = 0
+        start = time.perf_counter()
+        batch: List[MemoryContent] = []
+
+        async def flush() -> None:
+            nonlocal added, batch
+            await self._run(self._add_batch, batch, cancellation_token=cancellation_token)
+            added += len(batch)
+            batch = []
+
+        if isinstance(contents, AsyncIterable):
+            async for content in contents:
+                batch.append(content)
+                if len(batch) >= batch_size:
+                    await flush()
+        else:
+            for content in contents:
+                batch.append(content)
+                if len(batch) >= batch_size:
+                    await flush()
+        if batch:
+            await flush()
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Ingested {added} entries in {elapsed:.2f}s, {added / elapsed if elapsed else 0:.1f} entries/s")
+        return added
+
+    async def _run(self, fn: Callable[..., Any], *args: Any,
+                   cancellation_token: CancellationToken | None = None) -> Any:
+        """Run embedding and search in a thread so they do not block the event loop."""
+        future = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        if cancellation_token is not None:
+            cancellation_token.link_future(future)
+        return await future
+
+    def _search(self, query_vectors: np.ndarray, k: int) -> List[List[Tuple[Dict[str, Any], float, np.ndarray]]]:
+        """Return the top-k (entry, cosine similarity, vector) hits for each query vector."""
+        with self._lock:
+            self._ensure_loaded()
+            # Appends only write past count and clear swaps in new objects, so a snapshot is safe to read
+            vectors, entries = self._vectors, self._entries
+            count = len(entries)
+        if count == 0 or k <= 0:
+            return [[] for _ in query_vectors]
+
+        # One matrix product scores every memory against every query
+        if vectors.dtype == np.float32:
+            similarities = vectors[:count] @ query_vectors.T
+        else:
+            # float16 has no BLAS kernels, so upcast cache-sized blocks of rows
+            similarities = np.concatenate([
+                vectors[start:min(start + 4096, count)].astype(np.float32) @ query_vectors.T
+                for start in range(0, count, 4096)
+            ])
+
+        k = min(k, count)
+        results = []
+        for row in similarities.T:
+            top = np.argpartition(-row, k - 1)[:k] if k < count else np.arange(count)
+            top = top[np.argsort(-row[top])]
+            results.append([(entries[i], float(row[i]), vectors[i]) for i in top])
+        return results
+
+    def _to_memory_content(self, entry: Dict[str, Any], similarity: float) -> MemoryContent | None:
+        # Same scale as ChromaMemory's cosine scores, so thresholds carry over
+        score = 1.0 - (1.0 - similarity) / 2.0
+        if self._config.score_threshold is not None and score < self._config.score_threshold:
+            return None
+        return MemoryContent(
+            content=entry["content"],
+            mime_type=MemoryMimeType(entry["mime_type"]),
+            metadata=dict(entry["metadata"]),
+            timestamp=datetime.fromisoformat(entry["timestamp"]),
+            source=entry["source"] or None,
+            score=score
+        )
+
+    def _query_texts(self, query_texts: List[str], k: int) -> List[List[MemoryContent]]:
+        hits = self._search(self._embed(query_texts), k)
+        return [
+            [content for content in (self._to_memory_content(entry, similarity) for entry, similarity, _ in query_hits)
+             if content is not None]
+            for query_hits in hits
+        ]
+
+    async def query(
+        self,
+        query: MemoryContent,
+        cancellation_token: CancellationToken | None = None,
+        **kwargs: Any,
+    ) -> List[MemoryContent]:
+        """Query memory content based on vector similarity.
+
+        Args:
+            query: Query content to match against memory
+            cancellation_token: Optional token to cancel operation
+            **kwargs: Optional k to override config.k
+
+        Returns:
+            List of memory results with similarity scores
+        """
+        return (await self.query_many([query], cancellation_token, **kwargs))[0]
+
+    async def query_many(
+        self,
+        queries: List[MemoryContent],
+        cancellation_token: CancellationToken | None = None,
+        **kwargs: Any,
+    ) -> List[List[MemoryContent]]:
+        """Query memory for several contents with a single matrix product.
+
+        Args:
+            queries: Query contents to match against memory
+            cancellation_token: Optional token to cancel operation
+            **kwargs: Optional k to override config.k
+
+        Returns:
+            One list of memory results per query, in the same order
+        """
+        if not queries:
+            return []
+        texts = [self._extract_text(query) for query in queries]
+        return await self._run(self._query_texts, texts, kwargs.get("k", self._config.k),
+                               cancellation_token=cancellation_token)
+
+    async def transform(
+        self,
+        model_context: ChatCompletionContext,
+        token_budget: int | None = None,
+    ) -> List[MemoryContent]:
+        """Transform the model context using relevant memory content.
+
+        Args:
+            model_context: The context to transform
+            token_budget: Maximum tokens to add, defaults to config.token_budget
+
+        Returns:
+            List of memory entries added to the context, with relevance scores
+        """
+        messages = await model_context.get_messages()
+        if not messages:
+            return []
+
+        # Extract query from last message
+        last_message = messages[-1]
+        query_text = last_message.content if isinstance(
+            last_message.content, str) else str(last_message)
+
+        def _candidates() -> Tuple[np.ndarray, List[Tuple[MemoryContent, np.ndarray]]]:
+            query_vector = self._embed([query_text])
+            hits = self._search(query_vector, self._config.mmr_fetch_k or 4 * self._config.k)[0]
+            candidates = []
+            for entry, similarity, vector in hits:
+                content = self._to_memory_content(entry, similarity)
+                if content is not None:
+                    candidates.append((content, np.asarray(vector, dtype=np.float32)))
+            return query_vector[0], candidates
+
+        query_vector, candidates = await self._run(_candidates)
+        memory_context, query_results, self.last_injection = select_memories(
+            query_vector,
+            candidates,
+            self._token_counter,
+            k=self._config.k,
+            lambda_mult=self._config.mmr_lambda,
+            duplicate_threshold=self._config.duplicate_threshold,
+            token_budget=token_budget if token_budget is not None else self._config.token_budget,
+            max_tokens_per_memory=self._config.max_tokens_per_memory
+        )
+
+        # Add memory results to context
+        if memory_context:
+            await model_context.add_message(SystemMessage(content=memory_context))
+
+        return query_results
+
+    async def clear(self) -> None:
+        """Clear all entries from memory."""
+        with self._lock:
+            self._entries = []
+            self._vectors = None
+            if self._config.persistence_path:
+                for path in (self._vectors_path, self._entries_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    async def cleanup(self) -> None:
+        """Flush and release the memory-mapped matrix.
+
+        A persisted memory reopens its files on next use. An in-memory one
+        has nothing to reopen and starts empty.
+        """
+        with self._lock:
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            self._vectors = None
+            self._entries = []
+            self._loaded = False
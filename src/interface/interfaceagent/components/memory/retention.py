@@ -0,0 +1,94 @@
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from datetime import datetime
+import math
+
+from pydantic import BaseModel
+
+EVICTION_POLICIES = ("oldest", "least_recently_retrieved", "lowest_score")
+
+
+class RetentionEntry(BaseModel):
+    """What compaction needs to know about one stored entry."""
+
+    id: str
+    created: float
+    last_retrieved: float | None = None
+    best_score: float | None = None
+
+
+class CompactionStats(BaseModel):
+    """Summary of a compaction run."""
+
+    scanned: int = 0
+    expired: int = 0
+    evicted: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+def timestamp_seconds(timestamp: str | datetime) -> float:
+    """Convert a stored ISO timestamp to seconds since the epoch."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    # Naive timestamps are local time, as written by datetime.now()
+    return timestamp.timestamp()
+
+
+def recency_weighted(score: float, created: float, now: float, weight: float, half_life: float) -> float:
+    """Blend a relevance score with how recently the entry was stored.
+
+    The recency term halves every half_life seconds, so with weight 0.2 a
+    fresh entry gains up to 0.2 over an equally relevant old one.
+
+    Args:
+        score: Relevance score in [0, 1]
+        created: When the entry was stored, seconds since the epoch
+        now: Current time, seconds since the epoch
+        weight: Share of the result taken by recency, 0 disables weighting
+        half_life: Seconds after which the recency term halves
+
+    Returns:
+        The weighted score
+    """
+    if weight <= 0:
+        return score
+    recency = math.pow(0.5, max(now - created, 0.0) / half_life)
+    return (1 - weight) * score + weight * recency
+
+
+def select_evictions(
+    entries: Sequence[RetentionEntry],
+    now: float,
+    ttl_seconds: float | None = None,
+    max_entries: int | None = None,
+    policy: str = "oldest",
+) -> Tuple[List[str], List[str]]:
+    """Pick the entries to delete so the store meets its TTL and size limits.
+
+    Args:
+        entries: Every stored entry
+        now: Current time, seconds since the epoch
+        ttl_seconds: Maximum entry age, None for no limit
+        max_entries: Maximum entries kept, None for no limit
+        policy: Which entries go first when over max_entries, one of EVICTION_POLICIES
+
+    Returns:
+        IDs of expired entries and IDs of entries evicted to fit max_entries
+    """
+    if policy not in EVICTION_POLICIES:
+        raise ValueError(f"Unsupported eviction policy: {policy}")
+    expired = [entry.id for entry in entries
+               if ttl_seconds is not None and now - entry.created > ttl_seconds]
+    if max_entries is None or len(entries) - len(expired) <= max_entries:
+        return expired, []
+
+    expired_ids = set(expired)
+    live = [entry for entry in entries if entry.id not in expired_ids]
+    keys: Dict[str, Callable[[RetentionEntry], Tuple[Any, ...]]] = {
+        "oldest": lambda entry: (entry.created,),
+        "least_recently_retrieved": lambda entry: (entry.last_retrieved or entry.created, entry.created),
+        # Entries never retrieved score 0 and go first, oldest first
+        "lowest_score": lambda entry: (entry.best_score or 0.0, entry.created),
+    }
+    live.sort(key=keys[policy])
+    return expired, [entry.id for entry in live[:len(live) - max_entries]]
@@ -0,0 +1,217 @@
+from typing import List, Sequence, Tuple
+import logging
+
+import numpy as np
+from pydantic import BaseModel
+
+from autogen_agentchat.memory import MemoryContent
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional, token counts are estimated without it
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+MEMORY_HEADER = "Results from memory query to consider include:\n"
+
+
+class InjectionStats(BaseModel):
+    """What a transform call put into the model context."""
+
+    candidates: int = 0
+    selected: int = 0
+    duplicates: int = 0
+    truncated: int = 0
+    tokens: int = 0
+    token_budget: int | None = None
+
+
+class TokenCounter:
+    """Counts and truncates text in model tokens.
+
+    Uses tiktoken when it is installed and estimates four characters per
+    token otherwise.
+    """
+
+    def __init__(self, encoding: str = "cl100k_base") -> None:
+        self._encoding = tiktoken.get_encoding(encoding) if tiktoken is not None else None
+
+    def count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return (len(text) + 3) // 4
+
+    def truncate(self, text: str, max_tokens: int) -> Tuple[str, bool]:
+        """Cut text to at most max_tokens tokens.
+
+        Args:
+            text: The text to truncate
+            max_tokens: Maximum number of tokens to keep
+
+        Returns:
+            The possibly truncated text and whether it was truncated
+        """
+        if self.count(text) <= max_tokens:
+            return text, False
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text)
+            return self._encoding.decode(tokens[:max(max_tokens - 1, 0)]) + "…", True
+        cut = text[:max(max_tokens - 1, 0) * 4]
+        # Prefer ending on a word boundary
+        if " " in cut[len(cut) // 2:]:
+            cut = cut[:cut.rindex(" ")]
+        return cut + "…", True
+
+
+def mmr(
+    query_embedding: Sequence[float],
+    embeddings: Sequence[Sequence[float]],
+    k: int,
+    lambda_mult: float = 0.7,
+    duplicate_threshold: float = 0.95,
+    relevance: Sequence[float] | None = None,
+) -> Tuple[List[int], int]:
+    """Order candidates by max-marginal relevance.
+
+    Each step picks the candidate with the best trade-off between similarity
+    to the query and dissimilarity to what was already picked. Candidates
+    nearly identical to a picked one are dropped.
+
+    Args:
+        query_embedding: Embedding of the query
+        embeddings: Embeddings of the candidates
+        k: Maximum number of candidates to pick
+        lambda_mult: 1.0 ranks by relevance only, 0.0 by diversity only
+        duplicate_threshold: Cosine similarity above which a candidate counts as a duplicate
+        relevance: Relevance of each candidate, cosine similarity to the query if None
+
+    Returns:
+        Indices of the picked candidates in pick order, and the number of duplicates dropped
+    """
+    if len(embeddings) == 0 or k <= 0:
+        return [], 0
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query /= max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = matrix @ query if relevance is None else np.asarray(relevance, dtype=np.float32)
+    # Highest similarity of each candidate to any picked candidate
+    redundancy = np.full(len(matrix), -np.inf, dtype=np.float32)
+    available = np.ones(len(matrix), dtype=bool)
+    picked: List[int] = []
+    duplicates = 0
+
+    while len(picked) < k and available.any():
+        scores = lambda_mult * relevance - (1 - lambda_mult) * np.maximum(redundancy, 0)
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        available[best] = False
+        picked.append(best)
+        redundancy = np.maximum(redundancy, matrix @ matrix[best])
+        is_duplicate = available & (redundancy > duplicate_threshold)
+        duplicates += int(is_duplicate.sum())
+        available &= ~is_duplicate
+
+    return picked, duplicates
+
+
+def format_memories(
+    contents: List[MemoryContent],
+    counter: TokenCounter,
+    token_budget: int | None = None,
+    max_tokens_per_memory: int | None = None,
+) -> Tuple[str, List[MemoryContent], InjectionStats]:
+    """Render memories as a numbered list that fits a token budget.
+
+    Memories are taken in order; long ones are truncated to
+    max_tokens_per_memory and ones that no longer fit the budget are skipped.
+
+    Args:
+        contents: Memories in priority order
+        counter: Token counter for the target model
+        token_budget: Maximum tokens for the whole message, None for no limit
+        max_tokens_per_memory: Maximum tokens per memory, None for no limit
+
+    Returns:
+        The message text (empty if nothing fit), the memories included and stats
+    """
+    stats = InjectionStats(candidates=len(contents), token_budget=token_budget)
+    lines: List[str] = []
+    selected: List[MemoryContent] = []
+    tokens = counter.count(MEMORY_HEADER)
+
+    for content in contents:
+        if not isinstance(content.content, str):
+            continue
+        text = content.content
+        if max_tokens_per_memory is not None:
+            text, truncated = counter.truncate(text, max_tokens_per_memory)
+        else:
+            truncated = False
+        line = f"{len(lines) + 1}. {text}"
+        line_tokens = counter.count(line) + 1
+        if token_budget is not None and tokens + line_tokens > token_budget:
+            continue
+        lines.append(line)
+        selected.append(content)
+        tokens += line_tokens
+        stats.truncated += truncated
+        logger.debug(
+            f"Retrieved memory {line}, score: {content.score}")
+
+    if not lines:
+        return "", [], stats
+    stats.selected = len(selected)
+    stats.tokens = tokens
+    return MEMORY_HEADER + "\n".join(lines), selected, stats
+
+
+def select_memories(
+    query_embedding: Sequence[float],
+    candidates: List[Tuple[MemoryContent, Sequence[float]]],
+    counter: TokenCounter,
+    k: int,
+    lambda_mult: float = 0.7,
+    duplicate_threshold: float = 0.95,
+    relevance: Sequence[float] | None = None,
+    token_budget: int | None = None,
+    max_tokens_per_memory: int | None = None,
+) -> Tuple[str, List[MemoryContent], InjectionStats]:
+    """Pick diverse memories from candidates and render them within a token budget.
+
+    Args:
+        query_embedding: Embedding of the query
+        candidates: Memory hits with their embeddings
+        counter: Token counter for the target model
+        k: Maximum number of memories to include
+        lambda_mult: Relevance vs diversity trade-off for mmr
+        duplicate_threshold: Cosine similarity above which a memory counts as a duplicate
+        relevance: Relevance of each candidate, cosine similarity to the query if None
+        token_budget: Maximum tokens for the whole message, None for no limit
+        max_tokens_per_memory: Maximum tokens per memory, None for no limit
+
+    Returns:
+        The message text (empty if nothing fit), the memories included and stats
+    """
+    order, duplicates = mmr(
+        query_embedding,
+        [embedding for _, embedding in candidates],
+        k=k,
+        lambda_mult=lambda_mult,
+        duplicate_threshold=duplicate_threshold,
+        relevance=relevance
+    )
+    text, selected, stats = format_memories(
+        [candidates[i][0] for i in order],
+        counter,
+        token_budget=token_budget,
+        max_tokens_per_memory=max_tokens_per_memory
+    )
+    stats.candidates = len(candidates)
+    stats.duplicates = duplicates
+    logger.info(
+        f"Injected {stats.selected} of {stats.candidates} memories, {stats.tokens} tokens "
+        f"({stats.duplicates} duplicates dropped, {stats.truncated} truncated)")
+    return text, selected, stats
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, List, Optional
 from pydantic import BaseModel
 
 
@@ -18,3 +18,19 @@ class WebRequestBrowserAction(BaseModel):
     action: str
     selector: Optional[str] = ""
     value: Optional[str] = None
+
+
+class WebRequestBrowserActionBatch(BaseModel):
+    actions: List[WebRequestBrowserAction]
+    # stop at the first failed action, or continue with the rest
+    stop_on_error: bool = True
+    # e.g., 'text', 'html', 'interactive'. None skips state extraction
+    state_type: Optional[str] = None
+
+
+class WebRequestTask(BaseModel):
+    task: str
+    start_url: str
+    model: Optional[str] = "gpt-4o-mini"
+    # overrides the planner's default action budget
+    max_actions: Optional[int] = None
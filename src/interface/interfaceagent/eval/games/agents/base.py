@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
+import random
 import time
 from datetime import datetime
 import openai
@@ -28,8 +29,9 @@ class AIAgent(ABC):
         self._total_moves = 0
         
     @abstractmethod
-    async def _generate_move(self, game_state: GameState, attempt: int) -> AIMove:
-        """Generate a single move attempt"""
+    async def _generate_move(self, game_state: GameState, attempt: int,
+                             rng: Optional[random.Random] = None) -> AIMove:
+        """Generate a single move attempt, drawing any randomness from rng when given"""
         pass
     
     @abstractmethod
@@ -37,16 +39,18 @@ class AIAgent(ABC):
         """Create the prompt for move generation"""
         pass
     
-    async def move(self, game_state: GameState) -> Optional[AIMove]:
+    async def move(self, game_state: GameState, rng: Optional[random.Random] = None) -> Optional[AIMove]:
         """
         Main method to generate a move. Handles retries and validation.
         Returns None if unable to generate a valid move within max retries.
+        A game passes its own rng so agents playing several games at once
+        stay reproducible per game.
         """
         start_time = time.time()
         
         for attempt in range(self.config.max_retries):
             try:
-                ai_move = await self._generate_move(game_state, attempt)
+                ai_move = await self._generate_move(game_state, attempt, rng)
                 
                 # Update statistics
                 self._total_tokens += ai_move.tokens_used
@@ -74,7 +74,7 @@ class OpenAIBaseAgent(AIAgent):
         except Exception as e:
             raise ValueError(f"Failed to parse response: {str(e)}")
     
-    async def _generate_move(self, game_state: GameState, attempt: int) -> AIMove:
+    async def _generate_move(self, game_state: GameState, attempt: int, rng=None) -> AIMove:
         """Generate a move using OpenAI API"""
         system_prompt = self._create_system_prompt()
         chess_prompt = self._create_chess_prompt(game_state)
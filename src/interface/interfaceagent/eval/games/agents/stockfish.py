@@ -31,7 +31,7 @@ class StockfishChessAgent(AIAgent):
         """Create a simple prompt for logging purposes"""
         return f"Analyzing position: {game_state.state_repr}"
     
-    async def _generate_move(self, game_state: GameState, attempt: int) -> AIMove:
+    async def _generate_move(self, game_state: GameState, attempt: int, rng=None) -> AIMove:
         """Generate a move using Stockfish"""
         try:
             # Create a chess.Board from FEN
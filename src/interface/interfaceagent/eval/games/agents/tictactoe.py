@@ -1,5 +1,6 @@
 import random
 from datetime import datetime
+from typing import Optional
 from ..datamodel import GameState, AIMove, Player, GeneralPlayer
 from .base import AIAgent, AgentConfig
 
@@ -17,13 +18,14 @@ class BasicTicTacToeAgent(AIAgent):
         # Map generic players to Player (assume PLAYER_ONE -> white, PLAYER_TWO -> black)
         return Player.WHITE if gp == GeneralPlayer.PLAYER_ONE else Player.BLACK
     
-    async def _generate_move(self, game_state: GameState, attempt: int) -> AIMove:
+    async def _generate_move(self, game_state: GameState, attempt: int,
+                             rng: Optional[random.Random] = None) -> AIMove:
         valid_moves = game_state.valid_moves
         if not valid_moves:
             move_choice = ""
             is_valid = False
         else:
-            move_choice = random.choice(valid_moves)
+            move_choice = (rng or random).choice(valid_moves)
             is_valid = True
         
         # Map current generic player to a game-specific Player enum
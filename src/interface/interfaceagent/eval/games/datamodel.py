@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, model_serializer
+from typing import List, Optional, Dict, Any, Tuple, Callable
 from datetime import datetime
 from enum import Enum
 
@@ -36,6 +36,62 @@ class GameState(BaseModel):
     state_repr: str = Field(description="String representation of the game state (e.g., FEN in chess)")
     metadata: Dict[str, Any] = Field(description="Game-specific metadata")
 
+    def resolve(self) -> "GameState":
+        """Compute any fields still pending, see LazyGameState"""
+        return self
+
+    @model_serializer(mode="wrap")
+    def _serialize_resolved(self, handler):
+        # Pending fields of a LazyGameState, also when nested in a Game, must exist before dumping
+        return handler(self.resolve())
+
+class LazyGameState(GameState):
+    """GameState with some fields computed on first access.
+
+    Engines build one per position and pass loaders for the fields that
+    are expensive and rarely read, such as chess draw-claim detection in
+    the metadata. Loaders must capture the position they describe, since
+    the engine moves on. Serializing, comparing or pickling the state
+    computes whatever is still pending first.
+    """
+    _loaders: Dict[str, Callable[[], Any]] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def deferred(cls, loaders: Dict[str, Callable[[], Any]], **values: Any) -> "LazyGameState":
+        """Build a state from field values and loaders for the remaining fields, without validation"""
+        state = cls.model_construct(**values)
+        for name in loaders:
+            state.__dict__.pop(name, None)
+        state.__pydantic_fields_set__.update(loaders)
+        state._loaders = dict(loaders)
+        return state
+
+    def __getattr__(self, name: str) -> Any:
+        private = object.__getattribute__(self, "__pydantic_private__")
+        loaders = private.get("_loaders") if private else None
+        if not loaders or name not in loaders:
+            return super().__getattr__(name)
+        value = self.__dict__[name] = loaders[name]()
+        # Replace rather than mutate, model_copy shares the loaders dict
+        private["_loaders"] = {key: loader for key, loader in loaders.items() if key != name}
+        return value
+
+    def resolve(self) -> "LazyGameState":
+        for name in list(self._loaders):
+            getattr(self, name)
+        return self
+
+    def __eq__(self, other: Any) -> bool:
+        self.resolve()
+        if isinstance(other, GameState):
+            other.resolve()
+        return super().__eq__(other)
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        # Resolving also drops the loaders, which may not be picklable
+        self.resolve()
+        return super().__getstate__()
+
 class Move(BaseModel):
     """Represents a single move in the game"""
     player: Player
@@ -88,8 +144,23 @@ class TournamentResult(BaseModel):
     
     @property
     def winner(self) -> Optional[str]:
-        # Logic to determine tournament winner based on games
-        pass
+        """Participant with the most points, 1 per win and 0.5 per draw, None on a tie"""
+        points = self.statistics.get("points")
+        if points is None:
+            points = {name: 0.0 for name in self.participants}
+            for game in self.games:
+                if game.result == GameResult.WHITE_WIN:
+                    points[game.player_white] = points.get(game.player_white, 0.0) + 1.0
+                elif game.result == GameResult.BLACK_WIN:
+                    points[game.player_black] = points.get(game.player_black, 0.0) + 1.0
+                elif game.result == GameResult.DRAW:
+                    points[game.player_white] = points.get(game.player_white, 0.0) + 0.5
+                    points[game.player_black] = points.get(game.player_black, 0.0) + 0.5
+        if not points:
+            return None
+        best = max(points.values())
+        leaders = [name for name, score in points.items() if score == best]
+        return leaders[0] if len(leaders) == 1 else None
 
 class ModelPerformance(BaseModel):
     """Statistics for a single AI model's performance"""
@@ -118,9 +189,34 @@ class GameType(str, Enum):
     TIC_TAC_TOE = "tic_tac_toe"
     BACKGAMMON = "backgammon"
 
-class ChessMetadata(BaseModel):
-    check: bool
-    checkmate: bool 
-
 class TicTacToeMetadata(BaseModel):
-    last_mark_position: Optional[Tuple[int, int]] = None  
\ No newline at end of file
+    last_mark_position: Optional[Tuple[int, int]] = None
+
+class MoveRecord(BaseModel):
+    """A move of a GameRecord with its agent metadata, without the states around it"""
+    turn_number: int
+    player: Player
+    move_notation: str
+    is_valid: bool = Field(description="Whether the move was valid, invalid moves leave the state unchanged")
+    timestamp: datetime
+    model_name: str
+    reasoning: str = ""
+    tokens_used: int = 0
+    retry_count: int = 0
+    duration_ms: int = 0
+    prompt: Optional[List[int]] = Field(None, description="Indices of the prompt's lines in GameRecord.prompt_lines, None if not kept")
+    raw_response: Optional[str] = Field(None, description="Raw response from the AI model, None if not kept")
+
+class GameRecord(BaseModel):
+    """Compact form of a Game: the initial state and the moves, from which every state can be replayed"""
+    game_id: str
+    game_type: GameType
+    start_time: datetime
+    end_time: Optional[datetime] = None
+    player_white: str
+    player_black: str
+    initial_state: GameState
+    moves: List[MoveRecord] = Field(default_factory=list)
+    prompt_lines: List[str] = Field(default_factory=list, description="Distinct prompt lines, shared by every move's prompt")
+    result: GameResult = Field(default=GameResult.IN_PROGRESS)
+    metadata: Dict[str, Any] = Field(default_factory=dict)
@@ -1,10 +1,13 @@
-from .base import GameEngine
+from .base import GameEngine, StateCache
 from .chess import ChessGameEngine
 from .tictactoe import TicTacToeEngine
+from .tictactoe_bitboard import BitboardTicTacToeEngine
 
 __all__ = [
     "GameEngine",
+    "StateCache",
     "ChessGameEngine",
-    "TicTacToeEngine"
+    "TicTacToeEngine",
+    "BitboardTicTacToeEngine"
 ]
 
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Callable, Dict, Hashable, List, Optional
 
 from ...datamodel   import (
     GameState, 
@@ -8,6 +8,31 @@ from ...datamodel   import (
     Move
 )
 
+class StateCache:
+    """GameStates of recently seen positions, keyed by a position key.
+
+    Matches ask for the state before and after every move, so the state
+    after one move is served again before the next without being rebuilt.
+    """
+
+    def __init__(self, size: int = 64):
+        self.size = size
+        self._states: Dict[Hashable, GameState] = {}
+
+    def get(self, key: Hashable, build: Callable[[], GameState]) -> GameState:
+        """Return the cached state for key, building and caching it on a miss"""
+        state = self._states.get(key)
+        if state is None:
+            if len(self._states) >= self.size:
+                # Dicts keep insertion order, drop the oldest position
+                del self._states[next(iter(self._states))]
+            state = self._states[key] = build()
+        return state
+
+    def clear(self) -> None:
+        self._states.clear()
+
+
 class GameEngine(ABC):
     """Abstract base class for game engines"""
     
@@ -1,10 +1,12 @@
 from typing import List, Optional, Dict, Any
 import chess
+import chess.polyglot
 import uuid
 from datetime import datetime
-from .base import GameEngine
+from .base import GameEngine, StateCache
 from ...datamodel import (
     GameState,
+    LazyGameState,
     GeneralPlayer,  # use generic players
     Player,
     ChessMetadata,
@@ -17,9 +19,11 @@ from ...datamodel import (
 class ChessGameEngine(GameEngine):
     """Chess implementation using python-chess with generic players"""
     
-    def __init__(self, player_one_is_white: bool = True):
+    def __init__(self, player_one_is_white: bool = True, cache_states: bool = True):
         self.board = chess.Board()
         self.game: Optional[Game] = None
+        self.cache_states = cache_states
+        self._states = StateCache()
         self.player_map = {  # map generic players to chess colors based on configuration
             GeneralPlayer.PLAYER_ONE: (Player.WHITE if player_one_is_white else Player.BLACK),
             GeneralPlayer.PLAYER_TWO: (Player.BLACK if player_one_is_white else Player.WHITE)
@@ -28,15 +32,29 @@ class ChessGameEngine(GameEngine):
         self.reset()
     
     def get_state(self) -> GameState:
-        return GameState(
+        """Returns current game state, cached per position"""
+        if not self.cache_states:
+            return self._build_state().resolve()
+        # Ply is part of the key since draw claims depend on the moves that led here
+        key = (len(self.board.move_stack), chess.polyglot.zobrist_hash(self.board), self.current_player)
+        return self._states.get(key, self._build_state)
+
+    def _build_state(self) -> LazyGameState:
+        outcome = self.board.outcome()
+        valid_moves = self.get_valid_moves()
+        metadata = self._position_metadata(len(valid_moves))
+        # Draw claims only look back to the last irreversible move, so the snapshot keeps just those
+        snapshot = self.board.copy(stack=self.board.halfmove_clock)
+        return LazyGameState.deferred(
+            # Draw claim detection is the expensive part of the metadata, and matches rarely read it
+            {"metadata": lambda: ChessMetadata(**metadata, can_claim_draw=snapshot.can_claim_draw()).dict()},
             current_player=self.current_player,
-            is_terminal=self.board.is_game_over(),
-            winner=self.get_winner(),
-            valid_moves=self.get_valid_moves(),
-            state_repr=self.board.fen(),
-            metadata=self._get_metadata()
+            is_terminal=outcome is not None,
+            winner=self._general_winner(outcome),
+            valid_moves=valid_moves,
+            state_repr=self.board.fen()
         )
-    
+
     def is_valid_move(self, move: str) -> bool:
         try:
             chess_move = chess.Move.from_uci(move)
@@ -56,8 +74,7 @@ class ChessGameEngine(GameEngine):
         
         # Update game metadata
         if self.game:
-            metadata = self._get_metadata()
-            metadata["move_history"].append(move.move_notation)
+            self.game.metadata["moves"].append(move.move_notation)
             
             # Update game state
             if self.is_game_over():
@@ -71,7 +88,10 @@ class ChessGameEngine(GameEngine):
         return self.board.is_game_over()
     
     def get_winner(self) -> Optional[GeneralPlayer]:
-        winner = self._determine_winner()
+        return self._general_winner(self.board.outcome())
+
+    def _general_winner(self, outcome: Optional[chess.Outcome]) -> Optional[GeneralPlayer]:
+        winner = self._determine_winner(outcome)
         if winner is None:
             return None
         for general_player, player in self.player_map.items():
@@ -84,7 +104,9 @@ class ChessGameEngine(GameEngine):
     
     def reset(self) -> None:
         self.board = chess.Board()
+        self.current_player = GeneralPlayer.PLAYER_ONE
         self.game = None
+        self._states.clear()
     
     def create_game(self, player_white: str, player_black: str) -> Game:
         self.reset()
@@ -106,25 +128,14 @@ class ChessGameEngine(GameEngine):
         
         return self.game
     
-    def _determine_winner(self) -> Optional[Player]:
-        if not self.is_game_over():
-            return None
-        
-        if self.board.is_checkmate():
-            # If it's checkmate, the player who just moved won
-            return Player.BLACK if self.board.turn else Player.WHITE
-        
-        # Draw conditions
-        if (self.board.is_stalemate() or 
-            self.board.is_insufficient_material() or 
-            self.board.is_fifty_moves() or 
-            self.board.is_repetition()):
+    def _determine_winner(self, outcome: Optional[chess.Outcome]) -> Optional[Player]:
+        # Only checkmate has a winner, every other outcome is a draw
+        if outcome is None or outcome.winner is None:
             return None
-            
-        return None
+        return Player.WHITE if outcome.winner == chess.WHITE else Player.BLACK
     
     def _get_game_result(self) -> GameResult:
-        winner = self._determine_winner()
+        winner = self._determine_winner(self.board.outcome())
         
         if winner == Player.WHITE:
             return GameResult.WHITE_WIN
@@ -135,16 +146,23 @@ class ChessGameEngine(GameEngine):
         else:
             return GameResult.IN_PROGRESS
     
-    def _get_metadata(self) -> Dict[str, Any]:
-        return ChessMetadata(
-            check=self.board.is_check(),
-            checkmate=self.board.is_checkmate(),
-            stalemate=self.board.is_stalemate(),
+    def _position_metadata(self, legal_move_count: int) -> Dict[str, Any]:
+        """Metadata of the current position apart from can_claim_draw, which needs the move stack"""
+        check = self.board.is_check()
+        return dict(
+            check=check,
+            checkmate=check and not legal_move_count,
+            stalemate=not check and not legal_move_count,
             insufficient_material=self.board.is_insufficient_material(),
-            can_claim_draw=self.board.can_claim_draw(),
             halfmove_clock=self.board.halfmove_clock,
             fullmove_number=self.board.fullmove_number,
-            move_history=[] if not self.game else self.game.metadata.get("moves", [])
+            move_history=[] if not self.game else self.game.metadata.get("moves", [])[:len(self.board.move_stack)]
+        )
+
+    def _get_metadata(self) -> Dict[str, Any]:
+        return ChessMetadata(
+            **self._position_metadata(self.board.legal_moves.count()),
+            can_claim_draw=self.board.can_claim_draw()
         ).dict()
     
     def get_board_visual(self) -> str:
@@ -159,6 +177,7 @@ class ChessGameEngine(GameEngine):
         """Loads a position from FEN notation"""
         try:
             self.board = chess.Board(fen)
+            self._states.clear()
             if self.game:
                 self.game.metadata["current_fen"] = fen
             return True
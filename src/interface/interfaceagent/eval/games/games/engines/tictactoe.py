@@ -1,27 +1,31 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 import uuid
 from datetime import datetime
 
 from ...datamodel import (
     GameState,
+    LazyGameState,
     GeneralPlayer,   # added generic player
     Game,
     GameResult,
     GameType,
+    Move,
     TicTacToeMetadata
 )
-from ..engines import GameEngine
+from .base import GameEngine, StateCache
 
 class TicTacToeEngine(GameEngine):
     """Tic-tac-toe game implementation using generic players."""
     
-    def __init__(self):
+    def __init__(self, cache_states: bool = True):
         # Board is represented as a list of 9 elements
         # Empty = None, X = GeneralPlayer.PLAYER_ONE, O = GeneralPlayer.PLAYER_TWO
         self.board: List[Optional[GeneralPlayer]] = [None] * 9
         self.current_player = GeneralPlayer.PLAYER_ONE  # using generic role
         self.game: Optional[Game] = None
         self.move_history: List[int] = []
+        self.cache_states = cache_states
+        self._states = StateCache()
         
         # Winning combinations (indices)
         self.winning_combinations = [
@@ -31,14 +35,22 @@ class TicTacToeEngine(GameEngine):
         ]
     
     def get_state(self) -> GameState:
-        """Returns current game state"""
-        return GameState(
+        """Returns current game state, cached per position"""
+        if not self.cache_states:
+            return self._build_state().resolve()
+        return self._states.get(tuple(self.move_history), self._build_state)
+
+    def _build_state(self) -> LazyGameState:
+        winner = self.get_winner()
+        valid_moves = self.get_valid_moves()
+        history = self.move_history.copy()
+        return LazyGameState.deferred(
+            {"metadata": lambda: self._get_metadata(history)},
             current_player=self.current_player,
-            is_terminal=self.is_game_over(),
-            winner=self.get_winner(),
-            valid_moves=self.get_valid_moves(),
-            state_repr=self._board_to_string(),
-            metadata=self._get_metadata()
+            is_terminal=winner is not None or not valid_moves,
+            winner=winner,
+            valid_moves=valid_moves,
+            state_repr=self._board_to_string()
         )
     
     def is_valid_move(self, move: str) -> bool:
@@ -52,8 +64,10 @@ class TicTacToeEngine(GameEngine):
         except ValueError:
             return False
     
-    def make_move(self, move: str) -> bool:
+    def make_move(self, move: Move | str) -> bool:
         """Attempts to make a move. Returns True if successful"""
+        if isinstance(move, Move):
+            move = move.move_notation
         if not self.is_valid_move(move):
             return False
         
@@ -99,6 +113,7 @@ class TicTacToeEngine(GameEngine):
         self.current_player = GeneralPlayer.PLAYER_ONE
         self.game = None
         self.move_history = []
+        self._states.clear()
     
     def create_game(self, player_one: str, player_two: str) -> Game:
         """Creates a new game instance"""
@@ -131,15 +146,16 @@ class TicTacToeEngine(GameEngine):
         }
         return ','.join(mapping[cell] for cell in self.board)
     
-    def _get_metadata(self) -> Dict[str, Any]:
-        """Get current game metadata"""
+    def _get_metadata(self, history: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+        """Get game metadata after the given moves, the current ones by default"""
+        history = self.move_history if history is None else history
         return TicTacToeMetadata(
-            last_move=self.move_history[-1] if self.move_history else None,
-            move_history=self.move_history.copy(),
+            last_move=history[-1] if history else None,
+            move_history=list(history),
             board_size=3,
             winning_combinations=self.winning_combinations,
-            center_taken=self.board[4] is not None,
-            corners_taken=sum(1 for i in [0, 2, 6, 8] if self.board[i] is not None)
+            center_taken=4 in history,
+            corners_taken=sum(1 for i in [0, 2, 6, 8] if i in history)
         ).dict()
     
     def _get_game_result(self) -> GameResult:
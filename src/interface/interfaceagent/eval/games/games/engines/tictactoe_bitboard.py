@@ -0,0 +1,218 @@
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+import uuid
+from datetime import datetime
+
+from ...datamodel import (
+    GameState,
+    LazyGameState,
+    GeneralPlayer,
+    Game,
+    GameResult,
+    GameType,
+    Move,
+    TicTacToeMetadata
+)
+from .base import GameEngine, StateCache
+
+FULL_BOARD = 0b111111111
+
+WINNING_COMBINATIONS = [
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
+    [0, 4, 8], [2, 4, 6]              # Diagonals
+]
+WIN_MASKS = tuple(sum(1 << i for i in combo) for combo in WINNING_COMBINATIONS)
+
+# Indexed by a 9-bit occupancy mask: whether those cells contain a line,
+# and the empty cells of the complementary mask in ascending order
+IS_WIN: Tuple[bool, ...] = tuple(
+    any(mask & win == win for win in WIN_MASKS) for mask in range(FULL_BOARD + 1)
+)
+CELLS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(i for i in range(9) if mask >> i & 1) for mask in range(FULL_BOARD + 1)
+)
+CELL_NAMES: Tuple[Tuple[str, ...], ...] = tuple(tuple(str(i) for i in cells) for cells in CELLS)
+
+PLAYERS = (GeneralPlayer.PLAYER_ONE, GeneralPlayer.PLAYER_TWO)
+
+
+class BitboardTicTacToeEngine(GameEngine):
+    """Tic-tac-toe on two 9-bit masks, one per player.
+
+    A drop-in replacement for TicTacToeEngine for mass self-play and search.
+    Win checks and legal move enumeration are table lookups on the masks,
+    and play/undo update them in place, so search can walk the game tree
+    without copying boards or building GameState objects. Once a player
+    has won there are no legal moves left.
+    """
+
+    def __init__(self, cache_states: bool = True):
+        # boards[0] holds PLAYER_ONE's (X) marks, boards[1] PLAYER_TWO's (O)
+        self.boards = [0, 0]
+        self.move_history: List[int] = []
+        self.winner_index: Optional[int] = None
+        self.game: Optional[Game] = None
+        self.winning_combinations = WINNING_COMBINATIONS
+        self.cache_states = cache_states
+        self._states = StateCache()
+
+    @property
+    def current_player(self) -> GeneralPlayer:
+        return PLAYERS[len(self.move_history) & 1]
+
+    def empty_mask(self) -> int:
+        """Mask of the empty cells, 0 once the game is over"""
+        if self.winner_index is not None:
+            return 0
+        return ~(self.boards[0] | self.boards[1]) & FULL_BOARD
+
+    def legal_moves(self) -> Tuple[int, ...]:
+        """Legal cells in ascending order"""
+        return CELLS[self.empty_mask()]
+
+    def play(self, position: int) -> None:
+        """Mark a cell for the player to move, without validation or game bookkeeping"""
+        side = len(self.move_history) & 1
+        board = self.boards[side] | 1 << position
+        self.boards[side] = board
+        self.move_history.append(position)
+        if IS_WIN[board]:
+            self.winner_index = side
+
+    def undo(self) -> int:
+        """Take back the last move and return its cell"""
+        position = self.move_history.pop()
+        self.boards[len(self.move_history) & 1] &= ~(1 << position)
+        # The game stopped at the first line, so the previous position had no winner
+        self.winner_index = None
+        return position
+
+    def get_state(self) -> GameState:
+        """Returns current game state, cached per position"""
+        if not self.cache_states:
+            return self._build_state().resolve()
+        return self._states.get(tuple(self.move_history), self._build_state)
+
+    def _build_state(self) -> LazyGameState:
+        history = self.move_history.copy()
+        return LazyGameState.deferred(
+            {"metadata": lambda: self._get_metadata(history)},
+            current_player=self.current_player,
+            is_terminal=self.is_game_over(),
+            winner=self.get_winner(),
+            valid_moves=self.get_valid_moves(),
+            state_repr=self._board_to_string()
+        )
+
+    def is_valid_move(self, move: str) -> bool:
+        """Checks if a move is valid in current state"""
+        try:
+            position = int(move)
+        except ValueError:
+            return False
+        return 0 <= position < 9 and bool(self.empty_mask() >> position & 1)
+
+    def make_move(self, move: Move | str) -> bool:
+        """Attempts to make a move. Returns True if successful"""
+        if isinstance(move, Move):
+            move = move.move_notation
+        if not self.is_valid_move(move):
+            return False
+        self.play(int(move))
+
+        if self.game:
+            self.game.metadata["move_history"] = self.move_history
+            if self.is_game_over():
+                self.game.end_time = datetime.utcnow()
+                self.game.final_state = self.get_state()
+                self.game.result = self._get_game_result()
+        return True
+
+    def undo_move(self) -> Optional[int]:
+        """Takes back the last move, returns its cell or None if there is none"""
+        if not self.move_history:
+            return None
+        return self.undo()
+
+    def is_game_over(self) -> bool:
+        """Checks if the game has ended"""
+        return self.winner_index is not None or len(self.move_history) == 9
+
+    def get_winner(self) -> Optional[GeneralPlayer]:
+        """Returns winner if game is over, None otherwise"""
+        return None if self.winner_index is None else PLAYERS[self.winner_index]
+
+    def get_valid_moves(self) -> List[str]:
+        """Returns list of valid moves in current state"""
+        return list(CELL_NAMES[self.empty_mask()])
+
+    def reset(self) -> None:
+        """Resets the game to initial state"""
+        self.boards = [0, 0]
+        self.move_history = []
+        self.winner_index = None
+        self.game = None
+        self._states.clear()
+
+    def create_game(self, player_one: str, player_two: str) -> Game:
+        """Creates a new game instance"""
+        self.reset()
+        self.game = Game(
+            game_id=str(uuid.uuid4()),
+            start_time=datetime.utcnow(),
+            player_white=player_one,
+            player_black=player_two,
+            initial_state=self.get_state(),
+            result=GameResult.IN_PROGRESS,
+            metadata={
+                "game_type": GameType.TIC_TAC_TOE,
+                "move_history": [],
+                "board_size": 3,
+                "winning_combinations": self.winning_combinations
+            }
+        )
+        return self.game
+
+    def load_state(self, moves: List[int]) -> bool:
+        """Loads a game state from a list of moves"""
+        self.reset()
+        for move in moves:
+            if not self.make_move(str(move)):
+                self.reset()
+                return False
+        return True
+
+    def _symbols(self, empty: str) -> List[str]:
+        one, two = self.boards
+        return ['X' if one >> i & 1 else 'O' if two >> i & 1 else empty for i in range(9)]
+
+    def _board_to_string(self) -> str:
+        return ','.join(self._symbols('-'))
+
+    def _get_metadata(self, history: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+        """Get game metadata after the given moves, the current ones by default"""
+        history = self.move_history if history is None else history
+        return TicTacToeMetadata(
+            last_move=history[-1] if history else None,
+            move_history=list(history),
+            board_size=3,
+            winning_combinations=self.winning_combinations,
+            center_taken=4 in history,
+            corners_taken=sum(1 for i in (0, 2, 6, 8) if i in history)
+        ).dict()
+
+    def _get_game_result(self) -> GameResult:
+        """Determine game result"""
+        if self.winner_index == 0:
+            return GameResult.WHITE_WIN
+        if self.winner_index == 1:
+            return GameResult.BLACK_WIN
+        return GameResult.DRAW if self.is_game_over() else GameResult.IN_PROGRESS
+
+    def get_board_visual(self) -> str:
+        """Returns a visual representation of the board"""
+        symbols = self._symbols(' ')
+        board_str = '\n-----------\n'.join(
+            ' | '.join(symbols[i:i+3]) for i in range(0, 9, 3)
+        )
+        return f"\n{board_str}\n"
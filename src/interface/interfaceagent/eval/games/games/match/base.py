@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Optional, List, Tuple, Dict, Any, Generic, TypeVar
 import asyncio
+import random
 from datetime import datetime
 import logging
 from ...datamodel import (
@@ -8,6 +9,7 @@ from ...datamodel import (
     GameState,
     GameTurn,
     Player,
+    GeneralPlayer,
     GameResult,
     AIMove,
     GameType,
@@ -33,13 +35,16 @@ class BaseGameMatch(ABC, Generic[TEngine, TMetadata]):
         player_two: AIAgent,
         game_engine: TEngine,
         max_moves: int = 100,
-        move_timeout: float = 30.0
+        move_timeout: float = 30.0,
+        rng: Optional[random.Random] = None
     ):
         self.player_one = player_one
         self.player_two = player_two
         self.game_engine = game_engine
         self.max_moves = max_moves
         self.move_timeout = move_timeout
+        # Handed to the agents on every move; None leaves them on the global generator
+        self.rng = rng
         self.game: Optional[Game] = None
         
     @abstractmethod
@@ -65,10 +70,7 @@ class BaseGameMatch(ABC, Generic[TEngine, TMetadata]):
     async def play(self) -> Game:
         """Play a complete game between the agents"""
         # Initialize new game
-        self.game = self.game_engine.create_game(
-            player_one=self.player_one.name,
-            player_two=self.player_two.name
-        )
+        self.game = self.game_engine.create_game(self.player_one.name, self.player_two.name)
         
         turn_number = 0
         
@@ -91,7 +93,7 @@ class BaseGameMatch(ABC, Generic[TEngine, TMetadata]):
                 # Get agent's move with timeout
                 try:
                     move = await asyncio.wait_for(
-                        current_agent.move(current_state),
+                        current_agent.move(current_state, rng=self.rng),
                         timeout=self.move_timeout
                     )
                 except asyncio.TimeoutError:
@@ -139,11 +141,11 @@ class BaseGameMatch(ABC, Generic[TEngine, TMetadata]):
             self.handle_error(e)
             return self.game
     
-    def handle_forfeit(self, forfeiting_player: Player) -> None:
+    def handle_forfeit(self, forfeiting_player: GeneralPlayer) -> None:
         """Handle game end due to forfeit"""
         self.game.result = (
-            GameResult.PLAYER_TWO_WIN if forfeiting_player == Player.PLAYER_ONE
-            else GameResult.PLAYER_ONE_WIN
+            GameResult.BLACK_WIN if forfeiting_player == GeneralPlayer.PLAYER_ONE
+            else GameResult.WHITE_WIN
         )
     
     def handle_error(self, error: Exception) -> None:
@@ -8,6 +8,7 @@ from ...datamodel import (
     GameState,
     GameTurn,
     Player,
+    GeneralPlayer,
     GameResult,
     AIMove,
     GameType,
@@ -29,11 +30,11 @@ class ChessMatch(BaseGameMatch[ChessGameEngine, ChessMetadata]):
     """Chess-specific match implementation"""
     
     def get_current_agent(self, state: GameState) -> AIAgent:
-        return self.player_one if state.current_player == Player.PLAYER_ONE else self.player_two
+        return self.player_one if state.current_player == GeneralPlayer.PLAYER_ONE else self.player_two
     
     def create_forfeit_move(self, state: GameState, agent: AIAgent) -> AIMove:
         return AIMove(
-            player=state.current_player,
+            player=Player.WHITE if state.current_player == GeneralPlayer.PLAYER_ONE else Player.BLACK,
             move_notation="forfeit",
             model_name=agent.name,
             reasoning="Failed to generate valid chess move",
@@ -47,9 +48,8 @@ class ChessMatch(BaseGameMatch[ChessGameEngine, ChessMetadata]):
         )
     
     def validate_game_state(self, state: GameState) -> bool:
-        # Chess-specific validation
-        metadata = ChessMetadata(**state.metadata)
-        return not (metadata.checkmate or metadata.stalemate)
+        # Chess-specific validation, from is_terminal so the lazily computed metadata is not needed
+        return not state.is_terminal
     
     def get_game_specific_summary(self) -> Dict[str, Any]:
         if not self.game:
@@ -8,6 +8,7 @@ from ...datamodel import (
     GameState,
     GameTurn,
     Player,
+    GeneralPlayer,
     GameResult,
     AIMove,
     GameType,
@@ -30,11 +31,11 @@ class TicTacToeMatch(BaseGameMatch[TicTacToeEngine, TicTacToeMetadata]):
     """Tic-tac-toe specific match implementation"""
     
     def get_current_agent(self, state: GameState) -> AIAgent:
-        return self.player_one if state.current_player == Player.PLAYER_ONE else self.player_two
+        return self.player_one if state.current_player == GeneralPlayer.PLAYER_ONE else self.player_two
     
     def create_forfeit_move(self, state: GameState, agent: AIAgent) -> AIMove:
         return AIMove(
-            player=state.current_player,
+            player=Player.WHITE if state.current_player == GeneralPlayer.PLAYER_ONE else Player.BLACK,
             move_notation="forfeit",
             model_name=agent.name,
             reasoning="Failed to generate valid tic-tac-toe move",
@@ -49,7 +50,6 @@ class TicTacToeMatch(BaseGameMatch[TicTacToeEngine, TicTacToeMetadata]):
     
     def validate_game_state(self, state: GameState) -> bool:
         # Tic-tac-toe specific validation
-        metadata = TicTacToeMetadata(**state.metadata)
         board = state.state_repr.split(',')
         return len(board) == 9  # Simple validation for 3x3 board
     
@@ -0,0 +1,169 @@
+from typing import Dict, Iterator, Optional, Tuple
+
+from ..datamodel import (
+    AIMove,
+    Game,
+    GameRecord,
+    GameState,
+    GameTurn,
+    GameType,
+    MoveRecord
+)
+from .engines import ChessGameEngine, GameEngine, TicTacToeEngine
+
+ENGINES = {
+    GameType.CHESS: ChessGameEngine,
+    GameType.TIC_TAC_TOE: TicTacToeEngine,
+}
+
+
+def infer_game_type(game: Game) -> GameType:
+    """Game type from the metadata the engines write when creating a game"""
+    if "game_type" in game.metadata:
+        return GameType(game.metadata["game_type"])
+    if game.metadata.get("engine") == "chess":
+        return GameType.CHESS
+    raise ValueError(f"Cannot tell the game type of game {game.game_id}, pass it explicitly")
+
+
+def to_record(
+    game: Game,
+    game_type: Optional[GameType] = None,
+    keep_prompts: bool = True,
+    keep_responses: bool = True
+) -> GameRecord:
+    """Convert a Game to a GameRecord, dropping the states of every turn.
+
+    Args:
+        game: Game to convert
+        game_type: Game type, inferred from the game metadata if not given
+        keep_prompts: Keep prompts, storing each distinct line once, since prompts
+            mostly repeat the same instructions around the position
+        keep_responses: Keep raw model responses
+
+    Returns:
+        The compact record
+    """
+    lines: Dict[str, int] = {}
+    moves = []
+    for turn in game.turns:
+        move = turn.move
+        prompt = None
+        if keep_prompts and move.prompt_used:
+            prompt = [lines.setdefault(line, len(lines)) for line in move.prompt_used.split("\n")]
+        moves.append(MoveRecord(
+            turn_number=turn.turn_number,
+            player=move.player,
+            move_notation=move.move_notation,
+            is_valid=move.is_valid,
+            timestamp=move.timestamp,
+            model_name=move.model_name,
+            reasoning=move.reasoning,
+            tokens_used=move.tokens_used,
+            retry_count=move.retry_count,
+            duration_ms=turn.duration_ms,
+            prompt=prompt,
+            raw_response=move.raw_response if keep_responses else None
+        ))
+
+    return GameRecord(
+        game_id=game.game_id,
+        game_type=game_type or infer_game_type(game),
+        start_time=game.start_time,
+        end_time=game.end_time,
+        player_white=game.player_white,
+        player_black=game.player_black,
+        initial_state=game.initial_state,
+        moves=moves,
+        prompt_lines=list(lines),
+        result=game.result,
+        metadata=game.metadata
+    )
+
+
+def replay(
+    record: GameRecord,
+    engine: Optional[GameEngine] = None
+) -> Iterator[Tuple[GameState, AIMove, GameState]]:
+    """Replay a record through an engine, yielding the state before, the move and the state after each turn.
+
+    Args:
+        record: Record to replay
+        engine: Engine to replay through, a new one for the record's game type by default.
+            Use the engine type the game was played with, as engines may differ in details
+            such as the valid moves listed in a won position.
+
+    Raises:
+        ValueError: If the game type has no engine, or a recorded move is not legal when replayed
+    """
+    if engine is None:
+        if record.game_type not in ENGINES:
+            raise ValueError(f"No engine for game type: {record.game_type}")
+        engine = ENGINES[record.game_type]()
+    engine.create_game(record.player_white, record.player_black)
+    if engine.get_state().state_repr != record.initial_state.state_repr:
+        # Games started from a set-up position, such as a chess FEN
+        if not hasattr(engine, "load_fen") or not engine.load_fen(record.initial_state.state_repr):
+            raise ValueError(f"Cannot set up the initial state of game {record.game_id}")
+
+    for move_record in record.moves:
+        move = to_ai_move(record, move_record)
+        before = engine.get_state()
+        # Forfeits and other invalid moves were recorded without changing the state
+        if move.is_valid and not engine.make_move(move):
+            raise ValueError(f"Move {move.move_notation} of turn {move_record.turn_number} "
+                             f"of game {record.game_id} does not replay")
+        yield before, move, engine.get_state()
+
+
+def to_ai_move(record: GameRecord, move: MoveRecord) -> AIMove:
+    """Rebuild the AIMove of a recorded move, with empty prompt or response if they were not kept"""
+    return AIMove(
+        player=move.player,
+        move_notation=move.move_notation,
+        timestamp=move.timestamp,
+        is_valid=move.is_valid,
+        model_name=move.model_name,
+        reasoning=move.reasoning,
+        tokens_used=move.tokens_used,
+        retry_count=move.retry_count,
+        raw_response=move.raw_response or "",
+        prompt_used="\n".join(record.prompt_lines[i] for i in move.prompt) if move.prompt is not None else ""
+    )
+
+
+def to_game(record: GameRecord, engine: Optional[GameEngine] = None) -> Game:
+    """Export a record to the full Game shape, replaying every state through the engine.
+
+    Args:
+        record: Record to export
+        engine: Engine to replay through, see replay
+
+    Returns:
+        The game with every turn's states
+    """
+    turns = []
+    final_state = record.initial_state
+    for move_record, (before, move, after) in zip(record.moves, replay(record, engine)):
+        turns.append(GameTurn(
+            turn_number=move_record.turn_number,
+            game_state_before=before,
+            move=move,
+            game_state_after=after,
+            duration_ms=move_record.duration_ms
+        ))
+        final_state = after
+
+    return Game(
+        game_id=record.game_id,
+        start_time=record.start_time,
+        end_time=record.end_time,
+        player_white=record.player_white,
+        player_black=record.player_black,
+        initial_state=record.initial_state,
+        turns=turns,
+        # Only games still in progress have no final state
+        final_state=final_state if record.end_time is not None else None,
+        result=record.result,
+        metadata=record.metadata
+    )
@@ -0,0 +1,354 @@
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from ..datamodel import (
+    Game,
+    GameResult,
+    GameType,
+    GeneralPlayer,
+    ModelPerformance,
+    TournamentResult
+)
+from ..agents import AIAgent
+from .engines import ChessGameEngine, TicTacToeEngine
+from .match.base import BaseGameMatch
+from .match.chess import ChessMatch
+from .match.tictactoe import TicTacToeMatch
+
+logger = logging.getLogger(__name__)
+
+TOURNAMENT_FORMATS = ("round_robin", "swiss")
+
+
+def _chess_match(*args, **kwargs) -> BaseGameMatch:
+    return ChessMatch(*args, game_engine=ChessGameEngine(), **kwargs)
+
+
+def _tictactoe_match(*args, **kwargs) -> BaseGameMatch:
+    return TicTacToeMatch(*args, game_engine=TicTacToeEngine(), **kwargs)
+
+
+# Builds a match with a fresh engine from (player_one, player_two, max_moves=, move_timeout=, rng=)
+MATCH_FACTORIES: Dict[GameType, Callable[..., BaseGameMatch]] = {
+    GameType.CHESS: _chess_match,
+    GameType.TIC_TAC_TOE: _tictactoe_match,
+}
+
+
+class TournamentConfig(BaseModel):
+    """Configuration for a tournament"""
+    game_type: GameType = Field(
+        default=GameType.TIC_TAC_TOE,
+        description="Game played in every pairing"
+    )
+    format: str = Field(
+        default="round_robin",
+        description="Pairing system, one of 'round_robin' or 'swiss'"
+    )
+    rounds: Optional[int] = Field(
+        default=None,
+        description="Swiss rounds, None for ceil(log2(participants))"
+    )
+    seeds: List[int] = Field(
+        default_factory=lambda: [0],
+        description="Every pairing is played once per seed"
+    )
+    swap_colors: bool = Field(
+        default=True,
+        description="Play every pairing and seed a second time with colors swapped"
+    )
+    concurrency: int = Field(
+        default=8,
+        description="Maximum games played at the same time"
+    )
+    max_moves: int = Field(
+        default=100,
+        description="Moves after which a game is drawn"
+    )
+    move_timeout: float = Field(
+        default=30.0,
+        description="Seconds an agent gets for each move"
+    )
+    checkpoint_path: Optional[str] = Field(
+        default=None,
+        description="JSONL file completed games are appended to, and resumed from"
+    )
+
+
+class ScheduledGame(BaseModel):
+    """One game of the schedule"""
+    round: int
+    white: str
+    black: str
+    seed: int
+
+    @property
+    def key(self) -> str:
+        """Identifies the game in the checkpoint file"""
+        return f"{self.round}:{self.white}:{self.black}:{self.seed}"
+
+
+def game_points(game: Game) -> Dict[str, float]:
+    """Points each player scored in a game: 1 for a win, 0.5 for a draw"""
+    if game.result == GameResult.WHITE_WIN:
+        return {game.player_white: 1.0, game.player_black: 0.0}
+    if game.result == GameResult.BLACK_WIN:
+        return {game.player_white: 0.0, game.player_black: 1.0}
+    if game.result == GameResult.DRAW:
+        return {game.player_white: 0.5, game.player_black: 0.5}
+    return {game.player_white: 0.0, game.player_black: 0.0}
+
+
+def model_performance(model_name: str, games: Sequence[Game]) -> ModelPerformance:
+    """Aggregate one model's results and move statistics over the games it played"""
+    played = [game for game in games if model_name in (game.player_white, game.player_black)]
+    won = lost = drawn = 0
+    moves = tokens = retries = duration_ms = 0
+    for game in played:
+        points = game_points(game)[model_name]
+        if game.result == GameResult.DRAW:
+            drawn += 1
+        elif points == 1.0:
+            won += 1
+        elif game.result != GameResult.IN_PROGRESS:
+            lost += 1
+
+        # The same model may play both sides, so attribute turns by side rather than name
+        side = GeneralPlayer.PLAYER_ONE if game.player_white == model_name else GeneralPlayer.PLAYER_TWO
+        for turn in game.turns:
+            if game.player_white == game.player_black or turn.game_state_before.current_player == side:
+                moves += 1
+                tokens += turn.move.tokens_used
+                retries += turn.move.retry_count
+                duration_ms += turn.duration_ms
+
+    return ModelPerformance(
+        model_name=model_name,
+        games_played=len(played),
+        games_won=won,
+        games_lost=lost,
+        games_drawn=drawn,
+        average_moves_per_game=moves / max(1, len(played)),
+        average_tokens_per_move=tokens / max(1, moves),
+        average_retries_per_move=retries / max(1, moves),
+        total_tokens_used=tokens,
+        average_time_per_move_ms=duration_ms / max(1, moves),
+        win_rate=won / max(1, len(played)) * 100
+    )
+
+
+def round_robin_schedule(names: Sequence[str], seeds: Sequence[int], swap_colors: bool) -> List[ScheduledGame]:
+    """Every participant plays every other once per seed, and again with colors swapped"""
+    schedule = []
+    for i, white in enumerate(names):
+        for black in names[i + 1:]:
+            for seed in seeds:
+                schedule.append(ScheduledGame(round=0, white=white, black=black, seed=seed))
+                if swap_colors:
+                    schedule.append(ScheduledGame(round=0, white=black, black=white, seed=seed))
+    return schedule
+
+
+def swiss_pairings(
+    standings: Sequence[str],
+    played: Set[Tuple[str, str]],
+    byes: Dict[str, int]
+) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """Pair participants of similar score who have not met yet.
+
+    Args:
+        standings: Participants ordered from most to fewest points
+        played: Pairs that have already met, in both orders
+        byes: Byes each participant has had so far
+
+    Returns:
+        Pairs with the higher ranked participant first, and the participant
+        sitting out this round if the count is odd
+    """
+    remaining = list(standings)
+    bye = None
+    if len(remaining) % 2:
+        # The lowest ranked participant with the fewest byes sits out
+        bye = min(reversed(remaining), key=lambda name: byes.get(name, 0))
+        remaining.remove(bye)
+
+    pairs = []
+    while remaining:
+        first = remaining.pop(0)
+        # Closest ranked opponent not met yet, or the closest one if all have been met
+        opponent = next((name for name in remaining if (first, name) not in played), remaining[0])
+        remaining.remove(opponent)
+        pairs.append((first, opponent))
+    return pairs, bye
+
+
+class TournamentRunner:
+    """Plays a tournament between agents, many games at a time.
+
+    Round robin schedules every game up front. Swiss plays round by round,
+    pairing participants of similar score. Each pairing is played once per
+    seed and, with swap_colors, a second time with colors reversed.
+    Each game gets its own random generator seeded from its schedule
+    entry and handed to the agents, so games with randomized agents are
+    reproducible at any concurrency.
+
+    With a checkpoint path every completed game is appended to a JSONL
+    file as it finishes. Running again with the same agents and config
+    skips the games found there, so an interrupted run resumes where it
+    stopped.
+    """
+
+    def __init__(
+        self,
+        agents: Sequence[AIAgent],
+        config: Optional[TournamentConfig] = None,
+        match_factory: Optional[Callable[..., BaseGameMatch]] = None
+    ):
+        """Initialize TournamentRunner.
+
+        Args:
+            agents: Participants, with unique names
+            config: Tournament configuration
+            match_factory: Builds a match with a fresh engine, defaults to the one for config.game_type
+
+        Raises:
+            ValueError: If the config or participants are invalid
+        """
+        self.config = config or TournamentConfig()
+        if self.config.format not in TOURNAMENT_FORMATS:
+            raise ValueError(f"Unsupported tournament format: {self.config.format}")
+        if self.config.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if not self.config.seeds:
+            raise ValueError("At least one seed is required")
+        names = [agent.name for agent in agents]
+        if len(names) < 2:
+            raise ValueError("A tournament needs at least two agents")
+        if len(set(names)) != len(names):
+            raise ValueError("Agent names must be unique")
+        if match_factory is None:
+            if self.config.game_type not in MATCH_FACTORIES:
+                raise ValueError(f"Unsupported game type: {self.config.game_type}")
+            match_factory = MATCH_FACTORIES[self.config.game_type]
+
+        self.agents: Dict[str, AIAgent] = {agent.name: agent for agent in agents}
+        self.match_factory = match_factory
+        self.tournament_id = str(uuid.uuid4())
+        self._completed: Dict[str, Game] = {}
+        self._semaphore = asyncio.Semaphore(self.config.concurrency)
+
+    async def run(self) -> TournamentResult:
+        """Play every scheduled game not already in the checkpoint."""
+        start_time = datetime.utcnow()
+        self._load_checkpoint()
+        names = list(self.agents)
+        byes: Dict[str, int] = {}
+
+        if self.config.format == "round_robin":
+            games = await self._play_all(round_robin_schedule(names, self.config.seeds, self.config.swap_colors))
+        else:
+            rounds = self.config.rounds or math.ceil(math.log2(len(names)))
+            games = []
+            played: Set[Tuple[str, str]] = set()
+            for round_number in range(rounds):
+                points = self._points(games, byes)
+                # Ties keep the order agents were given in, so resumed runs pair the same way
+                standings = sorted(names, key=lambda name: -points[name])
+                pairs, bye = swiss_pairings(standings, played, byes)
+                if bye is not None:
+                    byes[bye] = byes.get(bye, 0) + 1
+                schedule = []
+                for white, black in pairs:
+                    played.update({(white, black), (black, white)})
+                    for seed in self.config.seeds:
+                        schedule.append(ScheduledGame(round=round_number, white=white, black=black, seed=seed))
+                        if self.config.swap_colors:
+                            schedule.append(ScheduledGame(round=round_number, white=black, black=white, seed=seed))
+                games.extend(await self._play_all(schedule))
+                logger.info(f"Swiss round {round_number + 1}/{rounds} done")
+
+        if self._completed and min(game.start_time for game in self._completed.values()) < start_time:
+            start_time = min(game.start_time for game in self._completed.values())
+        points = self._points(games, byes)
+        return TournamentResult(
+            tournament_id=self.tournament_id,
+            start_time=start_time,
+            end_time=datetime.utcnow(),
+            participants=names,
+            games=games,
+            statistics={
+                "format": self.config.format,
+                "game_type": self.config.game_type.value,
+                "points": points,
+                "byes": byes,
+                "errors": sum(1 for game in games if "error" in game.metadata),
+                "performance": {name: model_performance(name, games).model_dump() for name in names},
+            }
+        )
+
+    async def _play_all(self, schedule: Sequence[ScheduledGame]) -> List[Game]:
+        pending = [scheduled for scheduled in schedule if scheduled.key not in self._completed]
+        if len(pending) < len(schedule):
+            logger.info(f"Resuming: {len(schedule) - len(pending)} of {len(schedule)} games already played")
+        await asyncio.gather(*(self._play(scheduled) for scheduled in pending))
+        return [self._completed[scheduled.key] for scheduled in schedule]
+
+    async def _play(self, scheduled: ScheduledGame) -> None:
+        async with self._semaphore:
+            match = self.match_factory(
+                self.agents[scheduled.white],
+                self.agents[scheduled.black],
+                max_moves=self.config.max_moves,
+                move_timeout=self.config.move_timeout,
+                rng=random.Random(scheduled.key)
+            )
+            game = await match.play()
+            game.metadata.update(tournament_id=self.tournament_id, round=scheduled.round, seed=scheduled.seed)
+            self._completed[scheduled.key] = game
+            self._save_checkpoint(scheduled.key, game)
+
+    def _points(self, games: Sequence[Game], byes: Dict[str, int]) -> Dict[str, float]:
+        # A bye scores as a win
+        points = {name: float(byes.get(name, 0)) for name in self.agents}
+        for game in games:
+            for name, scored in game_points(game).items():
+                points[name] += scored
+        return points
+
+    def _load_checkpoint(self) -> None:
+        path = self.config.checkpoint_path
+        if not path or not os.path.exists(path):
+            return
+        with open(path) as f:
+            lines = f.readlines()
+        if lines and not lines[-1].endswith("\n"):
+            # A run killed mid-write leaves a partial last line, end it so appends start clean
+            with open(path, "a") as f:
+                f.write("\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                self._completed[record["key"]] = Game.model_validate(record["game"])
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable checkpoint line: {str(e)}")
+                continue
+            self.tournament_id = record.get("tournament_id", self.tournament_id)
+        logger.info(f"Loaded {len(self._completed)} games from checkpoint {path}")
+
+    def _save_checkpoint(self, key: str, game: Game) -> None:
+        if not self.config.checkpoint_path:
+            return
+        record = {"tournament_id": self.tournament_id, "key": key, "game": game.model_dump(mode="json")}
+        with open(self.config.checkpoint_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
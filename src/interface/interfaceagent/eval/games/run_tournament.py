@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import json
+
+from interfaceagent.eval.games.agents.tictactoe import BasicTicTacToeAgent
+from interfaceagent.eval.games.games.tournament import TournamentConfig, TournamentRunner
+
+
+async def run_tournament(args: argparse.Namespace):
+    agents = [BasicTicTacToeAgent(f"Random{i + 1}") for i in range(args.agents)]
+    config = TournamentConfig(
+        format=args.format,
+        rounds=args.rounds,
+        seeds=list(range(args.seeds)),
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint
+    )
+    result = await TournamentRunner(agents, config).run()
+
+    print(f"Tournament {result.tournament_id}: {result.total_games} games")
+    for name, performance in result.statistics["performance"].items():
+        print(f"{name:<12} points {result.statistics['points'][name]:>6} "
+              f"won {performance['games_won']:>4} lost {performance['games_lost']:>4} "
+              f"drawn {performance['games_drawn']:>4} win rate {performance['win_rate']:.1f}%")
+    print(f"Winner: {result.winner or 'tie'}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result.model_dump(mode="json"), f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play a TicTacToe tournament between random agents")
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--format", default="round_robin", choices=["round_robin", "swiss"])
+    parser.add_argument("--rounds", type=int, default=None)
+    parser.add_argument("--seeds", type=int, default=10, help="Games per pairing and color")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--checkpoint", help="JSONL file to checkpoint games to and resume from")
+    parser.add_argument("--output", help="Write the TournamentResult as JSON to this file")
+    asyncio.run(run_tournament(parser.parse_args()))
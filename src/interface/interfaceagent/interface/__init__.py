@@ -1,4 +1,40 @@
-from .browsermanager import *
-from .webbrowser import *
-from .planner import *
-from .model import *
+import importlib
+from typing import TYPE_CHECKING
+
+# Submodules pull in playwright and openai, so they are only imported on first use
+_LAZY_IMPORTS = {
+    "WebBrowserManager": ".browsermanager",
+    "SessionQueue": ".browsermanager",
+    "SessionQueueFull": ".browsermanager",
+    "SessionNotFound": ".browsermanager",
+    "BrowserCapacityExceeded": ".browsermanager",
+    "SessionRegistry": ".sessionregistry",
+    "WebBrowser": ".webbrowser",
+    "StubWebBrowser": ".stubbrowser",
+    "StubBrowserConfig": ".stubbrowser",
+    "Planner": ".planner",
+    "OpenAIPlannerModel": ".model",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+if TYPE_CHECKING:
+    from .browsermanager import WebBrowserManager, SessionQueue, SessionQueueFull, SessionNotFound, BrowserCapacityExceeded
+    from .sessionregistry import SessionRegistry
+    from .webbrowser import WebBrowser
+    from .stubbrowser import StubWebBrowser, StubBrowserConfig
+    from .planner import Planner
+    from .model import OpenAIPlannerModel
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(
+            _LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,18 +1,110 @@
 from pydantic import HttpUrl
 from uuid import UUID, uuid4
-from typing import Dict, Optional, Any, List
+from typing import AsyncIterator, Callable, Dict, Optional, Any, List
+from contextlib import asynccontextmanager
 from .webbrowser import WebBrowser
+from .sessionregistry import SessionRegistry
 from loguru import logger
 import asyncio
+import math
+import os
+import time
 
-# Configure loguru
-logger.add("api.log", rotation="500 MB", level="INFO")
+
+class SessionNotFound(Exception):
+    """Raised when an operation targets a session that does not exist or was closed."""
+
+    def __init__(self, session_id: UUID):
+        super().__init__(f"Session {session_id} not found")
+        self.session_id = session_id
+
+
+class SessionQueueFull(Exception):
+    """Raised when a session already has the maximum number of queued operations."""
+
+    def __init__(self, session_id: UUID, retry_after: int):
+        super().__init__(f"Action queue for session {session_id} is full")
+        self.retry_after = retry_after
+
+
+class BrowserCapacityExceeded(Exception):
+    """Raised when no browser operation slot frees up within the admission timeout."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many concurrent browser operations")
+        self.retry_after = retry_after
+
+
+class SessionQueue:
+    """FIFO queue serializing operations on a single browser session."""
+
+    def __init__(self, max_depth: int):
+        # asyncio.Lock wakes waiters in the order they arrived
+        self.lock = asyncio.Lock()
+        self.max_depth = max_depth
+        self.depth = 0
+        self.operations = 0
+        self.total_wait_ms = 0.0
+        self.last_wait_ms = 0.0
+        self.avg_duration_ms = 0.0
+
+    def record(self, wait_ms: float, duration_ms: float) -> None:
+        self.operations += 1
+        self.total_wait_ms += wait_ms
+        self.last_wait_ms = wait_ms
+        # Exponential moving average keeps the Retry-After estimate responsive
+        self.avg_duration_ms = duration_ms if self.operations == 1 else (
+            0.8 * self.avg_duration_ms + 0.2 * duration_ms)
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.depth * self.avg_duration_ms / 1000))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "operations": self.operations,
+            "avg_wait_ms": round(self.total_wait_ms / max(1, self.operations), 2),
+            "last_wait_ms": round(self.last_wait_ms, 2),
+            "avg_duration_ms": round(self.avg_duration_ms, 2),
+        }
 
 
 class WebBrowserManager:
-    def __init__(self):
+    def __init__(self,
+                 max_queue_depth: int = 8,
+                 max_concurrent_operations: Optional[int] = None,
+                 admission_timeout: float = 10.0,
+                 browser_factory: Optional[Callable[..., WebBrowser]] = None,
+                 registry: Optional[SessionRegistry] = None,
+                 worker_id: Optional[str] = None):
+        """
+        Initialize the WebBrowserManager.
+
+        Args:
+            max_queue_depth (int): Maximum queued plus running operations per session.
+            max_concurrent_operations (Optional[int]): Server-wide limit on in-flight browser
+                operations. Defaults to twice the CPU count.
+            admission_timeout (float): Seconds to wait for an operation slot before rejecting.
+            browser_factory (Optional[Callable[..., WebBrowser]]): Builds a browser from a start URL
+                and headless flag. Defaults to WebBrowser, e.g. StubWebBrowser for load tests.
+            registry (Optional[SessionRegistry]): Shared registry recording which worker owns
+                each session, used when running several workers.
+            worker_id (Optional[str]): The identifier this manager registers sessions under.
+        """
         self.sessions: Dict[UUID, WebBrowser] = {}
+        self.queues: Dict[UUID, SessionQueue] = {}
         self.lock = asyncio.Lock()
+        self.max_queue_depth = max_queue_depth
+        self.max_concurrent_operations = max_concurrent_operations or 2 * \
+            (os.cpu_count() or 1)
+        self.admission_timeout = admission_timeout
+        self.operation_semaphore = asyncio.Semaphore(
+            self.max_concurrent_operations)
+        self.active_operations = 0
+        self.browser_factory = browser_factory or WebBrowser
+        self.registry = registry
+        self.worker_id = worker_id
 
     async def create_session(self, start_url: HttpUrl, headless: bool = True) -> UUID:
         """
@@ -30,10 +122,14 @@ class WebBrowserManager:
         """
         session_id = uuid4()
         try:
-            browser = WebBrowser(str(start_url), headless=headless)
+            browser = self.browser_factory(str(start_url), headless=headless)
             await browser.initialize()
             async with self.lock:
                 self.sessions[session_id] = browser
+                self.queues[session_id] = SessionQueue(self.max_queue_depth)
+            if self.registry:
+                await asyncio.to_thread(self.registry.add_session,
+                                        session_id, self.worker_id, str(start_url))
             logger.info(f"Created new session with ID: {session_id}")
             return session_id
         except Exception as e:
@@ -68,6 +164,9 @@ class WebBrowserManager:
                 try:
                     await self.sessions[session_id].close()
                     del self.sessions[session_id]
+                    self.queues.pop(session_id, None)
+                    if self.registry:
+                        await asyncio.to_thread(self.registry.remove_session, session_id)
                     logger.info(f"Closed session: {session_id}")
                 except Exception as e:
                     logger.error(
@@ -97,7 +196,8 @@ class WebBrowserManager:
                     "session_id": str(session_id),
                     "start_url": browser.start_url,
                     "current_url": await self._get_current_url(browser),
-                    "headless": browser.headless
+                    "headless": browser.headless,
+                    "queue": self.queues[session_id].stats() if session_id in self.queues else None
                 }
                 for session_id, browser in self.sessions.items()
             ]
@@ -132,3 +232,80 @@ class WebBrowserManager:
         """
         async with self.lock:
             return session_id in self.sessions
+
+    @asynccontextmanager
+    async def operation_slot(self) -> AsyncIterator[None]:
+        """
+        Hold one of the server-wide browser operation slots.
+
+        Raises:
+            BrowserCapacityExceeded: If no slot frees up within the admission timeout.
+        """
+        try:
+            await asyncio.wait_for(self.operation_semaphore.acquire(), timeout=self.admission_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Rejected browser operation: {self.active_operations} operations in flight")
+            raise BrowserCapacityExceeded(
+                retry_after=max(1, math.ceil(self.admission_timeout)))
+        self.active_operations += 1
+        try:
+            yield
+        finally:
+            self.active_operations -= 1
+            self.operation_semaphore.release()
+
+    @asynccontextmanager
+    async def session_operation(self, session_id: UUID) -> AsyncIterator[None]:
+        """
+        Run an operation on a session in FIFO order, under the server-wide limit.
+
+        Args:
+            session_id (UUID): The unique identifier of the session.
+
+        Raises:
+            SessionNotFound: If the session does not exist, or was closed while the operation waited.
+            SessionQueueFull: If the session queue is already at its maximum depth.
+            BrowserCapacityExceeded: If no operation slot frees up in time.
+        """
+        queue = self.queues.get(session_id)
+        if queue is None:
+            raise SessionNotFound(session_id)
+        if queue.depth >= queue.max_depth:
+            raise SessionQueueFull(session_id, retry_after=queue.retry_after())
+
+        queue.depth += 1
+        enqueued = time.perf_counter()
+        try:
+            async with queue.lock:
+                # A close queued ahead of this operation may have removed the session meanwhile
+                if session_id not in self.sessions:
+                    raise SessionNotFound(session_id)
+                async with self.operation_slot():
+                    started = time.perf_counter()
+                    try:
+                        yield
+                    finally:
+                        queue.record(wait_ms=(started - enqueued) * 1000,
+                                     duration_ms=(time.perf_counter() - started) * 1000)
+        finally:
+            queue.depth -= 1
+
+    async def get_queue_stats(self, session_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Get action queue statistics for a session.
+
+        Args:
+            session_id (UUID): The unique identifier of the session.
+
+        Returns:
+            Optional[Dict[str, Any]]: Queue depth and wait times, None if the session has no queue.
+        """
+        queue = self.queues.get(session_id)
+        if queue is None:
+            return None
+        return {
+            **queue.stats(),
+            "active_operations": self.active_operations,
+            "max_concurrent_operations": self.max_concurrent_operations,
+        }
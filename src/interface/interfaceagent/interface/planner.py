@@ -1,4 +1,6 @@
-from typing import List, Dict, Any, Optional
+from typing import Awaitable, Callable, List, Dict, Any, Optional
+import asyncio
+import inspect
 import json
 from loguru import logger
 
@@ -9,7 +11,9 @@ from ..utils import parse_json
 
 
 class Planner:
-    def __init__(self, model: OpenAIPlannerModel, web_browser: WebBrowser, task: Optional[str] = None):
+    def __init__(self, model: OpenAIPlannerModel, web_browser: WebBrowser, task: Optional[str] = None,
+                 on_event: Optional[Callable[[Dict[str, Any]], Optional[Awaitable[None]]]] = None,
+                 screenshot_path: Optional[str] = None):
         """
         Initialize the Planner.
 
@@ -17,6 +21,8 @@ class Planner:
             model (OpenAIPlannerModel): The language model for generating plans and actions.
             web_browser (WebBrowser): The web browser instance for executing actions.
             task (Optional[str]): The task to be accomplished.
+            on_event (Optional[Callable]): Called with a dict for every planning step, e.g. to report progress.
+            screenshot_path (Optional[str]): Where to save the final screenshot.
         """
         self.model: OpenAIPlannerModel = model
         self.web_browser: WebBrowser = web_browser
@@ -25,6 +31,25 @@ class Planner:
         self.action_count: int = 0
         self.highlevel_plan: List[str] = []
         self.max_retries: int = 3
+        self.on_event = on_event
+        self.screenshot_path: Optional[str] = screenshot_path
+
+    async def _emit(self, event_type: str, **data: Any) -> None:
+        """Report a planning step to the on_event callback, if any."""
+        if self.on_event is None:
+            return
+        event = {"type": event_type, "action_count": self.action_count,
+                 "max_num_actions": self.max_num_actions, **data}
+        try:
+            result = self.on_event(event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"Error in planner event callback: {e}")
+
+    async def _generate(self, prompt: str) -> str:
+        """Call the model in a thread so the blocking client does not stall the event loop."""
+        return await asyncio.to_thread(self.model.generate, prompt)
 
     async def generate_plan(self) -> List[str]:
         """
@@ -53,9 +78,10 @@ class Planner:
             ...
         ]
         """
-        response = self.model.generate(prompt)
+        response = await self._generate(prompt)
         highlevel_plan = parse_json(response)
         logger.info(f"High-level plan: {highlevel_plan}")
+        await self._emit("plan", plan=highlevel_plan)
         return highlevel_plan
 
     async def next_actions(self) -> List[Dict[str, Any]]:
@@ -101,9 +127,10 @@ class Planner:
 
         A selection is a css selector that identifies the element to interact with. (e.g, 'a[href]', 'button', 'input', 'select', 'textarea', '[role="button"]', '[role="link"]', '[role="checkbox"]', '[role="menuitem"] etc). You MUST use all relevant information to generate the selector e.g. if tag, class, type or role is available use it e.g., 'input[type="text"]', 'a[href="https://example.com"]', etc. If you have to click an a tag and there is a full URL, just use the navigate action with the URL as the value. If the task involves search e.g. on google.com or bing.com, or any search box, the action should be to type the search query into the input element and press enter on the same element.
         """
-        response = self.model.generate(prompt)
+        response = await self._generate(prompt)
         next_actions = parse_json(response)
         logger.info(f"Next actions: {next_actions}")
+        await self._emit("next_actions", actions=next_actions)
         return next_actions
 
     async def check_task_complete(self) -> bool:
@@ -131,9 +158,10 @@ class Planner:
         }}
 
         """
-        response = self.model.generate(prompt)
+        response = await self._generate(prompt)
         response = parse_json(response)
         logger.info(f"Task complete: {response}")
+        await self._emit("task_check", result=response)
         return response
 
     async def execute_action(self, action: Dict[str, Any] | BrowserAction) -> bool:
@@ -155,11 +183,13 @@ class Planner:
             try:
                 await self.web_browser.action(action)
                 self.action_count += 1
+                await self._emit("action", action=action.model_dump(), success=True)
                 return True
             except Exception as e:
                 logger.error(
                     f"Error executing action (attempt {attempt + 1}/{self.max_retries}): {e}, {action}")
                 if attempt == self.max_retries - 1:
+                    await self._emit("action", action=action.model_dump(), success=False, error=str(e))
                     return False
 
         return False
@@ -173,6 +203,7 @@ class Planner:
         """
         task_complete = False
         max_actions_reached = False
+        task_status: Dict[str, Any] = {}
 
         while not task_complete and self.action_count < self.max_num_actions:
             try:
@@ -203,13 +234,13 @@ class Planner:
                 logger.error(f"Error during planning: {e}", exc_info=True)
                 break
 
-            task_status = await self.check_task_complete()
+            task_status = await self.check_task_complete() or {}
             task_complete = task_status.get("status", False)
 
         result = {
             "task": self.task,
             "page_content": await self.web_browser.get_state(state_type='text'),
-            "page_screenshot": await self.web_browser.screenshot(),
+            "page_screenshot": await self.web_browser.screenshot(self.screenshot_path),
             "status": "completed" if task_complete else "incomplete",
             "completion_reason": (
                 f"Reached maximum number of actions ({self.max_num_actions})"
@@ -220,6 +251,8 @@ class Planner:
 
         logger.info("Task completed successfully!") if task_complete else logger.warning(
             result["completion_reason"])
+        await self._emit("result", status=result["status"],
+                         completion_reason=result["completion_reason"])
 
         return result
 
@@ -240,15 +273,19 @@ class Planner:
         Given the current task and page state, suggest an alternative action to achieve the same goal.
         Your response should be a single JSON object with the same format as the failed action.
         """
-        response = self.model.generate(prompt)
+        response = await self._generate(prompt)
         return parse_json(response)
 
-    async def run(self, task: str) -> None:
+    async def run(self, task: str, close_browser: bool = True) -> Dict[str, Any]:
         """
         Run the planner to accomplish the given task.
 
         Args:
             task (str): The task to be accomplished.
+            close_browser (bool): Whether to close the browser when done. Pooled browsers stay open.
+
+        Returns:
+            Dict[str, Any]: The task result and status information.
         """
         if not self.web_browser.is_initialized:
             logger.info("WebBrowser not initialized. Initializing now.")
@@ -259,4 +296,5 @@ class Planner:
             self.highlevel_plan = await self.generate_plan()
             return await self.execute_plan()
         finally:
-            await self.web_browser.close()
+            if close_browser:
+                await self.web_browser.close()
@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from loguru import logger
+
+
+class SessionRegistry:
+    """
+    SQLite-backed map of browser sessions to the worker process that owns them.
+
+    Lets several uvicorn workers share one view of the open sessions, so a
+    request that lands on the wrong worker can be forwarded to the owner.
+    """
+
+    def __init__(self, path: str, heartbeat_timeout: float = 30.0):
+        """
+        Initialize the SessionRegistry.
+
+        Args:
+            path (str): Path of the SQLite database shared by all workers.
+            heartbeat_timeout (float): Seconds after which a silent worker and its sessions are pruned.
+        """
+        self.path = path
+        self.heartbeat_timeout = heartbeat_timeout
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        # WAL lets readers in other workers proceed while one worker writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id TEXT PRIMARY KEY,
+                address TEXT NOT NULL,
+                pid INTEGER,
+                heartbeat REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                worker_id TEXT NOT NULL,
+                start_url TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS sessions_worker ON sessions (worker_id);
+        """)
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def register_worker(self, worker_id: str, address: str, pid: int) -> None:
+        self._execute("INSERT OR REPLACE INTO workers VALUES (?, ?, ?, ?)",
+                      (worker_id, address, pid, time.time()))
+        logger.info(f"Registered worker {worker_id} at {address}")
+
+    def heartbeat(self, worker_id: str) -> None:
+        self._execute("UPDATE workers SET heartbeat = ? WHERE worker_id = ?",
+                      (time.time(), worker_id))
+
+    def unregister_worker(self, worker_id: str) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "DELETE FROM sessions WHERE worker_id = ?", (worker_id,))
+            self._conn.execute(
+                "DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+            self._conn.execute("COMMIT")
+
+    def prune_dead_workers(self) -> int:
+        """
+        Remove workers whose heartbeat expired, along with their sessions.
+
+        Returns:
+            int: The number of workers removed.
+        """
+        cutoff = time.time() - self.heartbeat_timeout
+        dead = [row[0] for row in self._execute(
+            "SELECT worker_id FROM workers WHERE heartbeat < ?", (cutoff,))]
+        for worker_id in dead:
+            logger.warning(
+                f"Pruning worker {worker_id} after missed heartbeats")
+            self.unregister_worker(worker_id)
+        return len(dead)
+
+    def add_session(self, session_id: UUID, worker_id: str, start_url: str) -> None:
+        self._execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)",
+                      (str(session_id), worker_id, start_url, time.time()))
+
+    def remove_session(self, session_id: UUID) -> None:
+        self._execute("DELETE FROM sessions WHERE session_id = ?",
+                      (str(session_id),))
+
+    def get_owner(self, session_id: UUID) -> Optional[Dict[str, str]]:
+        """
+        Look up the worker that owns a session.
+
+        Args:
+            session_id (UUID): The unique identifier of the session.
+
+        Returns:
+            Optional[Dict[str, str]]: The owner's worker_id and address, None if unknown.
+        """
+        rows = self._execute(
+            "SELECT w.worker_id, w.address FROM sessions s JOIN workers w ON s.worker_id = w.worker_id "
+            "WHERE s.session_id = ?", (str(session_id),))
+        if not rows:
+            return None
+        return {"worker_id": rows[0][0], "address": rows[0][1]}
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        rows = self._execute(
+            "SELECT session_id, worker_id, start_url, created_at FROM sessions ORDER BY created_at")
+        return [
+            {"session_id": session_id, "worker_id": worker_id,
+                "start_url": start_url, "created_at": created_at}
+            for session_id, worker_id, start_url, created_at in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
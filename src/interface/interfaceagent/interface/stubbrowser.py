@@ -0,0 +1,142 @@
+import asyncio
+import json
+import random
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from loguru import logger
+
+from interfaceagent.datamodel import BrowserAction
+from .webbrowser import WebBrowser
+
+
+class StubBrowserConfig(BaseModel):
+    """Simulated latencies and page shape for StubWebBrowser."""
+    startup_latency_ms: float = 800
+    close_latency_ms: float = 100
+    settle_latency_ms: float = 100
+    action_latency_ms: Dict[str, float] = Field(default_factory=lambda: {
+        "click": 120, "type": 30, "press": 80, "select": 30, "submit": 150, "navigate": 400})
+    state_latency_ms: Dict[str, float] = Field(default_factory=lambda: {
+        "text": 20, "html": 15, "interactive": 250})
+    # Latencies vary uniformly by +/- this fraction
+    jitter: float = 0.2
+    # Fraction of actions that fail as if the selector timed out
+    error_rate: float = 0.0
+    num_elements: int = 50
+    text_size: int = 5000
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_file(cls, path: str) -> "StubBrowserConfig":
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+class StubPage:
+    """Minimal stand-in for a Playwright page, enough for the session manager."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.mutations = 0
+
+
+class StubWebBrowser(WebBrowser):
+    """
+    A WebBrowser that simulates page state and action latencies without Chromium.
+
+    Used to load test and capacity plan the web API on a single machine
+    with no network access.
+    """
+
+    def __init__(self, start_url: str, headless: bool = True, config: Optional[StubBrowserConfig] = None):
+        super().__init__(start_url, headless=headless)
+        self.config = config or StubBrowserConfig()
+        self.random = random.Random(self.config.seed)
+
+    async def _sleep(self, latency_ms: float) -> None:
+        jitter = self.config.jitter
+        await asyncio.sleep(max(0.0, latency_ms * self.random.uniform(1 - jitter, 1 + jitter)) / 1000)
+
+    async def initialize(self) -> None:
+        if self.is_initialized:
+            logger.warning("WebBrowser is already initialized.")
+            return
+        await self._sleep(self.config.startup_latency_ms)
+        self.page = StubPage(self.start_url)
+        self.is_initialized = True
+
+    async def reset(self, start_url: Optional[str] = None) -> None:
+        if not self.is_initialized:
+            raise RuntimeError(
+                "WebBrowser is not initialized. Call initialize() first.")
+        if start_url:
+            self.start_url = start_url
+        await self._sleep(self.config.action_latency_ms.get("navigate", 0))
+        self.page = StubPage(self.start_url)
+        self.action_history = []
+        self.dom_version += 1
+
+    async def action(self, action: BrowserAction, settle: bool = True) -> None:
+        if not self.is_initialized:
+            raise RuntimeError(
+                "WebBrowser is not initialized. Call initialize() first.")
+        if action.action not in self.config.action_latency_ms:
+            raise ValueError(f"Unsupported action: {action.action}")
+
+        try:
+            await self._sleep(self.config.action_latency_ms[action.action])
+            if self.random.random() < self.config.error_rate:
+                raise TimeoutError(
+                    f"Simulated timeout for selector '{action.selector}'")
+            if action.action == "navigate":
+                self.page = StubPage(action.value)
+            else:
+                self.page.mutations += 1
+            if settle and action.action != "navigate":
+                await self.wait_for_settle()
+            self.action_history.append(
+                (action.action, action.selector, action.value))
+        finally:
+            self.dom_version += 1
+
+    async def wait_for_settle(self) -> None:
+        if self.page:
+            await self._sleep(self.config.settle_latency_ms)
+
+    async def get_version(self) -> str:
+        return f"{self.page.url}|{id(self.page)}|{self.page.mutations}|{self.dom_version}"
+
+    async def get_text(self) -> str:
+        await self._sleep(self.config.state_latency_ms.get("text", 0))
+        line = f"Simulated content of {self.page.url} after {self.page.mutations} changes. "
+        return (line * (self.config.text_size // len(line) + 1))[:self.config.text_size]
+
+    async def get_html(self) -> str:
+        await self._sleep(self.config.state_latency_ms.get("html", 0))
+        elements = "".join(
+            f'<a class="link" href="/page/{i}">Link {i}</a>' for i in range(self.config.num_elements))
+        return f"<html><body><p>{self.page.url}</p>{elements}</body></html>"
+
+    async def get_interactive_elements(self) -> List[Dict[str, str]]:
+        await self._sleep(self.config.state_latency_ms.get("interactive", 0))
+        return [
+            {
+                "tag": "a",
+                "text": f"Link {i}",
+                "class": "link",
+                "href": f"/page/{i}",
+                "css_selector": f"a.link:nth-of-type({i + 1})",
+            }
+            for i in range(self.config.num_elements)
+        ]
+
+    async def screenshot(self, file_path: str = None) -> Any:
+        return file_path or "screenshot.png"
+
+    async def close(self) -> None:
+        if not self.is_initialized:
+            logger.warning("Attempting to close an uninitialized WebBrowser.")
+            return
+        await self._sleep(self.config.close_latency_ms)
+        self.page = None
+        self.is_initialized = False
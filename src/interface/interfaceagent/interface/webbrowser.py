@@ -1,9 +1,18 @@
 import asyncio
+import time
 from playwright.async_api import async_playwright, Page, ElementHandle, Locator, TimeoutError as PlaywrightTimeoutError
 from typing import Optional, Dict, Any, List, Union, Tuple
 from loguru import logger
 from interfaceagent.datamodel import BrowserAction
 
+# Counts DOM mutations per document so callers can cheaply tell if a page changed
+DOM_VERSION_SCRIPT = """
+window.__interfaceagentDomVersion = 0;
+new MutationObserver(() => { window.__interfaceagentDomVersion++; }).observe(
+    document, { subtree: true, childList: true, attributes: true, characterData: true }
+);
+"""
+
 
 class WebBrowser:
     def __init__(self, start_url: str, headless: bool = True):
@@ -22,6 +31,10 @@ class WebBrowser:
         self.context = None
         self.page: Optional[Page] = None
         self.is_initialized: bool = False
+        # Actions that may trigger a navigation and need a settle wait in batches
+        self.settling_actions = {"click", "press", "submit"}
+        # Bumped on every action attempt, complements the in-page mutation counter
+        self.dom_version: int = 0
 
     async def initialize(self) -> None:
         """Initialize the browser and navigate to the start URL."""
@@ -33,6 +46,7 @@ class WebBrowser:
             self.playwright = await async_playwright().start()
             self.browser = await self.playwright.chromium.launch(headless=self.headless)
             self.context = await self.browser.new_context()
+            await self.context.add_init_script(DOM_VERSION_SCRIPT)
             self.page = await self.context.new_page()
             await self.page.goto(self.start_url)
             self.is_initialized = True
@@ -42,12 +56,37 @@ class WebBrowser:
             await self.close()  # Ensure resources are cleaned up if initialization fails
             raise
 
-    async def action(self, action: BrowserAction) -> None:
+    async def reset(self, start_url: Optional[str] = None) -> None:
+        """
+        Replace the browser context with a fresh one, keeping the browser process.
+
+        No cookies, storage or open pages carry over, so a reused browser
+        behaves like a new one.
+
+        Args:
+            start_url (Optional[str]): The URL to open in the new context, the original start URL if None.
+        """
+        if not self.is_initialized:
+            raise RuntimeError(
+                "WebBrowser is not initialized. Call initialize() first.")
+        if start_url:
+            self.start_url = start_url
+        # Closing the context closes its pages and discards its cookies and storage
+        await self.context.close()
+        self.context = await self.browser.new_context()
+        await self.context.add_init_script(DOM_VERSION_SCRIPT)
+        self.page = await self.context.new_page()
+        await self.page.goto(self.start_url)
+        self.action_history = []
+        self.dom_version += 1
+
+    async def action(self, action: BrowserAction, settle: bool = True) -> None:
         """
         Perform a browser action.
 
         Args:
             action (BrowserAction): The action to perform.
+            settle (bool): Whether to wait for network idle after the action.
 
         Raises:
             ValueError: If the action is unsupported.
@@ -63,7 +102,7 @@ class WebBrowser:
                 await self.page.goto(action.value)
             else:
                 element = self.page.locator(action.selector).first
-                await self._handle_element_action(element, action)
+                await self._handle_element_action(element, action, settle=settle)
 
             self.action_history.append(
                 (action.action, action.selector, action.value))
@@ -75,8 +114,10 @@ class WebBrowser:
             logger.error(
                 f"An error occurred while performing the action: {str(e)}")
             raise
+        finally:
+            self.dom_version += 1
 
-    async def _handle_element_action(self, element: Locator, action: BrowserAction) -> None:
+    async def _handle_element_action(self, element: Locator, action: BrowserAction, settle: bool = True) -> None:
         """Handle actions on a specific element with improved waiting and scrolling."""
         try:
 
@@ -101,13 +142,62 @@ class WebBrowser:
                 raise ValueError(f"Unsupported action: {action.action}")
 
             # Wait for network idle after the action
-            await self.page.wait_for_load_state('networkidle')
+            if settle:
+                await self.page.wait_for_load_state('networkidle')
         except PlaywrightTimeoutError:
             # If timeout occurs, try to get more information about the page state
             logger.error(
                 f"Timeout occurred. Current URL: {self.page.url}, action: {action}")
             logger.error(f"Page title: {await self.page.title()}")
 
+    async def batch_action(self, actions: List[BrowserAction], stop_on_error: bool = True) -> List[Dict[str, Any]]:
+        """
+        Perform an ordered list of browser actions.
+
+        Settle waits are only issued after actions that may trigger a navigation
+        (click, press, submit) and after the last action, so consecutive form
+        fills do not each wait for network idle.
+
+        Args:
+            actions (List[BrowserAction]): The actions to perform, in order.
+            stop_on_error (bool): Whether to stop at the first failed action.
+
+        Returns:
+            List[Dict[str, Any]]: One result per attempted action with its status and duration.
+        """
+        results = []
+        for index, action in enumerate(actions):
+            is_last = index == len(actions) - 1
+            settle = is_last or action.action in self.settling_actions
+            start = time.perf_counter()
+            result = {"index": index, "action": action.action}
+            try:
+                await self.action(action, settle=settle)
+                result["status"] = True
+            except Exception as e:
+                result["status"] = False
+                result["error"] = str(e)
+            result["duration_ms"] = round(
+                (time.perf_counter() - start) * 1000, 2)
+            results.append(result)
+
+            if not result["status"] and stop_on_error:
+                break
+
+        if results and not results[-1]["status"]:
+            # The failed action never settled; do it before state is read
+            await self.wait_for_settle()
+        return results
+
+    async def wait_for_settle(self) -> None:
+        """Wait for the page to reach network idle, ignoring timeouts."""
+        if not self.page:
+            return
+        try:
+            await self.page.wait_for_load_state('networkidle')
+        except PlaywrightTimeoutError:
+            logger.warning(f"Timeout waiting for page to settle: {self.page.url}")
+
     async def _versatile_submit(self, element: Locator) -> None:
         """Attempt to submit a form or click a submit-like element."""
         try:
@@ -242,6 +332,20 @@ class WebBrowser:
         """Get the text content of the current page."""
         return await self.page.inner_text('body')
 
+    async def get_version(self) -> str:
+        """
+        Get a token that changes whenever the page state may have changed.
+
+        Combines the URL, the document identity, the in-page DOM mutation count
+        and the local action count without extracting any page content.
+
+        Returns:
+            str: The current version token.
+        """
+        url, time_origin, mutations = await self.page.evaluate(
+            "() => [location.href, performance.timeOrigin, window.__interfaceagentDomVersion ?? -1]")
+        return f"{url}|{time_origin}|{mutations}|{self.dom_version}"
+
     def get_action_history(self) -> List[Tuple[str, str, Optional[str]]]:
         """Get the history of actions performed."""
         return self.action_history
@@ -5,6 +5,23 @@ from typing import Any, Optional
 from loguru import logger
 
 
+_configured_log_files = set()
+
+
+def configure_logging(log_file: str = "api.log", level: str = "INFO") -> None:
+    """
+    Add a rotating loguru file sink. Called at app or CLI startup, never at import.
+
+    Args:
+        log_file (str): Path of the log file.
+        level (str): Minimum level written to the file.
+    """
+    if log_file in _configured_log_files:
+        return
+    logger.add(log_file, rotation="500 MB", level=level)
+    _configured_log_files.add(log_file)
+
+
 def extract_code_snippet(code_string):
     # Extract code snippet using regex
     cleaned_snippet = re.search(r'```(?:\w+)?\s*([\s\S]*?)\s*```', code_string)
@@ -1,26 +1,79 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, Header, HTTPException, Response
 from pydantic import AnyHttpUrl
 from uuid import UUID
-from interfaceagent.datamodel import WebRequestBrowserAction, WebResponse
+from interfaceagent.datamodel import BrowserAction, WebRequestBrowserAction, WebRequestBrowserActionBatch, WebRequestTask, WebResponse
 from interfaceagent.interface import WebBrowser
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
+import hashlib
+import os
+import time
 from loguru import logger
 
-from interfaceagent.interface import WebBrowserManager
+from interfaceagent.interface import BrowserCapacityExceeded, SessionNotFound, SessionQueueFull, WebBrowserManager
+from interfaceagent.interface import StubBrowserConfig, StubWebBrowser
+from interfaceagent.web import metrics
+from interfaceagent.web.routing import SessionRoutingMiddleware, WorkerNode
+from interfaceagent.web.serialization import web_response
+from interfaceagent.utils import configure_logging
 
-# Configure loguru
-logger.add("api.log", rotation="500 MB", level="INFO")
+
+def get_browser_factory():
+    """Pick the browser backend, e.g. interfaceagent_BROWSER_BACKEND=stub for load tests."""
+    if os.environ.get("interfaceagent_BROWSER_BACKEND", "playwright") != "stub":
+        return None
+    config_path = os.environ.get("interfaceagent_STUB_CONFIG")
+    config = StubBrowserConfig.from_file(
+        config_path) if config_path else StubBrowserConfig()
+    logger.info("Using stub browser backend")
+
+    def factory(start_url: str, headless: bool = True) -> StubWebBrowser:
+        return StubWebBrowser(start_url, headless=headless, config=config)
+    return factory
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    app.state.browser_manager = WebBrowserManager()
+    configure_logging()
+    max_concurrent_operations = os.environ.get(
+        "interfaceagent_MAX_CONCURRENT_OPERATIONS")
+    # With several workers, sessions are shared through a registry on disk
+    registry_path = os.environ.get("interfaceagent_SESSION_REGISTRY")
+    worker_node = WorkerNode(app, registry_path) if registry_path else None
+    app.state.browser_manager = WebBrowserManager(
+        max_queue_depth=int(os.environ.get(
+            "interfaceagent_MAX_QUEUE_DEPTH", 8)),
+        max_concurrent_operations=int(
+            max_concurrent_operations) if max_concurrent_operations else None,
+        admission_timeout=float(os.environ.get(
+            "interfaceagent_ADMISSION_TIMEOUT", 10.0)),
+        browser_factory=get_browser_factory(),
+        registry=worker_node.registry if worker_node else None,
+        worker_id=worker_node.worker_id if worker_node else None,
+    )
+    if worker_node:
+        await worker_node.start()
+        app.state.worker_node = worker_node
+    # Planner tasks run in the background, persisted so they survive restarts.
+    # With a configured store, tasks left queued resume at startup; otherwise
+    # the runner starts on the first /tasks request
+    app.state.task_runner = None
+    app.state.task_runner_lock = asyncio.Lock()
+    if os.environ.get("interfaceagent_TASK_STORE"):
+        await get_task_runner()
     yield
     # Shutdown
+    if app.state.task_runner:
+        await app.state.task_runner.stop()
+        app.state.task_runner.store.close()
     await app.state.browser_manager.close_all_sessions()
+    if worker_node:
+        await worker_node.stop()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -31,8 +84,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["ETag"],
 )
 
+# Compress large state payloads (html, interactive elements)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Record per-route request latency
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Forward requests for sessions owned by another worker (outermost middleware)
+app.add_middleware(SessionRoutingMiddleware, state=app.state)
+
 
 async def get_browser_manager():
     return app.state.browser_manager
@@ -42,7 +105,7 @@ async def validate_session(
     session_id: UUID,
     browser_manager: WebBrowserManager = Depends(get_browser_manager)
 ) -> WebBrowser:
-    browser = browser_manager.get_session(session_id)
+    browser = await browser_manager.get_session(session_id)
     if not browser:
         raise HTTPException(status_code=404, detail="Invalid session ID")
     return browser
@@ -50,74 +113,260 @@ async def validate_session(
 
 @app.post("/browser/session/create", response_model=WebResponse)
 async def create_session(start_url: AnyHttpUrl, browser_manager: WebBrowserManager = Depends(get_browser_manager)):
-    try:
-        session_id = await browser_manager.create_session(start_url)
-        return WebResponse(status=True, data={"session_id": session_id})
-    except Exception as e:
-        logger.error(f"Error creating session: {str(e)}")
-        return WebResponse(status=False, data={"error": "Failed to create session"})
+    async with browser_manager.operation_slot():
+        try:
+            session_id = await browser_manager.create_session(start_url)
+            metrics.SESSIONS_CREATED.inc()
+            return WebResponse(status=True, data={"session_id": session_id})
+        except Exception as e:
+            metrics.observe_error(e)
+            logger.error(f"Error creating session: {str(e)}")
+            return WebResponse(status=False, data={"error": "Failed to create session"})
 
 
 @app.get("/browser/sessions", response_model=WebResponse)
 async def list_sessions(browser_manager: WebBrowserManager = Depends(get_browser_manager)):
     try:
-        sessions = browser_manager.list_sessions()
+        sessions = await browser_manager.list_sessions()
+        if browser_manager.registry:
+            # Sessions owned by other workers only have registry details
+            local_ids = {session["session_id"] for session in sessions}
+            sessions += [session for session in browser_manager.registry.list_sessions()
+                         if session["session_id"] not in local_ids]
         return WebResponse(status=True, data={"sessions": sessions})
     except Exception as e:
+        metrics.observe_error(e)
         logger.error(f"Error listing sessions: {str(e)}")
         return WebResponse(status=False, data={"error": "Failed to list sessions"})
 
 
 @app.post("/browser/session/{session_id}/action", response_model=WebResponse)
 async def perform_action(
+    session_id: UUID,
     action: WebRequestBrowserAction,
-    browser: WebBrowser = Depends(validate_session)
+    browser: WebBrowser = Depends(validate_session),
+    browser_manager: WebBrowserManager = Depends(get_browser_manager)
 ):
-    try:
-        await browser.action(action.action, action.selector, action.value)
-        return WebResponse(status=True, data={"message": "Action performed successfully"})
-    except ValueError as e:
-        logger.warning(f"Invalid action parameters: {str(e)}")
-        return WebResponse(status=False, data={"error": str(e)})
-    except Exception as e:
-        logger.error(f"Error performing action: {str(e)}")
-        return WebResponse(status=False, data={"error": "Failed to perform action"})
+    async with browser_manager.session_operation(session_id):
+        start = time.perf_counter()
+        try:
+            await browser.action(BrowserAction(**action.model_dump()))
+            return WebResponse(status=True, data={"message": "Action performed successfully"})
+        except ValueError as e:
+            metrics.observe_error(e)
+            logger.warning(f"Invalid action parameters: {str(e)}")
+            return WebResponse(status=False, data={"error": str(e)})
+        except Exception as e:
+            metrics.observe_error(e)
+            logger.error(f"Error performing action: {str(e)}")
+            return WebResponse(status=False, data={"error": "Failed to perform action"})
+        finally:
+            metrics.ACTION_LATENCY.observe(
+                time.perf_counter() - start, action.action)
+
+
+@app.post("/browser/session/{session_id}/actions", response_model=WebResponse)
+async def perform_actions(
+    session_id: UUID,
+    batch: WebRequestBrowserActionBatch,
+    browser: WebBrowser = Depends(validate_session),
+    browser_manager: WebBrowserManager = Depends(get_browser_manager)
+):
+    start = time.perf_counter()
+    async with browser_manager.session_operation(session_id):
+        try:
+            actions = [BrowserAction(**action.model_dump())
+                       for action in batch.actions]
+            results = await browser.batch_action(actions, stop_on_error=batch.stop_on_error)
+            for result in results:
+                metrics.ACTION_LATENCY.observe(
+                    result["duration_ms"] / 1000, result["action"])
+            data = {
+                "results": results,
+                "completed": sum(1 for result in results if result["status"]),
+                "total": len(actions),
+            }
+            size = 0
+            if batch.state_type:
+                data["state"] = await browser.get_state(batch.state_type)
+                size = metrics.state_size(data["state"]["content"])
+                metrics.STATE_SIZE.observe(size, batch.state_type)
+            data["duration_ms"] = round(
+                (time.perf_counter() - start) * 1000, 2)
+            status = len(results) == len(actions) and all(
+                result["status"] for result in results)
+            return web_response(status, data, size=size)
+        except ValueError as e:
+            metrics.observe_error(e)
+            logger.warning(f"Invalid batch parameters: {str(e)}")
+            return WebResponse(status=False, data={"error": str(e)})
+        except Exception as e:
+            metrics.observe_error(e)
+            logger.error(f"Error performing actions: {str(e)}")
+            return WebResponse(status=False, data={"error": "Failed to perform actions"})
+
+
+def state_etag(version: str, state_type: str) -> str:
+    """Build a strong ETag for a state type at a given page version."""
+    digest = hashlib.sha1(f"{state_type}|{version}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Check an ETag against the values of an If-None-Match header."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip().removeprefix("W/")
+                  for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
 
 
 @app.get("/browser/session/{session_id}/state", response_model=WebResponse)
 async def get_state(
+    session_id: UUID,
     state_type: str = "text",
-    browser: WebBrowser = Depends(validate_session)
+    if_none_match: Optional[str] = Header(default=None),
+    browser: WebBrowser = Depends(validate_session),
+    browser_manager: WebBrowserManager = Depends(get_browser_manager)
 ):
-    try:
-        state = await browser.get_state(state_type)
-        return WebResponse(status=True, data={"state": state})
-    except ValueError as e:
-        logger.warning(f"Invalid state type: {str(e)}")
-        return WebResponse(status=False, data={"error": str(e)})
-    except Exception as e:
-        logger.error(f"Error getting state: {str(e)}")
-        return WebResponse(status=False, data={"error": "Failed to get state"})
+    async with browser_manager.session_operation(session_id):
+        try:
+            etag = state_etag(await browser.get_version(), state_type)
+            if etag_matches(etag, if_none_match):
+                return Response(status_code=304, headers={"ETag": etag})
+            state = await browser.get_state(state_type)
+            size = metrics.state_size(state["content"])
+            metrics.STATE_SIZE.observe(size, state_type)
+            return web_response(True, {"state": state}, size=size, headers={"ETag": etag})
+        except ValueError as e:
+            metrics.observe_error(e)
+            logger.warning(f"Invalid state type: {str(e)}")
+            return WebResponse(status=False, data={"error": str(e)})
+        except Exception as e:
+            metrics.observe_error(e)
+            logger.error(f"Error getting state: {str(e)}")
+            return WebResponse(status=False, data={"error": "Failed to get state"})
+
+
+@app.get("/browser/session/{session_id}/queue", response_model=WebResponse)
+async def get_queue(
+    session_id: UUID,
+    browser: WebBrowser = Depends(validate_session),
+    browser_manager: WebBrowserManager = Depends(get_browser_manager)
+):
+    stats = await browser_manager.get_queue_stats(session_id)
+    return WebResponse(status=True, data={"queue": stats})
 
 
 @app.post("/browser/session/{session_id}/close", response_model=WebResponse)
 async def close_session(
+    session_id: UUID,
     browser: WebBrowser = Depends(validate_session),
     browser_manager: WebBrowserManager = Depends(get_browser_manager)
 ):
+    # Queue behind in-flight actions so the page is not closed under them
+    async with browser_manager.session_operation(session_id):
+        try:
+            await browser_manager.close_session(session_id)
+            metrics.SESSIONS_CLOSED.inc()
+            return WebResponse(status=True, data={"message": "Session closed successfully"})
+        except Exception as e:
+            metrics.observe_error(e)
+            logger.error(f"Error closing session: {str(e)}")
+            return WebResponse(status=False, data={"error": "Failed to close session"})
+
+
+async def get_task_runner():
+    if app.state.task_runner is None:
+        async with app.state.task_runner_lock:
+            if app.state.task_runner is None:
+                # Imported on first use, as the planner pulls in the OpenAI client
+                from interfaceagent.web.tasks import TaskRunner, TaskStore
+                task_runner = TaskRunner(
+                    TaskStore(os.environ.get("interfaceagent_TASK_STORE", "tasks.db")),
+                    browser_factory=app.state.browser_manager.browser_factory,
+                    num_workers=int(os.environ.get("interfaceagent_TASK_WORKERS", 2)),
+                )
+                await task_runner.start()
+                app.state.task_runner = task_runner
+    return app.state.task_runner
+
+
+@app.post("/tasks", response_model=WebResponse)
+async def create_task(request: WebRequestTask, task_runner=Depends(get_task_runner)):
     try:
-        await browser_manager.close_session(browser.session_id)
-        return WebResponse(status=True, data={"message": "Session closed successfully"})
+        task_id = await task_runner.submit(request.model_dump())
+        return WebResponse(status=True, data={"task_id": task_id})
     except Exception as e:
-        logger.error(f"Error closing session: {str(e)}")
-        return WebResponse(status=False, data={"error": "Failed to close session"})
+        metrics.observe_error(e)
+        logger.error(f"Error creating task: {str(e)}")
+        return WebResponse(status=False, data={"error": "Failed to create task"})
+
+
+@app.get("/tasks/{task_id}", response_model=WebResponse)
+async def get_task(task_id: UUID, task_runner=Depends(get_task_runner)):
+    task = await asyncio.to_thread(task_runner.store.get, str(task_id))
+    if not task:
+        raise HTTPException(status_code=404, detail="Invalid task ID")
+    return WebResponse(status=True, data={"task": task})
+
+
+@app.get("/tasks/{task_id}/events")
+async def get_task_events(task_id: UUID, task_runner=Depends(get_task_runner)):
+    if not await asyncio.to_thread(task_runner.store.get, str(task_id)):
+        raise HTTPException(status_code=404, detail="Invalid task ID")
+    return StreamingResponse(task_runner.stream_events(str(task_id)), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(browser_manager: WebBrowserManager = Depends(get_browser_manager)):
+    # Gauges are sampled at scrape time so the request path stays cheap
+    metrics.ACTIVE_SESSIONS.set(value=len(browser_manager.sessions))
+    metrics.ACTIVE_OPERATIONS.set(value=browser_manager.active_operations)
+    rss = metrics.browser_rss_bytes()
+    if rss is not None:
+        metrics.BROWSER_RSS.set(value=rss)
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.exception_handler(SessionNotFound)
+async def session_not_found_handler(request, exc: SessionNotFound):
+    # Raised for operations that were queued behind a close of their session
+    logger.warning(str(exc))
+    return JSONResponse(
+        status_code=404,
+        content=WebResponse(status=False, data={"error": "Invalid session ID"}).model_dump(),
+    )
+
+
+@app.exception_handler(SessionQueueFull)
+async def session_queue_full_handler(request, exc: SessionQueueFull):
+    metrics.observe_error(exc)
+    logger.warning(str(exc))
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": str(exc.retry_after)},
+        content=WebResponse(status=False, data={"error": str(exc)}).model_dump(),
+    )
+
+
+@app.exception_handler(BrowserCapacityExceeded)
+async def browser_capacity_exceeded_handler(request, exc: BrowserCapacityExceeded):
+    metrics.observe_error(exc)
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+        content=WebResponse(status=False, data={"error": str(exc)}).model_dump(),
+    )
 
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
+    metrics.observe_error(exc)
     logger.exception(f"Unhandled exception: {str(exc)}")
     return JSONResponse(
         status_code=500,
         content=WebResponse(status=False, data={
-                            "error": "An unexpected error occurred. Please try again later."}).dict(),
+                            "error": "An unexpected error occurred. Please try again later."}).model_dump(),
     )
@@ -0,0 +1,216 @@
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, browser RSS is skipped without it
+    psutil = None
+
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1,
+                           0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000,
+                        500_000, 1_000_000, 5_000_000, 10_000_000)
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name,
+             value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class for metrics rendered in the Prometheus text format."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in self.values.items()]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, *labelvalues: str, value: float) -> None:
+        self.values[labelvalues] = value
+
+
+class Histogram(Metric):
+    """Bucketed observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self.values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        series = self.values.get(labelvalues)
+        if series is None:
+            series = self.values[labelvalues] = [0] * \
+                (len(self.buckets) + 1) + [0.0]
+        # Counts are stored per bucket and accumulated at render time
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, series in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            plain_labels = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{plain_labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{plain_labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+ACTIVE_SESSIONS = registry.register(Gauge(
+    "interfaceagent_active_sessions", "Number of open browser sessions"))
+SESSIONS_CREATED = registry.register(Counter(
+    "interfaceagent_sessions_created_total", "Browser sessions created"))
+SESSIONS_CLOSED = registry.register(Counter(
+    "interfaceagent_sessions_closed_total", "Browser sessions closed"))
+ACTIVE_OPERATIONS = registry.register(Gauge(
+    "interfaceagent_active_operations", "Browser operations currently in flight"))
+REQUEST_LATENCY = registry.register(Histogram(
+    "interfaceagent_http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"]))
+ACTION_LATENCY = registry.register(Histogram(
+    "interfaceagent_browser_action_duration_seconds", "Browser action latency by action type",
+    ["action"]))
+STATE_SIZE = registry.register(Histogram(
+    "interfaceagent_state_size_chars", "Approximate size of extracted page state",
+    ["state_type"], buckets=DEFAULT_SIZE_BUCKETS))
+ERRORS = registry.register(Counter(
+    "interfaceagent_errors_total", "Errors by exception type", ["type"]))
+BROWSER_RSS = registry.register(Gauge(
+    "interfaceagent_browser_rss_bytes", "Resident memory of browser child processes"))
+
+
+def state_size(content: Any) -> int:
+    """Approximate the size of a state payload without serializing it."""
+    if isinstance(content, str):
+        return len(content)
+    if isinstance(content, list):
+        return sum(state_size(item) for item in content)
+    if isinstance(content, dict):
+        return sum(len(key) + (len(value) if type(value) is str else state_size(value))
+                   for key, value in content.items())
+    return len(str(content)) if content is not None else 0
+
+
+def browser_rss_bytes() -> Optional[int]:
+    """Sum the resident memory of this process's children (Chromium and drivers)."""
+    if psutil is None:
+        return None
+    total = 0
+    for child in psutil.Process(os.getpid()).children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total
+
+
+def observe_error(exc: BaseException) -> None:
+    ERRORS.inc(type(exc).__name__)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by route template.
+
+    Using the matched route template (e.g. /browser/session/{session_id}/state)
+    rather than the raw path keeps label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.observe(time.perf_counter() - start,
+                                    scope["method"], route, str(status_code))
@@ -0,0 +1,180 @@
+import asyncio
+import contextlib
+import json
+import os
+import re
+import socket
+import tempfile
+import uuid
+from typing import Dict, Optional
+from uuid import UUID
+from loguru import logger
+
+from interfaceagent.interface import SessionRegistry
+
+try:
+    import httpx
+except ImportError:  # httpx is only needed when running several workers
+    httpx = None
+
+# Marks requests that were already forwarded once, so they are always handled locally
+FORWARDED_HEADER = b"x-interfaceagent-forwarded-by"
+HOP_BY_HOP_HEADERS = {b"connection", b"keep-alive",
+                      b"transfer-encoding", b"host"}
+SESSION_PATH = re.compile(r"^/browser/session/([0-9a-fA-F-]{36})(/|$)")
+
+
+class WorkerNode:
+    """
+    Makes a worker process reachable by its peers.
+
+    Registers the worker in the shared SessionRegistry, serves the app on a
+    private Unix socket for forwarded requests and keeps a heartbeat alive.
+    """
+
+    def __init__(self, app, registry_path: str, heartbeat_interval: float = 5.0):
+        self.app = app
+        self.registry = SessionRegistry(registry_path)
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        # Unix socket paths are limited to ~100 characters, so keep the name short
+        self.address = os.path.join(tempfile.gettempdir(),
+                                    f"interfaceagent-{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self.heartbeat_interval = heartbeat_interval
+        self.clients: Dict[str, "httpx.AsyncClient"] = {}
+        self._server = None
+        self._serve_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        import uvicorn
+
+        # Forwarded requests skip the app lifespan, the worker's own server already ran it
+        config = uvicorn.Config(self.app, uds=self.address,
+                                lifespan="off", log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._serve_task = asyncio.create_task(self._server.serve())
+        while not self._server.started:
+            if self._serve_task.done():
+                raise RuntimeError(
+                    f"Failed to serve worker socket {self.address}")
+            await asyncio.sleep(0.01)
+        self.registry.register_worker(
+            self.worker_id, self.address, os.getpid())
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                self.registry.heartbeat(self.worker_id)
+                self.registry.prune_dead_workers()
+            except Exception as e:
+                logger.error(f"Session registry heartbeat failed: {str(e)}")
+
+    def client(self, address: str) -> "httpx.AsyncClient":
+        """Get a pooled HTTP client for a peer worker's socket."""
+        client = self.clients.get(address)
+        if client is None:
+            client = httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(uds=address),
+                                       base_url="http://worker", timeout=None)
+            self.clients[address] = client
+        return client
+
+    async def stop(self) -> None:
+        self.registry.unregister_worker(self.worker_id)
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+        if self._server:
+            self._server.should_exit = True
+        await asyncio.gather(*[task for task in (self._heartbeat_task, self._serve_task) if task],
+                             return_exceptions=True)
+        await asyncio.gather(*[client.aclose() for client in self.clients.values()])
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.address)
+        self.registry.close()
+
+
+class SessionRoutingMiddleware:
+    """
+    ASGI middleware forwarding session requests to the worker that owns the session.
+
+    Only active when the app state has a WorkerNode, i.e. when a session
+    registry is configured. Responses are streamed back byte for byte.
+    """
+
+    def __init__(self, app, state):
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope, receive, send):
+        node: Optional[WorkerNode] = getattr(self.state, "worker_node", None)
+        if scope["type"] != "http" or node is None:
+            await self.app(scope, receive, send)
+            return
+
+        match = SESSION_PATH.match(scope["path"])
+        headers = dict(scope["headers"])
+        if not match or FORWARDED_HEADER in headers:
+            await self.app(scope, receive, send)
+            return
+
+        session_id = UUID(match.group(1))
+        if session_id in self.state.browser_manager.sessions:
+            await self.app(scope, receive, send)
+            return
+
+        # The registry is SQLite shared with the other workers, keep its waits off the event loop
+        owner = await asyncio.to_thread(node.registry.get_owner, session_id)
+        if owner is None or owner["worker_id"] == node.worker_id:
+            await self.app(scope, receive, send)
+            return
+
+        await self.forward(scope, receive, send, session_id, owner, node)
+
+    async def forward(self, scope, receive, send, session_id: UUID, owner: Dict[str, str], node: WorkerNode) -> None:
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        headers = [(key, value) for key, value in scope["headers"]
+                   if key.lower() not in HOP_BY_HOP_HEADERS]
+        headers.append((FORWARDED_HEADER, node.worker_id.encode()))
+        path = scope["path"]
+        if scope.get("query_string"):
+            path += "?" + scope["query_string"].decode()
+
+        client = node.client(owner["address"])
+        try:
+            request = client.build_request(
+                scope["method"], path, content=body, headers=headers)
+            response = await client.send(request, stream=True)
+        except httpx.TransportError as e:
+            # The owner is gone, and its browser with it
+            logger.warning(
+                f"Owner {owner['worker_id']} unreachable, dropping session: {str(e)}")
+            await asyncio.to_thread(node.registry.remove_session, session_id)
+            await self._send_json(send, 404, {"detail": "Invalid session ID"})
+            return
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [(key, value) for key, value in response.headers.raw
+                            if key.lower() not in HOP_BY_HOP_HEADERS],
+            })
+            async for chunk in response.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await response.aclose()
+
+    async def _send_json(self, send, status: int, content: dict) -> None:
+        body = json.dumps(content).encode()
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
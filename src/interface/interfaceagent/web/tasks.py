@@ -0,0 +1,351 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from loguru import logger
+
+from interfaceagent.interface import OpenAIPlannerModel, Planner, WebBrowser
+
+TERMINAL_STATUSES = {"completed", "incomplete", "failed"}
+
+
+class TaskStore:
+    """
+    SQLite-backed store for planner tasks and their step events.
+
+    Jobs survive a restart, and several workers can share one store: jobs
+    are claimed atomically so each one runs exactly once.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                request TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress TEXT,
+                result TEXT,
+                error TEXT,
+                owner TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, created_at);
+            CREATE TABLE IF NOT EXISTS task_events (
+                task_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                event TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (task_id, seq)
+            );
+        """)
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def create(self, request: Dict[str, Any]) -> str:
+        task_id = str(uuid.uuid4())
+        now = time.time()
+        self._execute("INSERT INTO tasks (task_id, request, status, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?)",
+                      (task_id, json.dumps(request), now, now))
+        return task_id
+
+    def claim_next(self, owner: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move the oldest queued task to running.
+
+        Args:
+            owner (str): Identifies the runner claiming the task.
+
+        Returns:
+            Optional[Dict[str, Any]]: The claimed task, None if the queue is empty.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT task_id FROM tasks WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+                if row:
+                    self._conn.execute("UPDATE tasks SET status = 'running', owner = ?, updated_at = ? WHERE task_id = ?",
+                                       (owner, time.time(), row[0]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row else None
+
+    def requeue_interrupted(self, is_alive: Callable[[str], bool]) -> int:
+        """
+        Put tasks left running by a process that no longer exists back in the queue.
+
+        Args:
+            is_alive (Callable[[str], bool]): Tells whether a task owner is still running.
+
+        Returns:
+            int: The number of tasks requeued.
+        """
+        owners = [row[0] for row in self._execute(
+            "SELECT DISTINCT owner FROM tasks WHERE status = 'running'").fetchall()]
+        requeued = 0
+        for owner in owners:
+            if owner is None or not is_alive(owner):
+                cursor = self._execute("UPDATE tasks SET status = 'queued', owner = NULL, updated_at = ? "
+                                       "WHERE status = 'running' AND owner IS ?", (time.time(), owner))
+                requeued += cursor.rowcount
+        return requeued
+
+    def update(self, task_id: str, **fields: Any) -> None:
+        for key in ("progress", "result"):
+            if key in fields:
+                fields[key] = json.dumps(fields[key])
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        self._execute(f"UPDATE tasks SET {assignments}, updated_at = ? WHERE task_id = ?",
+                      (*fields.values(), time.time(), task_id))
+
+    def add_event(self, task_id: str, event: Dict[str, Any]) -> int:
+        with self._lock:
+            seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM task_events WHERE task_id = ?",
+                                     (task_id,)).fetchone()[0]
+            self._conn.execute("INSERT INTO task_events VALUES (?, ?, ?, ?)",
+                               (task_id, seq, json.dumps(event), time.time()))
+        return seq
+
+    def get_events(self, task_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        rows = self._execute("SELECT seq, event FROM task_events WHERE task_id = ? AND seq > ? ORDER BY seq",
+                             (task_id, after)).fetchall()
+        return [{"seq": seq, **json.loads(event)} for seq, event in rows]
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        row = self._execute("SELECT task_id, request, status, progress, result, error, created_at, updated_at "
+                            "FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        if not row:
+            return None
+        task_id, request, status, progress, result, error, created_at, updated_at = row
+        return {
+            "task_id": task_id,
+            "request": json.loads(request),
+            "status": status,
+            "progress": json.loads(progress) if progress else None,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def list(self, limit: int = 100) -> List[Dict[str, Any]]:
+        rows = self._execute("SELECT task_id, status, created_at, updated_at FROM tasks ORDER BY created_at DESC LIMIT ?",
+                             (limit,)).fetchall()
+        return [{"task_id": task_id, "status": status, "created_at": created_at, "updated_at": updated_at}
+                for task_id, status, created_at, updated_at in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BrowserPool:
+    """
+    Keeps initialized browsers around between tasks instead of relaunching Chromium.
+
+    A reused browser gets a fresh context, so cookies, storage and pages of
+    one task never leak into the next.
+    """
+
+    def __init__(self, browser_factory: Callable[..., WebBrowser], max_size: int):
+        self.browser_factory = browser_factory
+        self.max_size = max_size
+        self.idle: List[WebBrowser] = []
+
+    async def acquire(self, start_url: str) -> WebBrowser:
+        while self.idle:
+            browser = self.idle.pop()
+            try:
+                await browser.reset(start_url)
+                return browser
+            except Exception as e:
+                logger.warning(f"Discarding pooled browser: {str(e)}")
+                await browser.close()
+        browser = self.browser_factory(start_url, headless=True)
+        await browser.initialize()
+        return browser
+
+    async def release(self, browser: WebBrowser) -> None:
+        if browser.is_initialized and len(self.idle) < self.max_size:
+            self.idle.append(browser)
+        else:
+            await browser.close()
+
+    async def close(self) -> None:
+        await asyncio.gather(*[browser.close() for browser in self.idle])
+        self.idle = []
+
+
+class TaskRunner:
+    """Runs queued planner tasks on a bounded pool of worker coroutines."""
+
+    def __init__(self, store: TaskStore, browser_factory: Optional[Callable[..., WebBrowser]] = None,
+                 model_factory: Callable[[str], OpenAIPlannerModel] = OpenAIPlannerModel,
+                 num_workers: int = 2, screenshot_dir: Optional[str] = None, poll_interval: float = 1.0):
+        """
+        Initialize the TaskRunner.
+
+        Args:
+            store (TaskStore): Where tasks, progress and events are persisted.
+            browser_factory (Optional[Callable[..., WebBrowser]]): Builds browsers for the pool.
+            model_factory (Callable[[str], OpenAIPlannerModel]): Builds the planner model from a model name.
+            num_workers (int): Maximum number of tasks running at once.
+            screenshot_dir (Optional[str]): Directory for final screenshots, one file per task.
+            poll_interval (float): Seconds between checks for tasks queued by other processes.
+        """
+        self.store = store
+        self.pool = BrowserPool(browser_factory or WebBrowser, max_size=num_workers)
+        self.model_factory = model_factory
+        self.num_workers = num_workers
+        self.screenshot_dir = screenshot_dir or os.path.dirname(
+            os.path.abspath(store.path))
+        self.poll_interval = poll_interval
+        self.runner_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._wakeup = asyncio.Event()
+        self._updated = asyncio.Condition()
+        self._workers: List[asyncio.Task] = []
+
+    @staticmethod
+    def _owner_alive(owner: str) -> bool:
+        pid = int(owner.split("-", 1)[0])
+        if pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    async def start(self) -> None:
+        # Tasks running when their process stopped start over
+        requeued = await asyncio.to_thread(self.store.requeue_interrupted, self._owner_alive)
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted tasks")
+        self._workers = [asyncio.create_task(self._worker())
+                         for _ in range(self.num_workers)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        # Tasks cancelled mid-run are requeued on the next start
+        await self.pool.close()
+
+    async def submit(self, request: Dict[str, Any]) -> str:
+        # Store writes wait on SQLite locks held by other workers, so they run off the event loop too
+        task_id = await asyncio.to_thread(self.store.create, request)
+        self._wakeup.set()
+        return task_id
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                task = await asyncio.to_thread(self.store.claim_next, self.runner_id)
+            except Exception as e:
+                # A locked or busy database must not stop the worker for good
+                logger.error(f"Failed to claim a task: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if task is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(task)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker failed on task {task['task_id']}: {str(e)}")
+
+    async def _record_event(self, task_id: str, event: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.store.add_event, task_id, event)
+        await asyncio.to_thread(self.store.update, task_id, progress={
+            "step": event["type"],
+            "action_count": event.get("action_count", 0),
+            "max_num_actions": event.get("max_num_actions"),
+        })
+        async with self._updated:
+            self._updated.notify_all()
+
+    async def _run(self, task: Dict[str, Any]) -> None:
+        task_id = task["task_id"]
+        request = task["request"]
+        logger.info(f"Running task {task_id}")
+        await self._record_event(task_id, {"type": "started"})
+
+        browser = None
+        try:
+            browser = await self.pool.acquire(request["start_url"])
+            planner = Planner(
+                model=self.model_factory(request["model"]),
+                web_browser=browser,
+                task=request["task"],
+                on_event=lambda event: self._record_event(task_id, event),
+                screenshot_path=os.path.join(
+                    self.screenshot_dir, f"task-{task_id}.png"),
+            )
+            if request.get("max_actions"):
+                planner.max_num_actions = request["max_actions"]
+            result = await planner.run(task=request["task"], close_browser=False)
+            await asyncio.to_thread(self.store.update, task_id, status=result["status"], result=result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Task {task_id} failed: {str(e)}")
+            await asyncio.to_thread(self.store.update, task_id, status="failed", error=str(e))
+        finally:
+            if browser is not None:
+                await self.pool.release(browser)
+        async with self._updated:
+            self._updated.notify_all()
+
+    async def stream_events(self, task_id: str, keepalive: float = 15.0) -> AsyncIterator[str]:
+        """
+        Yield a task's step events as server-sent events until the task finishes.
+
+        Args:
+            task_id (str): The task to follow.
+            keepalive (float): Seconds between keepalive comments when nothing happens.
+        """
+        last_seq = 0
+        idle = 0.0
+        while True:
+            # Reads wait on SQLite locks held by other workers, so keep them off the event loop
+            for event in await asyncio.to_thread(self.store.get_events, task_id, last_seq):
+                last_seq = event["seq"]
+                idle = 0.0
+                yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+            task = await asyncio.to_thread(self.store.get, task_id)
+            if task is None or task["status"] in TERMINAL_STATUSES:
+                yield f"event: end\ndata: {json.dumps({'status': task['status'] if task else None})}\n\n"
+                return
+
+            if idle >= keepalive:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            # Woken by local events; the timeout picks up tasks run by other workers
+            try:
+                async with self._updated:
+                    await asyncio.wait_for(self._updated.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                idle += self.poll_interval
@@ -0,0 +1,70 @@
+import importlib.util
+import sys
+import types
+from datetime import datetime
+from typing import Any, Dict, List, Protocol, runtime_checkable
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+def _has_agentchat_memory() -> bool:
+    try:
+        return importlib.util.find_spec("autogen_agentchat.memory") is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def _install_agentchat_memory() -> None:
+    """Register the autogen_agentchat.memory protocol the memory components are written against.
+
+    Newer autogen-agentchat releases dropped the module, so without this the
+    memory tests could never run. Only the types the components import are
+    provided, with the fields they read.
+    """
+    from autogen_core.memory import MemoryMimeType
+
+    class MemoryContent(BaseModel):
+        content: Any
+        mime_type: MemoryMimeType | str
+        metadata: Dict[str, Any] | None = None
+        timestamp: datetime | None = None
+        source: str | None = None
+        score: float | None = None
+
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    class BaseMemoryConfig(BaseModel):
+        k: int = Field(default=5, description="Number of results to return")
+        score_threshold: float | None = Field(default=None, description="Minimum relevance score")
+        context_format: str = Field(default="{content}", description="Format string for memory results in the context")
+
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @runtime_checkable
+    class Memory(Protocol):
+        @property
+        def name(self) -> str | None: ...
+
+        async def update_context(self, model_context: Any) -> List[MemoryContent]: ...
+
+        async def query(self, query: MemoryContent, cancellation_token: Any = None, **kwargs: Any) -> List[MemoryContent]: ...
+
+        async def add(self, content: MemoryContent, cancellation_token: Any = None) -> None: ...
+
+        async def clear(self) -> None: ...
+
+        async def cleanup(self) -> None: ...
+
+    base = types.ModuleType("autogen_agentchat.memory._base_memory")
+    base.Memory, base.MemoryContent, base.MemoryMimeType, base.BaseMemoryConfig = \
+        Memory, MemoryContent, MemoryMimeType, BaseMemoryConfig
+    memory = types.ModuleType("autogen_agentchat.memory")
+    memory.__path__ = []
+    memory._base_memory = base
+    memory.Memory, memory.MemoryContent, memory.MemoryMimeType = Memory, MemoryContent, MemoryMimeType
+    sys.modules["autogen_agentchat.memory"] = memory
+    sys.modules["autogen_agentchat.memory._base_memory"] = base
+
+
+if importlib.util.find_spec("autogen_core") is not None and not _has_agentchat_memory():
+    _install_agentchat_memory()
@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import time
+import uuid
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+import numpy as np
+from autogen_core import CancellationToken
+from chromadb.api.types import EmbeddingFunction
+
+from interfaceagent.components.memory.chromadb import ChromaMemory, ChromaMemoryConfig
+from interfaceagent.components.memory.chromadb import MemoryContent, MemoryMimeType
+
+EMBEDDING_SECONDS = 0.2
+
+
+class SlowEmbedding(EmbeddingFunction):
+    """Bag-of-words hash embeddings that block like a model on every call"""
+
+    def __init__(self, seconds: float = EMBEDDING_SECONDS) -> None:
+        self.seconds = seconds
+
+    def __call__(self, input):
+        time.sleep(self.seconds)
+        embeddings = []
+        for text in input:
+            vector = np.zeros(64, dtype=np.float32)
+            for word in text.lower().split():
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+            embeddings.append(vector / (np.linalg.norm(vector) or 1.0))
+        return embeddings
+
+    @staticmethod
+    def name() -> str:
+        return "slow-hash"
+
+    def get_config(self):
+        return {}
+
+    @staticmethod
+    def build_from_config(config):
+        return SlowEmbedding()
+
+
+def text(content: str) -> MemoryContent:
+    return MemoryContent(content=content, mime_type=MemoryMimeType.TEXT)
+
+
+@pytest.fixture
+def memory():
+    memory = ChromaMemory(
+        config=ChromaMemoryConfig(collection_name=f"test-{uuid.uuid4().hex}", embedding_cache_size=0),
+        embedding_function=SlowEmbedding()
+    )
+    yield memory
+    asyncio.run(memory.cleanup())
+
+
+class Ticker:
+    """Counts how often a coroutine got the event loop"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.ticks = 0
+        self._task: asyncio.Task | None = None
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.ticks += 1
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._tick())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+def test_queries_do_not_block_the_event_loop(memory):
+    async def run():
+        await memory.add_many(text(f"note number {i}") for i in range(20))
+        ticker = Ticker()
+        ticker.start()
+        start = time.perf_counter()
+        results = await asyncio.gather(*[memory.query(text(f"note number {i}")) for i in range(4)])
+        elapsed = time.perf_counter() - start
+        await ticker.stop()
+        return results, elapsed, ticker.ticks
+
+    results, elapsed, ticks = asyncio.run(run())
+    assert all(results)
+    assert elapsed >= EMBEDDING_SECONDS
+    # A blocked loop would not tick at all until the queries finished
+    assert ticks >= elapsed / 0.01 / 2
+
+
+def test_cancelled_query_raises_without_blocking(memory):
+    async def run():
+        await memory.add(text("a note"))
+        ticker = Ticker()
+        ticker.start()
+        token = CancellationToken()
+        query = asyncio.create_task(memory.query(text("a note"), cancellation_token=token))
+        await asyncio.sleep(EMBEDDING_SECONDS / 4)
+        ticks = ticker.ticks
+        token.cancel()
+        start = time.perf_counter()
+        with pytest.raises(asyncio.CancelledError):
+            await query
+        cancelled_after = time.perf_counter() - start
+        await ticker.stop()
+        return ticks, cancelled_after
+
+    ticks, cancelled_after = asyncio.run(run())
+    assert ticks > 0
+    # The embedding is still running in its thread, the caller does not wait for it
+    assert cancelled_after < EMBEDDING_SECONDS / 2
+
+
+def test_hybrid_query_sees_entries_added_by_another_memory():
+    async def run():
+        config = ChromaMemoryConfig(collection_name=f"test-{uuid.uuid4().hex}", hybrid=True, embedding_cache_size=0)
+        first = ChromaMemory(config=config, embedding_function=SlowEmbedding(seconds=0))
+        second = ChromaMemory(config=config, embedding_function=SlowEmbedding(seconds=0))
+        try:
+            await first.add(text("shipping policy for returns"))
+            # Builds the first memory's view of the BM25 index
+            await first.query(text("returns"))
+            await second.add(text("order ORD-1234 was refunded"))
+            await first.add(text("order ORD-9999 shipped late"))
+            index = first._get_lexical_index(first._collection)
+            return [doc_id for doc_id, _ in index.search("1234", 5)], len(index)
+        finally:
+            await first.cleanup()
+            await second.cleanup()
+
+    hits, size = asyncio.run(run())
+    assert len(hits) == 1
+    assert size == 3
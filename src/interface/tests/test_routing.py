@@ -0,0 +1,87 @@
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("uvicorn")
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def registered_workers(registry_path: Path) -> dict:
+    if not registry_path.exists():
+        return {}
+    conn = sqlite3.connect(registry_path)
+    try:
+        return dict(conn.execute("SELECT worker_id, address FROM workers").fetchall())
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two uvicorn workers with the stub browser, sharing a session registry"""
+    registry_path = tmp_path / "registry.db"
+    env = dict(os.environ,
+               PYTHONPATH=str(PACKAGE_ROOT),
+               interfaceagent_BROWSER_BACKEND="stub",
+               interfaceagent_SESSION_REGISTRY=str(registry_path),
+               interfaceagent_TASK_STORE=str(tmp_path / "tasks.db"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "interfaceagent.web.app:app",
+         "--workers", "2", "--port", str(free_port()), "--log-level", "warning"],
+        cwd=tmp_path, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 60
+        while len(registered_workers(registry_path)) < 2:
+            if server.poll() is not None or time.monotonic() > deadline:
+                pytest.fail("Workers did not register in the session registry")
+            time.sleep(0.1)
+        yield list(registered_workers(registry_path).values())
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def worker_client(address: str) -> "httpx.Client":
+    # Each worker also serves the app on its own socket, which lets the test pick the worker
+    return httpx.Client(transport=httpx.HTTPTransport(uds=address), base_url="http://worker", timeout=30)
+
+
+def test_session_requests_are_forwarded_to_the_owner(workers):
+    owner_address, other_address = workers
+    with worker_client(owner_address) as owner, worker_client(other_address) as other:
+        response = owner.post("/browser/session/create", params={"start_url": "http://example.com/"})
+        assert response.status_code == 200
+        session_id = response.json()["data"]["session_id"]
+
+        response = other.post(f"/browser/session/{session_id}/action",
+                              json={"action": "click", "selector": "a.link"})
+        assert response.status_code == 200
+        assert response.json()["status"]
+
+        response = other.get(f"/browser/session/{session_id}/state", params={"state_type": "text"})
+        assert response.status_code == 200
+        assert response.json()["data"]["state"]["content"]
+
+        response = other.post(f"/browser/session/{session_id}/close")
+        assert response.status_code == 200
+        assert response.json()["status"]
+
+        # The owner closed the browser, so neither worker knows the session any more
+        assert owner.get(f"/browser/session/{session_id}/state").status_code == 404
+        assert other.get(f"/browser/session/{session_id}/state").status_code == 404